@@ -81,19 +81,29 @@ NOTES:
 - Error handling includes user-friendly messages for common issues
 - Supports streaming responses via AgentCapabilities
 - Movement Network uses Sentio indexer by default (configurable via MOVEMENT_INDEXER_URL)
+- Concurrent requests for the same address share one in-flight indexer fetch
+- Batched requests ({"queries": [{"address", "token", "network"}, ...]}, up to
+  MAX_BATCH_QUERIES) skip the LLM and fetch each distinct address once
+- prefetch_movement_balances lets the orchestrator start a fetch before the
+  request arrives; the next request for that address within
+  PREFETCH_TTL_SECONDS uses the prefetched result
 """
 
+import asyncio
 import os
+import threading
+import time
 import uuid
 import json
-from typing import Any, List, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Tuple
 
 import uvicorn
 import requests
-from dotenv import load_dotenv
+from app.env import load_env
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.apps import A2AStarletteApplication
@@ -123,6 +133,21 @@ DEFAULT_NETWORK = "ethereum"
 DEFAULT_MODEL = "gpt-4o-mini"
 DEFAULT_TEMPERATURE = 0
 DEFAULT_SESSION_ID = "default_session"
+MOVEMENT_NETWORKS = ("movement", "aptos")
+
+# Batched queries: {"queries": [{"address": ..., "token": ..., "network": ...}, ...]}
+BATCH_QUERIES_KEY = "queries"
+MAX_BATCH_QUERIES = 16
+BATCH_UNSUPPORTED_ERROR = "batched schema unsupported"
+
+# In-flight indexer fetches shared by concurrent requests for the same address
+_inflight_balances: Dict[str, "Future[Dict[str, Any]]"] = {}
+_inflight_lock = threading.Lock()
+
+# Speculative fetches started by the orchestrator: address -> (expires_at, future)
+PREFETCH_TTL_SECONDS = 5.0
+_prefetched_balances: Dict[str, Tuple[float, "Future[Dict[str, Any]]"]] = {}
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="balance-prefetch")
 EMPTY_RESPONSE_MESSAGE = (
     "I apologize, but I couldn't generate a response. Please try rephrasing your question."
 )
@@ -367,6 +392,68 @@ def fetch_movement_balances(address: str) -> Dict[str, Any]:
         }
 
 
+def get_movement_balances(address: str) -> Dict[str, Any]:
+    """Fetch Movement balances, sharing one indexer request among concurrent callers.
+
+    Identical concurrent queries (several users or a batch asking for the same
+    address) wait on the fetch already in flight instead of each hitting the
+    indexer. Nothing is kept once the fetch completes.
+
+    Args:
+        address: Wallet address to check
+
+    Returns:
+        Dictionary with balance information
+    """
+    key = address.lower()
+    with _inflight_lock:
+        prefetched = _prefetched_balances.pop(key, None)
+    if prefetched is not None and prefetched[0] > time.monotonic():
+        return prefetched[1].result()
+
+    with _inflight_lock:
+        future = _inflight_balances.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _inflight_balances[key] = future
+    if not is_leader:
+        return future.result()
+
+    try:
+        result = fetch_movement_balances(address)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_balances.pop(key, None)
+
+
+def prefetch_movement_balances(address: str) -> None:
+    """Start fetching Movement balances for an address expected to be queried soon.
+
+    The result is handed to the next get_movement_balances call for the
+    address within PREFETCH_TTL_SECONDS and discarded otherwise.
+
+    Args:
+        address: Wallet address to fetch
+    """
+    key = address.lower()
+    now = time.monotonic()
+    with _inflight_lock:
+        expired = [k for k, (expires_at, _) in _prefetched_balances.items() if expires_at <= now]
+        for stale_key in expired:
+            del _prefetched_balances[stale_key]
+        if key in _prefetched_balances:
+            return
+        future = _prefetch_executor.submit(fetch_movement_balances, address)
+        _prefetched_balances[key] = (now + PREFETCH_TTL_SECONDS, future)
+    print(f"🔮 Prefetching Movement balances for {address}")
+
+
 def format_movement_balance_response(balances_data: Dict[str, Any], address: str) -> str:
     """Format Movement balance data into a user-friendly string.
 
@@ -455,6 +542,122 @@ def format_movement_balance_response(balances_data: Dict[str, Any], address: str
     return "\n".join(result_lines)
 
 
+def format_movement_token_balance(balances_data: Dict[str, Any], address: str, token: str) -> str:
+    """Format a single token's Movement balance into a user-friendly string.
+
+    Args:
+        balances_data: Dictionary with balance data from indexer
+        address: Wallet address
+        token: Token symbol to look up
+
+    Returns:
+        Formatted token balance string
+    """
+    if not balances_data.get("success", False):
+        return f"Error fetching Movement balance: {balances_data.get('error', 'Unknown error')}"
+    balances = balances_data.get("balances", [])
+    token_upper = token.upper()
+    for balance in balances:
+        metadata = balance.get("metadata", {})
+        symbol = metadata.get("symbol", "").upper()
+        if symbol == token_upper or token_upper in symbol:
+            amount = balance.get("amount", "0")
+            decimals = int(metadata.get("decimals", 18))
+            name = metadata.get("name", "Unknown Token")
+            try:
+                amount_int = int(amount)
+                formatted_balance = amount_int / (10**decimals)
+                return f"{address} has {formatted_balance:.6f} {symbol} ({name}) on Movement Network"
+            except (ValueError, TypeError):
+                return f"{address} has {amount} {symbol} (raw) on Movement Network"
+    return f"No {token_upper} balance found for {address} on Movement Network"
+
+
+def resolve_network(address: str, network: str) -> str:
+    """Return the lowercase network, auto-detecting Movement for 66-character addresses."""
+    if len(address) == 66 and address.startswith("0x"):
+        return "movement"
+    return network.lower()
+
+
+def parse_batch_queries(query: str) -> Optional[List[Dict[str, str]]]:
+    """Parse a batched balance request.
+
+    Args:
+        query: Raw A2A task text
+
+    Returns:
+        The list of queries, or None if the task is not a batched request
+
+    Raises:
+        ValueError: If the batch is empty, too large or has entries without an address
+    """
+    text = query.strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict) or BATCH_QUERIES_KEY not in payload:
+        return None
+
+    queries = payload[BATCH_QUERIES_KEY]
+    if not isinstance(queries, list) or not queries:
+        raise ValueError(f"{BATCH_UNSUPPORTED_ERROR}: '{BATCH_QUERIES_KEY}' must be a non-empty list")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ValueError(
+            f"{BATCH_UNSUPPORTED_ERROR}: at most {MAX_BATCH_QUERIES} queries per batch"
+        )
+    for entry in queries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("address"), str):
+            raise ValueError(f"{BATCH_UNSUPPORTED_ERROR}: every query needs an address")
+    return queries
+
+
+async def get_batch_balances(queries: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Answer a batch of balance queries without the LLM.
+
+    Queries are grouped by (network, address) so each Movement address is
+    fetched from the indexer once, and the distinct fetches run concurrently.
+
+    Args:
+        queries: Parsed batch entries with address and optional token/network
+
+    Returns:
+        One result per query, in request order
+    """
+    resolved = [
+        (
+            entry["address"],
+            entry.get("token") or "",
+            resolve_network(entry["address"], entry.get("network") or DEFAULT_NETWORK),
+        )
+        for entry in queries
+    ]
+    movement_addresses = list(
+        dict.fromkeys(address for address, _, network in resolved if network in MOVEMENT_NETWORKS)
+    )
+    fetched = await asyncio.gather(
+        *(asyncio.to_thread(get_movement_balances, address) for address in movement_addresses)
+    )
+    balances_by_address = dict(zip(movement_addresses, fetched, strict=True))
+
+    results: List[Dict[str, str]] = []
+    for address, token, network in resolved:
+        if network not in MOVEMENT_NETWORKS:
+            result = (
+                f"Balance for {address} on {network}: Not implemented yet "
+                "(only Movement Network is currently supported)"
+            )
+        elif token:
+            result = format_movement_token_balance(balances_by_address[address], address, token)
+        else:
+            result = format_movement_balance_response(balances_by_address[address], address)
+        results.append({"address": address, "token": token, "network": network, "result": result})
+    return results
+
+
 @tool
 def get_balance(address: str, network: str = DEFAULT_NETWORK) -> str:
     """Get the balance of a cryptocurrency address on a specific network.
@@ -471,13 +674,9 @@ def get_balance(address: str, network: str = DEFAULT_NETWORK) -> str:
     Returns:
         The balance as a string
     """
-    # Auto-detect Movement Network for 66-character addresses
-    if len(address) == 66 and address.startswith("0x"):
-        network = "movement"
-
-    network_lower = network.lower()
-    if network_lower in ["movement", "aptos"]:
-        balances_data = fetch_movement_balances(address)
+    network = resolve_network(address, network)
+    if network in MOVEMENT_NETWORKS:
+        balances_data = get_movement_balances(address)
         return format_movement_balance_response(balances_data, address)
     return f"Balance for {address} on {network}: Not implemented yet (only Movement Network is currently supported)"
 
@@ -499,31 +698,10 @@ def get_token_balance(address: str, token: str, network: str = DEFAULT_NETWORK)
     Returns:
         The token balance as a string
     """
-    # Auto-detect Movement Network for 66-character addresses
-    if len(address) == 66 and address.startswith("0x"):
-        network = "movement"
-
-    network_lower = network.lower()
-    if network_lower in ["movement", "aptos"]:
-        balances_data = fetch_movement_balances(address)
-        if not balances_data.get("success", False):
-            return f"Error fetching Movement balance: {balances_data.get('error', 'Unknown error')}"
-        balances = balances_data.get("balances", [])
-        token_upper = token.upper()
-        for balance in balances:
-            metadata = balance.get("metadata", {})
-            symbol = metadata.get("symbol", "").upper()
-            if symbol == token_upper or token_upper in symbol:
-                amount = balance.get("amount", "0")
-                decimals = int(metadata.get("decimals", 18))
-                name = metadata.get("name", "Unknown Token")
-                try:
-                    amount_int = int(amount)
-                    formatted_balance = amount_int / (10**decimals)
-                    return f"{address} has {formatted_balance:.6f} {symbol} ({name}) on Movement Network"
-                except (ValueError, TypeError):
-                    return f"{address} has {amount} {symbol} (raw) on Movement Network"
-        return f"No {token_upper} balance found for {address} on Movement Network"
+    network = resolve_network(address, network)
+    if network in MOVEMENT_NETWORKS:
+        balances_data = get_movement_balances(address)
+        return format_movement_token_balance(balances_data, address, token)
     return f"Token balance for {address}: {token.upper()} on {network} - Not implemented yet (only Movement Network is currently supported)"
 
 
@@ -647,6 +825,14 @@ class BalanceAgent:
 
     async def invoke(self, query: str, session_id: str) -> str:
         """Invoke the agent with a query."""
+        try:
+            batch = parse_batch_queries(query)
+        except ValueError as e:
+            return json.dumps({"response": str(e), "success": False, "error": str(e)})
+        if batch is not None:
+            results = await get_batch_balances(batch)
+            print(f"📦 Answered {len(results)} batched balance queries")
+            return json.dumps({"responses": results, "success": True})
         try:
             result = await self._invoke_agent(query, session_id)
             output = extract_assistant_response(result)
@@ -6,14 +6,22 @@ Tools:
 - Operations: supply_collateral, borrow_asset, repay_loan, check_health_factor
 """
 
+import asyncio
+import operator
 import os
-import uuid
-import json
-from typing import Any, Dict, List, Optional
-from dotenv import load_dotenv
-
-load_dotenv()
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from app.env import load_env
+
+load_env()
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.agents.lending_comparison.moveposition_rates import (
     calculate_moveposition_supply_apy_by_utilization,
@@ -28,8 +36,15 @@ from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.events import EventQueue
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import AgentCapabilities, AgentCard, AgentSkill, Message, Part, Role, TextPart
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Part,
+    TaskState,
+    TextPart,
+)
 from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
@@ -38,6 +53,7 @@ DEFAULT_MODEL = "gpt-4o-mini"
 DEFAULT_TEMPERATURE = 0
 DEFAULT_SESSION_ID = "default_session"
 EMPTY_RESPONSE_MESSAGE = "I apologize, but I couldn't generate a response."
+WORKING_STATUS_MESSAGE = "Fetching latest rates..."
 ENV_OPENAI_API_KEY = "OPENAI_API_KEY"
 ENV_OPENAI_MODEL = "OPENAI_MODEL"
 MESSAGE_TYPE_AI = "ai"
@@ -49,15 +65,65 @@ MESSAGE_KEY_TYPE = "type"
 
 ECHELON_API_URL = "https://app.echelon.market/api/markets?network=movement_mainnet"
 MOVEPOSITION_API_URL = "https://api.moveposition.xyz/brokers"
+UNDERLYING_ASSET_KEY = "underlyingAsset"
+AVAILABLE_LIQUIDITY_KEY = "scaledAvailableLiquidityUnderlying"
+BORROWED_KEY = "scaledTotalBorrowedUnderlying"
+# (connect, read) timeouts for upstream protocol APIs
+PROTOCOL_API_TIMEOUT = (3, 10)
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled session so repeated fetches reuse TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _create_http_session()
+
+
+# Bound format methods so each call skips re-parsing the format spec
+_fmt_pct = "{:.2f}%".format
+_fmt_usd = "${:,.2f}".format
+
+
+def _json_dumps(payload: Any) -> str:
+    """Serialize a tool/agent response to a JSON string."""
+    return orjson.dumps(payload).decode()
+
+# Both upstream APIs are I/O-bound, so one worker per protocol lets every tool
+# call wait on the slower of the two fetches instead of their sum.
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="lending-fetch")
+
+# Market data moves on the order of seconds-to-minutes, while a single user turn
+# can call several tools that each need both payloads.
+PROTOCOL_DATA_TTL_SECONDS = 30
+# Start a background refresh once an entry is within this fraction of its TTL
+PROTOCOL_DATA_REFRESH_FRACTION = 0.2
+_CACHE_KEY_ECHELON = "echelon"
+_CACHE_KEY_MOVEPOSITION = "moveposition"
+
+_cache_lock = threading.Lock()
+# protocol -> {"data": payload, "expires_at": monotonic deadline}
+_protocol_cache: Dict[str, Dict[str, Any]] = {}
+# (name, id(payload)) -> (payload, value); values derived from a cached payload
+_derived_cache: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+# protocols with a background refresh in flight
+_refreshing: Set[str] = set()
 
 
 def fetch_echelon_data() -> Optional[Dict[str, Any]]:
     """Fetch market data from Echelon API."""
     print(f"📡 [ECHELON] Fetching data from {ECHELON_API_URL}")
     try:
-        response = requests.get(ECHELON_API_URL, timeout=10)
+        response = _SESSION.get(ECHELON_API_URL, timeout=PROTOCOL_API_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         asset_count = len(data.get("data", {}).get("assets", [])) if data else 0
         print(f"✅ [ECHELON] Successfully fetched data: {asset_count} assets")
         return data
@@ -76,9 +142,9 @@ def fetch_moveposition_data() -> Optional[List[Dict[str, Any]]]:
     """Fetch broker data from MovePosition API."""
     print(f"📡 [MOVEPOSITION] Fetching data from {MOVEPOSITION_API_URL}")
     try:
-        response = requests.get(MOVEPOSITION_API_URL, timeout=10)
+        response = _SESSION.get(MOVEPOSITION_API_URL, timeout=PROTOCOL_API_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         broker_count = len(data) if isinstance(data, list) else 0
         print(f"✅ [MOVEPOSITION] Successfully fetched data: {broker_count} brokers")
         return data
@@ -93,25 +159,183 @@ def fetch_moveposition_data() -> Optional[List[Dict[str, Any]]]:
         return None
 
 
+def _store_payload(cache_key: str, data: Any) -> None:
+    """Replace a cached payload and drop values derived from the previous one.
+
+    Must be called with _cache_lock held.
+    """
+    previous = _protocol_cache.get(cache_key)
+    if previous:
+        stale_id = id(previous["data"])
+        for key in [key for key in _derived_cache if key[1] == stale_id]:
+            del _derived_cache[key]
+    _protocol_cache[cache_key] = {
+        "data": data,
+        "expires_at": time.monotonic() + PROTOCOL_DATA_TTL_SECONDS,
+    }
+
+
+def _refresh_payload(cache_key: str, fetcher: Callable[[], Any]) -> None:
+    """Background refresh of a cached payload; keeps the current one on failure."""
+    try:
+        data = fetcher()
+        if data is not None:
+            with _cache_lock:
+                _store_payload(cache_key, data)
+    finally:
+        with _cache_lock:
+            _refreshing.discard(cache_key)
+
+
+def _get_cached_payload(cache_key: str, fetcher: Callable[[], Any]) -> Any:
+    """Return a cached upstream payload, refetching it once the TTL has expired.
+
+    Entries within the last PROTOCOL_DATA_REFRESH_FRACTION of their TTL are served
+    as-is while a single background refresh runs (stale-while-revalidate). If a
+    foreground refetch fails, the last good payload is served (stale-on-error) so
+    tools keep working through upstream blips.
+    """
+    with _cache_lock:
+        entry = _protocol_cache.get(cache_key)
+        if entry:
+            remaining = entry["expires_at"] - time.monotonic()
+            if remaining > 0:
+                refresh_window = PROTOCOL_DATA_TTL_SECONDS * PROTOCOL_DATA_REFRESH_FRACTION
+                if remaining < refresh_window and cache_key not in _refreshing:
+                    _refreshing.add(cache_key)
+                    _FETCH_EXECUTOR.submit(_refresh_payload, cache_key, fetcher)
+                return entry["data"]
+    data = fetcher()
+    with _cache_lock:
+        if data is None:
+            if entry:
+                print(f"♻️ [{cache_key.upper()}] Upstream fetch failed, serving stale data")
+                return entry["data"]
+            return None
+        _store_payload(cache_key, data)
+    return data
+
+
+def _derived_from_payload(name: str, data: Any, compute: Callable[[Any], Any]) -> Any:
+    """Memoize a pure computation over a cached upstream payload."""
+    cache_key = (name, id(data))
+    with _cache_lock:
+        is_cached_payload = any(entry["data"] is data for entry in _protocol_cache.values())
+        cached = _derived_cache.get(cache_key) if is_cached_payload else None
+    # Computations may derive from other memoized values, so never run them under the lock
+    if not is_cached_payload:
+        return compute(data)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    value = compute(data)
+    with _cache_lock:
+        _derived_cache[cache_key] = (data, value)
+    return value
+
+
+def get_echelon_data() -> Optional[Dict[str, Any]]:
+    """Get Echelon market data, served from the TTL cache when fresh."""
+    return _get_cached_payload(_CACHE_KEY_ECHELON, fetch_echelon_data)
+
+
+def get_moveposition_data() -> Optional[List[Dict[str, Any]]]:
+    """Get MovePosition broker data, served from the TTL cache when fresh."""
+    return _get_cached_payload(_CACHE_KEY_MOVEPOSITION, fetch_moveposition_data)
+
+
+async def fetch_protocol_data() -> Tuple[
+    Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]
+]:
+    """Fetch Echelon and MovePosition data concurrently without blocking the event loop.
+
+    Returns:
+        Tuple of (echelon_data, moveposition_data); either may be None on error.
+    """
+    loop = asyncio.get_running_loop()
+    echelon_data, moveposition_data = await asyncio.gather(
+        loop.run_in_executor(_FETCH_EXECUTOR, get_echelon_data),
+        loop.run_in_executor(_FETCH_EXECUTOR, get_moveposition_data),
+    )
+    return echelon_data, moveposition_data
+
+
+def build_echelon_asset_index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index Echelon assets by uppercased symbol (first occurrence wins)."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for asset in data.get("data", {}).get("assets", []):
+        index.setdefault(asset.get("symbol", "").upper(), asset)
+    return index
+
+
 def find_asset_in_echelon(data: Dict[str, Any], asset_symbol: str) -> Optional[Dict[str, Any]]:
     """Find asset data in Echelon API response."""
     print(f"🔍 [ECHELON] Searching for asset: {asset_symbol}")
     if not data or "data" not in data or "assets" not in data["data"]:
         print(f"⚠️ [ECHELON] Invalid data structure or missing assets")
         return None
-    assets = data["data"]["assets"]
-    available_symbols = [asset.get("symbol", "") for asset in assets[:5]]  # First 5 for logging
-    print(f"🔍 [ECHELON] Available symbols (first 5): {available_symbols}")
-    for asset in assets:
-        if asset.get("symbol", "").upper() == asset_symbol.upper():
-            print(
-                f"✅ [ECHELON] Found {asset_symbol}: {asset.get('symbol')} - {asset.get('name', 'N/A')}"
-            )
-            return asset
-    print(f"❌ [ECHELON] Asset {asset_symbol} not found in {len(assets)} available assets")
+    index = _derived_from_payload("echelon_asset_index", data, build_echelon_asset_index)
+    asset = index.get(asset_symbol.upper())
+    if asset:
+        print(
+            f"✅ [ECHELON] Found {asset_symbol}: {asset.get('symbol')} - {asset.get('name', 'N/A')}"
+        )
+        return asset
+    print(f"❌ [ECHELON] Asset {asset_symbol} not found in {len(index)} available assets")
     return None
 
 
+MOVEPOSITION_SYMBOL_MAPPING = {
+    "USDC": ["movement-usdc", "usdc"],
+    "USDT": ["movement-usdt", "usdt"],
+    "MOVE": ["movement-move-fa", "movement-move", "move"],  # Prefer MOVE-FA first
+    "WBTC": ["movement-wbtc", "wbtc"],
+    "WETH": ["movement-weth", "weth"],
+    "EZETH": ["movement-ezeth", "ezeth"],
+    "LBTC": ["movement-lbtc", "lbtc"],
+    "USDA": ["movement-usda", "usda"],
+}
+
+
+def build_moveposition_names(data: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Pair every broker with its lowercased underlying asset name."""
+    return [
+        ((broker.get(UNDERLYING_ASSET_KEY) or {}).get("name", "").lower(), broker)
+        for broker in data
+    ]
+
+
+def _select_moveposition_broker(
+    named_brokers: List[Tuple[str, Dict[str, Any]]], asset_symbol: str, search_names: List[str]
+) -> Optional[Dict[str, Any]]:
+    """Pick the broker whose asset name contains one of search_names.
+
+    For MOVE token, prefers MOVE-FA (higher APY) over regular MOVE.
+    """
+    found_brokers = [
+        (asset_name, broker)
+        for asset_name, broker in named_brokers
+        if any(search_name in asset_name for search_name in search_names)
+    ]
+    if not found_brokers:
+        return None
+    if asset_symbol == "MOVE" and len(found_brokers) > 1:
+        for asset_name, broker in found_brokers:
+            if "move-fa" in asset_name or "move_fa" in asset_name:
+                return broker
+    return found_brokers[0][1]
+
+
+def build_moveposition_index(data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Resolve every mapped symbol to its MovePosition broker."""
+    named_brokers = _derived_from_payload("moveposition_names", data, build_moveposition_names)
+    index: Dict[str, Dict[str, Any]] = {}
+    for symbol, search_names in MOVEPOSITION_SYMBOL_MAPPING.items():
+        broker = _select_moveposition_broker(named_brokers, symbol, search_names)
+        if broker is not None:
+            index[symbol] = broker
+    return index
+
+
 def find_asset_in_moveposition(
     data: List[Dict[str, Any]], asset_symbol: str
 ) -> Optional[Dict[str, Any]]:
@@ -123,46 +347,21 @@ def find_asset_in_moveposition(
     if not data:
         print(f"⚠️ [MOVEPOSITION] No data available")
         return None
-    symbol_mapping = {
-        "USDC": ["movement-usdc", "usdc"],
-        "USDT": ["movement-usdt", "usdt"],
-        "MOVE": ["movement-move-fa", "movement-move", "move"],  # Prefer MOVE-FA first
-        "WBTC": ["movement-wbtc", "wbtc"],
-        "WETH": ["movement-weth", "weth"],
-        "EZETH": ["movement-ezeth", "ezeth"],
-        "LBTC": ["movement-lbtc", "lbtc"],
-        "USDA": ["movement-usda", "usda"],
-    }
-    search_names = symbol_mapping.get(asset_symbol.upper(), [asset_symbol.lower()])
-    print(f"🔍 [MOVEPOSITION] Search names for {asset_symbol}: {search_names}")
-    found_brokers = []
-    available_names = []
-    for broker in data:
-        underlying = broker.get("underlyingAsset", {})
-        asset_name = underlying.get("name", "").lower()
-        if len(available_names) < 5:  # Log first 5 for debugging
-            available_names.append(asset_name)
-        for search_name in search_names:
-            if search_name.lower() in asset_name:
-                found_brokers.append((broker, search_name))
-                break
-    print(f"🔍 [MOVEPOSITION] Available names (first 5): {available_names}")
-    if not found_brokers:
+    symbol = asset_symbol.upper()
+    if symbol in MOVEPOSITION_SYMBOL_MAPPING:
+        index = _derived_from_payload("moveposition_index", data, build_moveposition_index)
+        selected_broker = index.get(symbol)
+    else:
+        named_brokers = _derived_from_payload(
+            "moveposition_names", data, build_moveposition_names
+        )
+        selected_broker = _select_moveposition_broker(
+            named_brokers, symbol, [asset_symbol.lower()]
+        )
+    if not selected_broker:
         print(f"❌ [MOVEPOSITION] Asset {asset_symbol} not found in {len(data)} brokers")
         return None
-    if asset_symbol.upper() == "MOVE" and len(found_brokers) > 1:
-        print(
-            f"🔍 [MOVEPOSITION] Multiple MOVE brokers found ({len(found_brokers)}), preferring MOVE-FA"
-        )
-        for broker, search_name in found_brokers:
-            underlying = broker.get("underlyingAsset", {})
-            asset_name = underlying.get("name", "").lower()
-            if "move-fa" in asset_name or "move_fa" in asset_name:
-                print(f"✅ [MOVEPOSITION] Found {asset_symbol} (MOVE-FA): {asset_name}")
-                return broker
-    selected_broker = found_brokers[0][0]
-    underlying = selected_broker.get("underlyingAsset", {})
-    asset_name = underlying.get("name", "")
+    asset_name = selected_broker.get("underlyingAsset", {}).get("name", "")
     print(f"✅ [MOVEPOSITION] Found {asset_symbol}: {asset_name}")
     return selected_broker
 
@@ -171,36 +370,50 @@ def get_moveposition_metrics(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Calculate aggregate metrics from MovePosition data."""
     if not data:
         return {}
-    total_tvl = 0.0
-    total_supplied = 0.0
-    total_borrowed = 0.0
-    supply_apy_sum = 0.0
-    borrow_apy_sum = 0.0
-    asset_count = 0
+    return _derived_from_payload("moveposition_metrics", data, _compute_moveposition_metrics)
+
+
+def _compute_moveposition_metrics(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    prices: List[float] = []
+    supplied: List[float] = []
+    borrowed: List[float] = []
+    supply_apys: List[float] = []
+    borrow_apys: List[float] = []
+    supply_apy_of = calculate_moveposition_supply_apy_by_utilization
     for broker in data:
-        underlying = broker.get("underlyingAsset", {})
-        price = underlying.get("price", 0)
-        available_liquidity = float(broker.get("scaledAvailableLiquidityUnderlying", 0))
-        total_borrowed_scaled = float(broker.get("scaledTotalBorrowedUnderlying", 0))
-        total_supplied_scaled = available_liquidity + total_borrowed_scaled
-        tvl_value = total_supplied_scaled * price
-        supplied_value = total_supplied_scaled * price
-        borrowed_value = total_borrowed_scaled * price
-        total_tvl += tvl_value
-        total_supplied += supplied_value
-        total_borrowed += borrowed_value
-        supply_apy = calculate_moveposition_supply_apy_by_utilization(broker)
-        borrow_apy = broker.get("interestRate", 0) * 100
-        if supply_apy > 0:
-            supply_apy_sum += supply_apy
-            asset_count += 1
-        if borrow_apy > 0:
-            borrow_apy_sum += borrow_apy
-    avg_supply_apy = (supply_apy_sum / asset_count) if asset_count > 0 else 0.0
-    avg_borrow_apy = (borrow_apy_sum / asset_count) if asset_count > 0 else 0.0
+        get = broker.get
+        borrowed_scaled = float(get(BORROWED_KEY, 0))
+        prices.append((get(UNDERLYING_ASSET_KEY) or {}).get("price", 0))
+        borrowed.append(borrowed_scaled)
+        supplied.append(float(get(AVAILABLE_LIQUIDITY_KEY, 0)) + borrowed_scaled)
+        supply_apys.append(supply_apy_of(broker))
+        borrow_apys.append(get("interestRate", 0) * 100)
+    return _summarize_metrics(prices, supplied, borrowed, supply_apys, borrow_apys, scale=1.0)
+
+
+def _summarize_metrics(
+    prices: List[float],
+    supplied: List[float],
+    borrowed: List[float],
+    supply_rates: List[float],
+    borrow_rates: List[float],
+    scale: float,
+) -> Dict[str, Any]:
+    """Reduce per-asset columns into protocol-level totals and average rates.
+
+    Averages are taken over assets with a positive supply rate and multiplied by
+    scale (100 when the rates are fractions).
+    """
+    total_supplied = sum(map(operator.mul, supplied, prices), 0.0)
+    total_borrowed = sum(map(operator.mul, borrowed, prices), 0.0)
+    positive_supply = [rate for rate in supply_rates if rate > 0]
+    asset_count = len(positive_supply)
+    borrow_rate_sum = sum((rate for rate in borrow_rates if rate > 0), 0.0)
+    avg_supply_apy = (sum(positive_supply) / asset_count * scale) if asset_count > 0 else 0.0
+    avg_borrow_apy = (borrow_rate_sum / asset_count * scale) if asset_count > 0 else 0.0
     utilization = (total_borrowed / total_supplied * 100) if total_supplied > 0 else 0.0
     return {
-        "tvl": total_tvl,
+        "tvl": total_supplied,
         "total_supplied": total_supplied,
         "total_borrowed": total_borrowed,
         "utilization_rate": utilization,
@@ -217,62 +430,265 @@ def calculate_utilization(total_liability: float, total_cash: float) -> float:
     return (total_liability / total) * 100
 
 
+def build_echelon_stats_index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index Echelon marketStats entries ([address, stats]) by address."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for stat in data.get("data", {}).get("marketStats", []):
+        if isinstance(stat, list) and len(stat) >= 2:
+            index.setdefault(stat[0], stat[1])
+    return index
+
+
+def get_echelon_stats_index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Get the marketStats index for an Echelon payload, memoized per cached payload."""
+    return _derived_from_payload("echelon_stats_index", data, build_echelon_stats_index)
+
+
+def find_echelon_market_stats(
+    stats_by_address: Dict[str, Dict[str, Any]], asset: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Look up an asset's market stats by its address, FA address, or market address."""
+    return next(
+        (
+            stats_by_address[address]
+            for address in (asset.get("address"), asset.get("faAddress"), asset.get("market"))
+            if address and address in stats_by_address
+        ),
+        None,
+    )
+
+
 def get_echelon_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate aggregate metrics from Echelon data."""
     if not data or "data" not in data:
         return {}
-    market_stats = data.get("data", {}).get("marketStats", [])
-    total_tvl = 0.0
-    total_supplied = 0.0
-    total_borrowed = 0.0
-    supply_apy_sum = 0.0
-    borrow_apy_sum = 0.0
-    asset_count = 0
-    assets = data.get("data", {}).get("assets", [])
-    for asset in assets:
-        price = asset.get("price", 0)
-        supply_apy = asset.get("supplyApr", 0)
-        borrow_apy = asset.get("borrowApr", 0)
-        market_address = asset.get("market", "")
-        for stat in market_stats:
-            if isinstance(stat, list) and len(stat) >= 2:
-                stat_address = stat[0]
-                asset_address = asset.get("address", "")
-                asset_fa_address = asset.get("faAddress", "")
-                if (
-                    stat_address == asset_address
-                    or stat_address == asset_fa_address
-                    or stat_address == market_address
-                ):
-                    market_data = stat[1]
-                    total_shares = market_data.get("totalShares", 0)
-                    total_liability = market_data.get("totalLiability", 0)
-                    total_cash = market_data.get("totalCash", 0)
-                    tvl_value = total_shares * price
-                    supplied_value = total_shares * price
-                    borrowed_value = total_liability * price
-                    total_tvl += tvl_value
-                    total_supplied += supplied_value
-                    total_borrowed += borrowed_value
-                    if supply_apy > 0:
-                        supply_apy_sum += supply_apy
-                        asset_count += 1
-                    if borrow_apy > 0:
-                        borrow_apy_sum += borrow_apy
-                    break
-    avg_supply_apy = (supply_apy_sum / asset_count * 100) if asset_count > 0 else 0.0
-    avg_borrow_apy = (borrow_apy_sum / asset_count * 100) if asset_count > 0 else 0.0
-    utilization = (total_borrowed / total_supplied * 100) if total_supplied > 0 else 0.0
+    return _derived_from_payload("echelon_metrics", data, _compute_echelon_metrics)
+
+
+def _compute_echelon_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
+    stats_by_address = get_echelon_stats_index(data)
+    prices: List[float] = []
+    shares: List[float] = []
+    liabilities: List[float] = []
+    supply_aprs: List[float] = []
+    borrow_aprs: List[float] = []
+    for asset in data.get("data", {}).get("assets", []):
+        market_data = find_echelon_market_stats(stats_by_address, asset)
+        if market_data is None:
+            continue
+        get = asset.get
+        market_get = market_data.get
+        prices.append(get("price", 0))
+        shares.append(market_get("totalShares", 0))
+        liabilities.append(market_get("totalLiability", 0))
+        supply_aprs.append(get("supplyApr", 0))
+        borrow_aprs.append(get("borrowApr", 0))
+    return _summarize_metrics(prices, shares, liabilities, supply_aprs, borrow_aprs, scale=100.0)
+
+
+@dataclass(frozen=True)
+class EchelonAssetView:
+    """Derived per-asset figures for an Echelon market. Rates are percentages."""
+
+    asset: Dict[str, Any]
+    supply_apr: float
+    supply_apy: float
+    borrow_apr: float
+    borrow_rate: float
+    ltv: float
+    liquidation_threshold: float
+    tvl: float
+    liquidity: float
+    utilization: float
+
+
+@dataclass(frozen=True)
+class MovePositionAssetView:
+    """Derived per-asset figures for a MovePosition broker. Rates are percentages."""
+
+    broker: Dict[str, Any]
+    supply_apy: float
+    borrow_apr: float
+    borrow_rate: float
+    utilization: float
+    tvl: float
+    liquidity: float
+
+
+def _build_echelon_asset_view(data: Dict[str, Any], symbol: str) -> Optional[EchelonAssetView]:
+    asset = find_asset_in_echelon(data, symbol)
+    if not asset:
+        return None
+    price = asset.get("price", 0)
+    market_data = find_echelon_market_stats(get_echelon_stats_index(data), asset) or {}
+    total_liability = market_data.get("totalLiability", 0)
+    total_cash = market_data.get("totalCash", 0)
+    supply_apr = calculate_echelon_supply_apr(asset)
+    return EchelonAssetView(
+        asset=asset,
+        supply_apr=supply_apr,
+        supply_apy=convert_apr_to_apy(supply_apr),
+        borrow_apr=calculate_echelon_borrow_apr(asset),
+        borrow_rate=asset.get("borrowApr", 0) * 100,
+        ltv=asset.get("ltv", 0) * 100,
+        liquidation_threshold=asset.get("lt", 0) * 100,
+        tvl=market_data.get("totalShares", 0) * price,
+        liquidity=total_cash * price,
+        utilization=calculate_utilization(total_liability, total_cash),
+    )
+
+
+def _build_moveposition_asset_view(
+    data: List[Dict[str, Any]], symbol: str
+) -> Optional[MovePositionAssetView]:
+    broker = find_asset_in_moveposition(data, symbol)
+    if not broker:
+        return None
+    get = broker.get
+    price = (get(UNDERLYING_ASSET_KEY) or {}).get("price", 0)
+    available_liquidity = float(get(AVAILABLE_LIQUIDITY_KEY, 0))
+    total_borrowed_scaled = float(get(BORROWED_KEY, 0))
+    return MovePositionAssetView(
+        broker=broker,
+        supply_apy=calculate_moveposition_supply_apy_by_utilization(broker),
+        borrow_apr=calculate_moveposition_borrow_apr(broker),
+        borrow_rate=broker.get("interestRate", 0) * 100,
+        utilization=broker.get("utilization", 0) * 100,
+        tvl=(available_liquidity + total_borrowed_scaled) * price,
+        liquidity=available_liquidity * price,
+    )
+
+
+def _echelon_asset_view(
+    data: Optional[Dict[str, Any]], symbol: str
+) -> Optional[EchelonAssetView]:
+    """Get the derived view of an Echelon asset, memoized per cached payload."""
+    if not data:
+        return None
+    symbol = symbol.upper()
+    return _derived_from_payload(
+        f"echelon_view:{symbol}", data, lambda payload: _build_echelon_asset_view(payload, symbol)
+    )
+
+
+def _moveposition_asset_view(
+    data: Optional[List[Dict[str, Any]]], symbol: str
+) -> Optional[MovePositionAssetView]:
+    """Get the derived view of a MovePosition asset, memoized per cached payload."""
+    if not data:
+        return None
+    symbol = symbol.upper()
+    return _derived_from_payload(
+        f"moveposition_view:{symbol}",
+        data,
+        lambda payload: _build_moveposition_asset_view(payload, symbol),
+    )
+
+
+async def get_all_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get aggregate metrics for both protocols from a single concurrent fetch.
+
+    Returns:
+        Dict with "echelon" and "moveposition" metrics; a protocol whose data is
+        unavailable maps to an empty dict.
+    """
+    echelon_data, moveposition_data = await fetch_protocol_data()
     return {
-        "tvl": total_tvl,
-        "total_supplied": total_supplied,
-        "total_borrowed": total_borrowed,
-        "utilization_rate": utilization,
-        "avg_supply_apy": avg_supply_apy,
-        "avg_borrow_apy": avg_borrow_apy,
+        "echelon": get_echelon_metrics(echelon_data) if echelon_data else {},
+        "moveposition": get_moveposition_metrics(moveposition_data) if moveposition_data else {},
     }
 
 
+def _fmt_metrics(metrics: Dict[str, Any]) -> Dict[str, str]:
+    """Format aggregate protocol metrics into display strings."""
+    return {
+        "tvl": _fmt_usd(metrics.get("tvl", 0)),
+        "total_supplied": _fmt_usd(metrics.get("total_supplied", 0)),
+        "total_borrowed": _fmt_usd(metrics.get("total_borrowed", 0)),
+        "utilization_rate": _fmt_pct(metrics.get("utilization_rate", 0)),
+        "avg_supply_apy": _fmt_pct(metrics.get("avg_supply_apy", 0)),
+        "avg_borrow_apy": _fmt_pct(metrics.get("avg_borrow_apy", 0)),
+    }
+
+
+_NA_LENDING_INFO = {"supply_apy": "N/A", "tvl": "N/A", "utilization": "N/A", "liquidity": "N/A"}
+_NA_BORROW_INFO = {
+    "borrow_apy": "N/A",
+    "liquidation_threshold": "N/A",
+    "health_factor_requirement": "N/A",
+    "max_ltv": "N/A",
+}
+_ECHELON_UNAVAILABLE = {"error": "Unable to fetch data from Echelon API"}
+_MOVEPOSITION_UNAVAILABLE = {"error": "Unable to fetch data from MovePosition API"}
+_ECHELON_METRICS_UNAVAILABLE_JSON = _json_dumps(
+    {
+        "protocol": "Echelon",
+        **_ECHELON_UNAVAILABLE,
+        "message": "Echelon protocol metrics (data unavailable)",
+    }
+)
+_MOVEPOSITION_METRICS_UNAVAILABLE_JSON = _json_dumps(
+    {
+        "protocol": "MovePosition",
+        **_MOVEPOSITION_UNAVAILABLE,
+        "message": "MovePosition protocol metrics (data unavailable)",
+    }
+)
+_INVALID_ACTION_JSON = _json_dumps(
+    {
+        "error": "Invalid action. Use 'lend' or 'borrow'",
+        "message": "Please specify 'lend' or 'borrow'",
+    }
+)
+_PROTOCOLS_UNAVAILABLE_JSON = _json_dumps(
+    {
+        "error": "Unable to fetch data from protocols",
+        "message": "Both protocols are currently unavailable",
+    }
+)
+_NO_RATES_JSON = _json_dumps(
+    {
+        "error": "No rates available",
+        "message": "Unable to fetch rates from either protocol",
+    }
+)
+
+
+@lru_cache(maxsize=64)
+def _lend_error_json(asset: str) -> str:
+    return _json_dumps(
+        {
+            "action": "lend",
+            "asset": asset,
+            "error": "Unable to fetch data from one or both protocols",
+            "message": "Cannot make recommendation - data unavailable",
+        }
+    )
+
+
+@lru_cache(maxsize=64)
+def _borrow_error_json(asset: str) -> str:
+    return _json_dumps(
+        {
+            "action": "borrow",
+            "asset": asset,
+            "error": "Unable to fetch data from either protocol",
+            "message": "Cannot make recommendation - both protocols are currently unavailable. Please try again later.",
+        }
+    )
+
+
+@lru_cache(maxsize=64)
+def _asset_not_found_json(asset: str) -> str:
+    return _json_dumps(
+        {
+            "asset": asset,
+            "error": "Asset not found in either protocol",
+            "message": f"{asset} is not available on MovePosition or Echelon",
+        }
+    )
+
+
 def get_system_prompt() -> str:
     return """You are a comprehensive lending protocol assistant for Movement Network, supporting both MovePosition and Echelon protocols.
 
@@ -342,84 +758,36 @@ def create_agent_skill() -> AgentSkill:
 
 
 @tool
-def compare_lending_rates(asset: str = "USDC") -> str:
+async def compare_lending_rates(asset: str = "USDC") -> str:
     """Compare lending (supply) rates between MovePosition and Echelon for an asset."""
-    echelon_data = fetch_echelon_data()
-    moveposition_data = fetch_moveposition_data()
-    echelon_asset = find_asset_in_echelon(echelon_data, asset) if echelon_data else None
-    moveposition_broker = (
-        find_asset_in_moveposition(moveposition_data, asset) if moveposition_data else None
-    )
-    if echelon_asset:
-        supply_apr = calculate_echelon_supply_apr(echelon_asset)
-        supply_apy = convert_apr_to_apy(supply_apr)
-        price = echelon_asset.get("price", 0)
-        market_address = echelon_asset.get("market", "")
-        market_stats = echelon_data.get("data", {}).get("marketStats", [])
-        total_shares = 0.0
-        total_liability = 0.0
-        total_cash = 0.0
-        asset_address = echelon_asset.get("address", "")
-        fa_address = echelon_asset.get("faAddress", "")
-        for stat in market_stats:
-            if isinstance(stat, list) and len(stat) >= 2:
-                stat_address = stat[0]
-                if (
-                    stat_address == asset_address
-                    or stat_address == fa_address
-                    or stat_address == market_address
-                ):
-                    market_data = stat[1]
-                    total_shares = market_data.get("totalShares", 0)
-                    total_liability = market_data.get("totalLiability", 0)
-                    total_cash = market_data.get("totalCash", 0)
-                    break
-        tvl = total_shares * price
-        utilization = calculate_utilization(total_liability, total_cash)
-        liquidity = total_cash * price
+    echelon_data, moveposition_data = await fetch_protocol_data()
+    echelon = _echelon_asset_view(echelon_data, asset)
+    moveposition = _moveposition_asset_view(moveposition_data, asset)
+    if echelon:
         echelon_info = {
-            "supply_apy": f"{supply_apy:.2f}%",
-            "tvl": f"${tvl:,.2f}",
-            "utilization": f"{utilization:.2f}%",
-            "liquidity": f"${liquidity:,.2f}",
+            "supply_apy": _fmt_pct(echelon.supply_apy),
+            "tvl": _fmt_usd(echelon.tvl),
+            "utilization": _fmt_pct(echelon.utilization),
+            "liquidity": _fmt_usd(echelon.liquidity),
         }
     else:
-        echelon_info = {"supply_apy": "N/A", "tvl": "N/A", "utilization": "N/A", "liquidity": "N/A"}
-    if moveposition_broker:
-        underlying = moveposition_broker.get("underlyingAsset", {})
-        price = underlying.get("price", 0)
-        supply_apy = calculate_moveposition_supply_apy_by_utilization(moveposition_broker)
-        utilization = moveposition_broker.get("utilization", 0) * 100
-        available_liquidity = float(
-            moveposition_broker.get("scaledAvailableLiquidityUnderlying", 0)
-        )
-        total_borrowed_scaled = float(moveposition_broker.get("scaledTotalBorrowedUnderlying", 0))
-        total_supplied_scaled = available_liquidity + total_borrowed_scaled
-        tvl = total_supplied_scaled * price
-        liquidity = available_liquidity * price
+        echelon_info = _NA_LENDING_INFO
+    if moveposition:
         moveposition_info = {
-            "supply_apy": f"{supply_apy:.2f}%",
-            "tvl": f"${tvl:,.2f}",
-            "utilization": f"{utilization:.2f}%",
-            "liquidity": f"${liquidity:,.2f}",
+            "supply_apy": _fmt_pct(moveposition.supply_apy),
+            "tvl": _fmt_usd(moveposition.tvl),
+            "utilization": _fmt_pct(moveposition.utilization),
+            "liquidity": _fmt_usd(moveposition.liquidity),
         }
     else:
-        moveposition_info = {
-            "supply_apy": "N/A",
-            "tvl": "N/A",
-            "utilization": "N/A",
-            "liquidity": "N/A",
-        }
-    if echelon_asset and moveposition_broker:
-        echelon_apr = calculate_echelon_supply_apr(echelon_asset)
-        echelon_apy = convert_apr_to_apy(echelon_apr)
-        moveposition_apy = calculate_moveposition_supply_apy_by_utilization(moveposition_broker)
-        winner = "echelon" if echelon_apy > moveposition_apy else "moveposition"
-        difference = f"{echelon_apy - moveposition_apy:+.2f}%"
+        moveposition_info = _NA_LENDING_INFO
+    if echelon and moveposition:
+        winner = "echelon" if echelon.supply_apy > moveposition.supply_apy else "moveposition"
+        difference = f"{echelon.supply_apy - moveposition.supply_apy:+.2f}%"
     else:
         winner = "unknown"
         difference = "N/A"
-    return json.dumps(
+    return _json_dumps(
         {
             "asset": asset,
             "moveposition": moveposition_info,
@@ -432,65 +800,41 @@ def compare_lending_rates(asset: str = "USDC") -> str:
 
 
 @tool
-def compare_borrowing_rates(asset: str = "USDC") -> str:
+async def compare_borrowing_rates(asset: str = "USDC") -> str:
     """Compare borrowing rates between MovePosition and Echelon for an asset."""
-    echelon_data = fetch_echelon_data()
-    moveposition_data = fetch_moveposition_data()
-    echelon_asset = find_asset_in_echelon(echelon_data, asset) if echelon_data else None
-    moveposition_broker = (
-        find_asset_in_moveposition(moveposition_data, asset) if moveposition_data else None
-    )
-    if echelon_asset:
-        borrow_apy = echelon_asset.get("borrowApr", 0) * 100
-        ltv = echelon_asset.get("ltv", 0) * 100
-        lt = echelon_asset.get("lt", 0) * 100
+    echelon_data, moveposition_data = await fetch_protocol_data()
+    echelon = _echelon_asset_view(echelon_data, asset)
+    moveposition = _moveposition_asset_view(moveposition_data, asset)
+    if echelon:
         echelon_info = {
-            "borrow_apy": f"{borrow_apy:.2f}%",
-            "liquidation_threshold": f"{lt:.2f}%",
+            "borrow_apy": _fmt_pct(echelon.borrow_rate),
+            "liquidation_threshold": _fmt_pct(echelon.liquidation_threshold),
             "health_factor_requirement": "1.15",
-            "max_ltv": f"{ltv:.2f}%",
+            "max_ltv": _fmt_pct(echelon.ltv),
         }
     else:
-        echelon_info = {
-            "borrow_apy": "N/A",
-            "liquidation_threshold": "N/A",
-            "health_factor_requirement": "N/A",
-            "max_ltv": "N/A",
-        }
-    if moveposition_broker:
-        borrow_apy = moveposition_broker.get("interestRate", 0) * 100
-        utilization = moveposition_broker.get("utilization", 0) * 100
+        echelon_info = _NA_BORROW_INFO
+    if moveposition:
         moveposition_info = {
-            "borrow_apy": f"{borrow_apy:.2f}%",
+            "borrow_apy": _fmt_pct(moveposition.borrow_rate),
             "liquidation_threshold": "N/A",
             "health_factor_requirement": "N/A",
             "max_ltv": "N/A",
-            "utilization": f"{utilization:.2f}%",
+            "utilization": _fmt_pct(moveposition.utilization),
         }
     else:
-        moveposition_info = {
-            "borrow_apy": "N/A",
-            "liquidation_threshold": "N/A",
-            "health_factor_requirement": "N/A",
-            "max_ltv": "N/A",
-        }
-    if echelon_asset and moveposition_broker:
-        echelon_apr = calculate_echelon_borrow_apr(echelon_asset)
-        moveposition_apr = calculate_moveposition_borrow_apr(moveposition_broker)
-        winner = "echelon" if echelon_apr < moveposition_apr else "moveposition"
-        difference = f"{echelon_apr - moveposition_apr:+.2f}%"
-        recommended_protocol = winner.capitalize()
-        if winner == "echelon":
-            recommended_protocol = "Echelon"
-        else:
-            recommended_protocol = "MovePosition"
+        moveposition_info = _NA_BORROW_INFO
+    if echelon and moveposition:
+        winner = "echelon" if echelon.borrow_apr < moveposition.borrow_apr else "moveposition"
+        difference = f"{echelon.borrow_apr - moveposition.borrow_apr:+.2f}%"
+        recommended_protocol = "Echelon" if winner == "echelon" else "MovePosition"
         recommendation_message = f"Based on the comparison, {recommended_protocol} offers a lower borrowing APR ({difference})."
     else:
         winner = "unknown"
         difference = "N/A"
         recommended_protocol = None
         recommendation_message = f"Borrowing rate comparison for {asset}"
-    return json.dumps(
+    return _json_dumps(
         {
             "asset": asset,
             "action": "borrow",
@@ -508,99 +852,224 @@ def compare_borrowing_rates(asset: str = "USDC") -> str:
     )
 
 
+def _moveposition_metrics_json(all_metrics: Dict[str, Dict[str, Any]]) -> str:
+    metrics = all_metrics["moveposition"]
+    if not metrics:
+        return _MOVEPOSITION_METRICS_UNAVAILABLE_JSON
+    return _json_dumps(
+        {
+            "protocol": "MovePosition",
+            **_fmt_metrics(metrics),
+            "safety_score": "high",
+            "message": "MovePosition protocol metrics",
+        }
+    )
+
+
+def _echelon_metrics_json(all_metrics: Dict[str, Dict[str, Any]]) -> str:
+    metrics = all_metrics["echelon"]
+    if not metrics:
+        return _ECHELON_METRICS_UNAVAILABLE_JSON
+    return _json_dumps(
+        {
+            "protocol": "Echelon",
+            **_fmt_metrics(metrics),
+            "liquidation_threshold": "85%",
+            "safety_score": "high",
+            "message": "Echelon protocol metrics",
+        }
+    )
+
+
+def _both_metrics_json(all_metrics: Dict[str, Dict[str, Any]]) -> str:
+    echelon_metrics = all_metrics["echelon"]
+    moveposition_metrics = all_metrics["moveposition"]
+    if moveposition_metrics:
+        moveposition_data_dict = {**_fmt_metrics(moveposition_metrics), "safety_score": "high"}
+    else:
+        moveposition_data_dict = _MOVEPOSITION_UNAVAILABLE
+    if echelon_metrics:
+        echelon_data_dict = {
+            **_fmt_metrics(echelon_metrics),
+            "liquidation_threshold": "85%",
+            "safety_score": "high",
+        }
+    else:
+        echelon_data_dict = _ECHELON_UNAVAILABLE
+    return _json_dumps(
+        {
+            "moveposition": moveposition_data_dict,
+            "echelon": echelon_data_dict,
+            "message": "Both protocols metrics",
+        }
+    )
+
+
+# Any other protocol value falls back to the combined view
+_PROTOCOL_METRICS_HANDLERS = {
+    "moveposition": _moveposition_metrics_json,
+    "echelon": _echelon_metrics_json,
+}
+
+
 @tool
-def get_protocol_metrics(protocol: str = "both") -> str:
+async def get_protocol_metrics(protocol: str = "both") -> str:
     """Get comprehensive metrics for one or both protocols."""
-    echelon_data = fetch_echelon_data()
-    moveposition_data = fetch_moveposition_data()
-    echelon_metrics = get_echelon_metrics(echelon_data) if echelon_data else {}
-    moveposition_metrics = get_moveposition_metrics(moveposition_data) if moveposition_data else {}
-    if protocol.lower() == "moveposition":
-        if moveposition_metrics:
-            return json.dumps(
-                {
-                    "protocol": "MovePosition",
-                    "tvl": f"${moveposition_metrics.get('tvl', 0):,.2f}",
-                    "total_supplied": f"${moveposition_metrics.get('total_supplied', 0):,.2f}",
-                    "total_borrowed": f"${moveposition_metrics.get('total_borrowed', 0):,.2f}",
-                    "utilization_rate": f"{moveposition_metrics.get('utilization_rate', 0):.2f}%",
-                    "avg_supply_apy": f"{moveposition_metrics.get('avg_supply_apy', 0):.2f}%",
-                    "avg_borrow_apy": f"{moveposition_metrics.get('avg_borrow_apy', 0):.2f}%",
-                    "safety_score": "high",
-                    "message": "MovePosition protocol metrics",
-                }
-            )
+    handler = _PROTOCOL_METRICS_HANDLERS.get(protocol.lower(), _both_metrics_json)
+    return handler(await get_all_metrics())
+
+
+def _recommend_lend(
+    asset: str, echelon: Optional[EchelonAssetView], moveposition: Optional[MovePositionAssetView]
+) -> str:
+    if echelon and moveposition:
+        print(f"💰 [LEND] Both protocols have {asset}, calculating rates...")
+        echelon_rate = echelon.supply_apy
+        moveposition_rate = moveposition.supply_apy
+        echelon_tvl = echelon.tvl
+        moveposition_tvl = moveposition.tvl
+
+        print(f"📈 [LEND] Rate calculations:")
+        print(f"   - Echelon APR: {echelon.supply_apr:.2f}% → APY: {echelon_rate:.2f}%")
+        print(f"   - MovePosition APY: {moveposition_rate:.2f}%")
+
+        if echelon_rate > moveposition_rate:
+            recommended = "Echelon"
+            reason = f"Higher supply APY ({echelon_rate:.2f}% vs {moveposition_rate:.2f}%)"
+            advantage = f"+{echelon_rate - moveposition_rate:.2f}% APY"
         else:
-            return json.dumps(
-                {
-                    "protocol": "MovePosition",
-                    "error": "Unable to fetch data from MovePosition API",
-                    "message": "MovePosition protocol metrics (data unavailable)",
-                }
-            )
-    elif protocol.lower() == "echelon":
-        if echelon_metrics:
-            return json.dumps(
-                {
-                    "protocol": "Echelon",
-                    "tvl": f"${echelon_metrics.get('tvl', 0):,.2f}",
-                    "total_supplied": f"${echelon_metrics.get('total_supplied', 0):,.2f}",
-                    "total_borrowed": f"${echelon_metrics.get('total_borrowed', 0):,.2f}",
-                    "utilization_rate": f"{echelon_metrics.get('utilization_rate', 0):.2f}%",
-                    "avg_supply_apy": f"{echelon_metrics.get('avg_supply_apy', 0):.2f}%",
-                    "avg_borrow_apy": f"{echelon_metrics.get('avg_borrow_apy', 0):.2f}%",
-                    "liquidation_threshold": "85%",
-                    "safety_score": "high",
-                    "message": "Echelon protocol metrics",
-                }
-            )
-        else:
-            return json.dumps(
-                {
-                    "protocol": "Echelon",
-                    "error": "Unable to fetch data from Echelon API",
-                    "message": "Echelon protocol metrics (data unavailable)",
-                }
-            )
-    else:
-        moveposition_data_dict = {}
-        if moveposition_metrics:
-            moveposition_data_dict = {
-                "tvl": f"${moveposition_metrics.get('tvl', 0):,.2f}",
-                "total_supplied": f"${moveposition_metrics.get('total_supplied', 0):,.2f}",
-                "total_borrowed": f"${moveposition_metrics.get('total_borrowed', 0):,.2f}",
-                "utilization_rate": f"{moveposition_metrics.get('utilization_rate', 0):.2f}%",
-                "avg_supply_apy": f"{moveposition_metrics.get('avg_supply_apy', 0):.2f}%",
-                "avg_borrow_apy": f"{moveposition_metrics.get('avg_borrow_apy', 0):.2f}%",
-                "safety_score": "high",
+            recommended = "MovePosition"
+            reason = f"Higher supply APY ({moveposition_rate:.2f}% vs {echelon_rate:.2f}%)"
+            advantage = f"+{moveposition_rate - echelon_rate:.2f}% APY"
+
+        print(f"🏆 [LEND] Recommendation: {recommended}")
+        print(f"   - Reason: {reason}")
+        print(f"   - Echelon rate: {echelon_rate:.2f}%")
+        print(f"   - MovePosition rate: {moveposition_rate:.2f}%")
+
+        result = _json_dumps(
+            {
+                "action": "lend",
+                "asset": asset,
+                "recommended_protocol": recommended,
+                "reason": reason,
+                "moveposition_rate": _fmt_pct(moveposition_rate),
+                "echelon_rate": _fmt_pct(echelon_rate),
+                "moveposition_tvl": _fmt_usd(moveposition_tvl),
+                "echelon_tvl": _fmt_usd(echelon_tvl),
+                "advantage": advantage,
+                "message": f"{recommended} is recommended for lending {asset}",
+                "user_prompt": f"Which platform would you like to proceed with to lend {asset}? Please select 'MovePosition' or 'Echelon'.",
             }
+        )
+        print(f"✅ [LEND] Returning recommendation JSON:")
+        print(f"   {result[:200]}..." if len(result) > 200 else f"   {result}")
+        print(f"{'='*60}\n")
+        return result
+    else:
+        print(f"❌ [LEND] Missing data - cannot make recommendation")
+        print(f"   - Echelon asset: {echelon is not None}")
+        print(f"   - MovePosition broker: {moveposition is not None}")
+        print(f"{'='*60}\n")
+        return _lend_error_json(asset)
+
+
+def _recommend_borrow(
+    asset: str, echelon: Optional[EchelonAssetView], moveposition: Optional[MovePositionAssetView]
+) -> str:
+    if echelon and moveposition:
+        print(f"💰 [BORROW] Both protocols have {asset}, calculating rates...")
+        echelon_rate = echelon.borrow_rate
+        echelon_ltv = echelon.ltv
+        moveposition_rate = moveposition.borrow_rate
+        moveposition_utilization = moveposition.utilization
+
+        print(f"📈 [BORROW] Rate calculations:")
+        print(f"   - Echelon borrow APR: {echelon_rate:.2f}%, LTV: {echelon_ltv:.2f}%")
+        print(
+            f"   - MovePosition borrow APR: {moveposition_rate:.2f}%, Utilization: {moveposition_utilization:.2f}%"
+        )
+
+        if echelon_rate < moveposition_rate:
+            recommended = "Echelon"
+            reason = f"Lower borrow APR ({echelon_rate:.2f}% vs {moveposition_rate:.2f}%)"
+            if echelon_ltv > 0:
+                reason += f" and higher LTV ({echelon_ltv:.2f}%)"
+            advantage = f"-{moveposition_rate - echelon_rate:.2f}% APR"
         else:
-            moveposition_data_dict = {"error": "Unable to fetch data from MovePosition API"}
-        echelon_data_dict = {}
-        if echelon_metrics:
-            echelon_data_dict = {
-                "tvl": f"${echelon_metrics.get('tvl', 0):,.2f}",
-                "total_supplied": f"${echelon_metrics.get('total_supplied', 0):,.2f}",
-                "total_borrowed": f"${echelon_metrics.get('total_borrowed', 0):,.2f}",
-                "utilization_rate": f"{echelon_metrics.get('utilization_rate', 0):.2f}%",
-                "avg_supply_apy": f"{echelon_metrics.get('avg_supply_apy', 0):.2f}%",
-                "avg_borrow_apy": f"{echelon_metrics.get('avg_borrow_apy', 0):.2f}%",
-                "liquidation_threshold": "85%",
-                "safety_score": "high",
+            recommended = "MovePosition"
+            reason = f"Lower borrow APR ({moveposition_rate:.2f}% vs {echelon_rate:.2f}%)"
+            advantage = f"-{echelon_rate - moveposition_rate:.2f}% APR"
+
+        print(f"🏆 [BORROW] Recommendation: {recommended}")
+        print(f"   - Reason: {reason}")
+        print(f"   - Echelon rate: {echelon_rate:.2f}%")
+        print(f"   - MovePosition rate: {moveposition_rate:.2f}%")
+
+        result = _json_dumps(
+            {
+                "action": "borrow",
+                "asset": asset,
+                "recommended_protocol": recommended,
+                "reason": reason,
+                "moveposition_rate": _fmt_pct(moveposition_rate),
+                "echelon_rate": _fmt_pct(echelon_rate),
+                "moveposition_utilization": _fmt_pct(moveposition_utilization),
+                "echelon_ltv": _fmt_pct(echelon_ltv),
+                "advantage": advantage,
+                "message": f"{recommended} is recommended for borrowing {asset}",
+                "user_prompt": f"Which platform would you like to proceed with to borrow {asset}? Please select 'MovePosition' or 'Echelon'.",
             }
-        else:
-            echelon_data_dict = {"error": "Unable to fetch data from Echelon API"}
-        return json.dumps(
+        )
+        print(f"✅ [BORROW] Returning recommendation JSON:")
+        print(f"   {result[:200]}..." if len(result) > 200 else f"   {result}")
+        print(f"{'='*60}\n")
+        return result
+    elif moveposition:
+        # Only MovePosition data available
+        moveposition_rate = moveposition.borrow_rate
+        moveposition_utilization = moveposition.utilization
+        return _json_dumps(
+            {
+                "action": "borrow",
+                "asset": asset,
+                "recommended_protocol": "MovePosition",
+                "reason": f"MovePosition available with {moveposition_rate:.2f}% APR (Echelon data unavailable)",
+                "moveposition_rate": _fmt_pct(moveposition_rate),
+                "echelon_rate": "N/A",
+                "moveposition_utilization": _fmt_pct(moveposition_utilization),
+                "echelon_ltv": "N/A",
+                "message": f"MovePosition is available for borrowing {asset} at {moveposition_rate:.2f}% APR. Echelon data is currently unavailable.",
+                "user_prompt": f"Would you like to proceed with MovePosition to borrow {asset}?",
+            }
+        )
+    elif echelon:
+        # Only Echelon data available
+        echelon_rate = echelon.borrow_rate
+        echelon_ltv = echelon.ltv
+        return _json_dumps(
             {
-                "moveposition": moveposition_data_dict,
-                "echelon": echelon_data_dict,
-                "message": "Both protocols metrics",
+                "action": "borrow",
+                "asset": asset,
+                "recommended_protocol": "Echelon",
+                "reason": f"Echelon available with {echelon_rate:.2f}% APR (MovePosition data unavailable)",
+                "moveposition_rate": "N/A",
+                "echelon_rate": _fmt_pct(echelon_rate),
+                "moveposition_utilization": "N/A",
+                "echelon_ltv": _fmt_pct(echelon_ltv),
+                "message": f"Echelon is available for borrowing {asset} at {echelon_rate:.2f}% APR. MovePosition data is currently unavailable.",
+                "user_prompt": f"Would you like to proceed with Echelon to borrow {asset}?",
             }
         )
+    else:
+        return _borrow_error_json(asset)
+
+
+_RECOMMEND_HANDLERS = {"lend": _recommend_lend, "borrow": _recommend_borrow}
 
 
 @tool
-def recommend_best_protocol(action: str, asset: str = "USDC") -> str:
+async def recommend_best_protocol(action: str, asset: str = "USDC") -> str:
     """Recommend the best protocol for lending or borrowing based on current rates and metrics.
 
     Args:
@@ -611,208 +1080,19 @@ def recommend_best_protocol(action: str, asset: str = "USDC") -> str:
     print(f"🎯 [RECOMMEND_BEST_PROTOCOL] Called with action='{action}', asset='{asset}'")
     print(f"{'='*60}")
 
-    echelon_data = fetch_echelon_data()
-    moveposition_data = fetch_moveposition_data()
+    handler = _RECOMMEND_HANDLERS.get(action.lower())
+    if handler is None:
+        return _INVALID_ACTION_JSON
 
-    echelon_asset = find_asset_in_echelon(echelon_data, asset) if echelon_data else None
-    moveposition_broker = (
-        find_asset_in_moveposition(moveposition_data, asset) if moveposition_data else None
-    )
+    echelon_data, moveposition_data = await fetch_protocol_data()
+    echelon = _echelon_asset_view(echelon_data, asset)
+    moveposition = _moveposition_asset_view(moveposition_data, asset)
 
     print(f"📊 [RECOMMEND_BEST_PROTOCOL] Data availability:")
-    print(f"   - Echelon asset found: {echelon_asset is not None}")
-    print(f"   - MovePosition broker found: {moveposition_broker is not None}")
-
-    if action.lower() == "lend":
-        if echelon_asset and moveposition_broker:
-            print(f"💰 [LEND] Both protocols have {asset}, calculating rates...")
-            echelon_apr = calculate_echelon_supply_apr(echelon_asset)
-            echelon_rate = convert_apr_to_apy(echelon_apr)
-            moveposition_rate = calculate_moveposition_supply_apy_by_utilization(
-                moveposition_broker
-            )
-
-            print(f"📈 [LEND] Rate calculations:")
-            print(f"   - Echelon APR: {echelon_apr:.2f}% → APY: {echelon_rate:.2f}%")
-            print(f"   - MovePosition APY: {moveposition_rate:.2f}%")
-
-            echelon_tvl = 0.0
-            moveposition_tvl = 0.0
-            if echelon_data:
-                price = echelon_asset.get("price", 0)
-                market_stats = echelon_data.get("data", {}).get("marketStats", [])
-                for stat in market_stats:
-                    if isinstance(stat, list) and len(stat) >= 2:
-                        stat_address = stat[0]
-                        if (
-                            stat_address == echelon_asset.get("address")
-                            or stat_address == echelon_asset.get("faAddress")
-                            or stat_address == echelon_asset.get("market")
-                        ):
-                            market_data = stat[1]
-                            total_shares = market_data.get("totalShares", 0)
-                            echelon_tvl = total_shares * price
-                            break
-            if moveposition_broker:
-                underlying = moveposition_broker.get("underlyingAsset", {})
-                price = underlying.get("price", 0)
-                available_liquidity = float(
-                    moveposition_broker.get("scaledAvailableLiquidityUnderlying", 0)
-                )
-                total_borrowed_scaled = float(
-                    moveposition_broker.get("scaledTotalBorrowedUnderlying", 0)
-                )
-                total_supplied_scaled = available_liquidity + total_borrowed_scaled
-                moveposition_tvl = total_supplied_scaled * price
-
-            if echelon_rate > moveposition_rate:
-                recommended = "Echelon"
-                reason = f"Higher supply APY ({echelon_rate:.2f}% vs {moveposition_rate:.2f}%)"
-                advantage = f"+{echelon_rate - moveposition_rate:.2f}% APY"
-            else:
-                recommended = "MovePosition"
-                reason = f"Higher supply APY ({moveposition_rate:.2f}% vs {echelon_rate:.2f}%)"
-                advantage = f"+{moveposition_rate - echelon_rate:.2f}% APY"
-
-            print(f"🏆 [LEND] Recommendation: {recommended}")
-            print(f"   - Reason: {reason}")
-            print(f"   - Echelon rate: {echelon_rate:.2f}%")
-            print(f"   - MovePosition rate: {moveposition_rate:.2f}%")
-
-            result = json.dumps(
-                {
-                    "action": "lend",
-                    "asset": asset,
-                    "recommended_protocol": recommended,
-                    "reason": reason,
-                    "moveposition_rate": f"{moveposition_rate:.2f}%",
-                    "echelon_rate": f"{echelon_rate:.2f}%",
-                    "moveposition_tvl": f"${moveposition_tvl:,.2f}",
-                    "echelon_tvl": f"${echelon_tvl:,.2f}",
-                    "advantage": advantage,
-                    "message": f"{recommended} is recommended for lending {asset}",
-                    "user_prompt": f"Which platform would you like to proceed with to lend {asset}? Please select 'MovePosition' or 'Echelon'.",
-                }
-            )
-            print(f"✅ [LEND] Returning recommendation JSON:")
-            print(f"   {result[:200]}..." if len(result) > 200 else f"   {result}")
-            print(f"{'='*60}\n")
-            return result
-        else:
-            print(f"❌ [LEND] Missing data - cannot make recommendation")
-            print(f"   - Echelon asset: {echelon_asset is not None}")
-            print(f"   - MovePosition broker: {moveposition_broker is not None}")
-            result = json.dumps(
-                {
-                    "action": "lend",
-                    "asset": asset,
-                    "error": "Unable to fetch data from one or both protocols",
-                    "message": "Cannot make recommendation - data unavailable",
-                }
-            )
-            print(f"{'='*60}\n")
-            return result
-    elif action.lower() == "borrow":
-        if echelon_asset and moveposition_broker:
-            print(f"💰 [BORROW] Both protocols have {asset}, calculating rates...")
-            echelon_rate = echelon_asset.get("borrowApr", 0) * 100
-            echelon_ltv = echelon_asset.get("ltv", 0) * 100
-            moveposition_rate = moveposition_broker.get("interestRate", 0) * 100
-            moveposition_utilization = moveposition_broker.get("utilization", 0) * 100
-
-            print(f"📈 [BORROW] Rate calculations:")
-            print(f"   - Echelon borrow APR: {echelon_rate:.2f}%, LTV: {echelon_ltv:.2f}%")
-            print(
-                f"   - MovePosition borrow APR: {moveposition_rate:.2f}%, Utilization: {moveposition_utilization:.2f}%"
-            )
+    print(f"   - Echelon asset found: {echelon is not None}")
+    print(f"   - MovePosition broker found: {moveposition is not None}")
 
-            if echelon_rate < moveposition_rate:
-                recommended = "Echelon"
-                reason = f"Lower borrow APR ({echelon_rate:.2f}% vs {moveposition_rate:.2f}%)"
-                if echelon_ltv > 0:
-                    reason += f" and higher LTV ({echelon_ltv:.2f}%)"
-                advantage = f"-{moveposition_rate - echelon_rate:.2f}% APR"
-            else:
-                recommended = "MovePosition"
-                reason = f"Lower borrow APR ({moveposition_rate:.2f}% vs {echelon_rate:.2f}%)"
-                advantage = f"-{echelon_rate - moveposition_rate:.2f}% APR"
-
-            print(f"🏆 [BORROW] Recommendation: {recommended}")
-            print(f"   - Reason: {reason}")
-            print(f"   - Echelon rate: {echelon_rate:.2f}%")
-            print(f"   - MovePosition rate: {moveposition_rate:.2f}%")
-
-            result = json.dumps(
-                {
-                    "action": "borrow",
-                    "asset": asset,
-                    "recommended_protocol": recommended,
-                    "reason": reason,
-                    "moveposition_rate": f"{moveposition_rate:.2f}%",
-                    "echelon_rate": f"{echelon_rate:.2f}%",
-                    "moveposition_utilization": f"{moveposition_utilization:.2f}%",
-                    "echelon_ltv": f"{echelon_ltv:.2f}%",
-                    "advantage": advantage,
-                    "message": f"{recommended} is recommended for borrowing {asset}",
-                    "user_prompt": f"Which platform would you like to proceed with to borrow {asset}? Please select 'MovePosition' or 'Echelon'.",
-                }
-            )
-            print(f"✅ [BORROW] Returning recommendation JSON:")
-            print(f"   {result[:200]}..." if len(result) > 200 else f"   {result}")
-            print(f"{'='*60}\n")
-            return result
-        elif moveposition_broker:
-            # Only MovePosition data available
-            moveposition_rate = moveposition_broker.get("interestRate", 0) * 100
-            moveposition_utilization = moveposition_broker.get("utilization", 0) * 100
-            return json.dumps(
-                {
-                    "action": "borrow",
-                    "asset": asset,
-                    "recommended_protocol": "MovePosition",
-                    "reason": f"MovePosition available with {moveposition_rate:.2f}% APR (Echelon data unavailable)",
-                    "moveposition_rate": f"{moveposition_rate:.2f}%",
-                    "echelon_rate": "N/A",
-                    "moveposition_utilization": f"{moveposition_utilization:.2f}%",
-                    "echelon_ltv": "N/A",
-                    "message": f"MovePosition is available for borrowing {asset} at {moveposition_rate:.2f}% APR. Echelon data is currently unavailable.",
-                    "user_prompt": f"Would you like to proceed with MovePosition to borrow {asset}?",
-                }
-            )
-        elif echelon_asset:
-            # Only Echelon data available
-            echelon_rate = echelon_asset.get("borrowApr", 0) * 100
-            echelon_ltv = echelon_asset.get("ltv", 0) * 100
-            return json.dumps(
-                {
-                    "action": "borrow",
-                    "asset": asset,
-                    "recommended_protocol": "Echelon",
-                    "reason": f"Echelon available with {echelon_rate:.2f}% APR (MovePosition data unavailable)",
-                    "moveposition_rate": "N/A",
-                    "echelon_rate": f"{echelon_rate:.2f}%",
-                    "moveposition_utilization": "N/A",
-                    "echelon_ltv": f"{echelon_ltv:.2f}%",
-                    "message": f"Echelon is available for borrowing {asset} at {echelon_rate:.2f}% APR. MovePosition data is currently unavailable.",
-                    "user_prompt": f"Would you like to proceed with Echelon to borrow {asset}?",
-                }
-            )
-        else:
-            return json.dumps(
-                {
-                    "action": "borrow",
-                    "asset": asset,
-                    "error": "Unable to fetch data from either protocol",
-                    "message": "Cannot make recommendation - both protocols are currently unavailable. Please try again later.",
-                }
-            )
-    else:
-        return json.dumps(
-            {
-                "error": "Invalid action. Use 'lend' or 'borrow'",
-                "message": "Please specify 'lend' or 'borrow'",
-            }
-        )
+    return handler(asset, echelon, moveposition)
 
 
 def convert_apr_to_apy(apr: float) -> float:
@@ -837,7 +1117,7 @@ def convert_apr_to_apy(apr: float) -> float:
 
 
 @tool
-def get_best_supply_rate(asset: Optional[str] = None) -> str:
+async def get_best_supply_rate(asset: Optional[str] = None) -> str:
     """Find the best supply/lending rate across MovePosition and Echelon protocols.
 
     This tool compares all available assets across both protocols and returns the best supply rate.
@@ -851,15 +1131,9 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
     Returns:
         JSON string with the best protocol, asset, and APY information (all rates in APY)
     """
-    echelon_data = fetch_echelon_data()
-    moveposition_data = fetch_moveposition_data()
+    echelon_data, moveposition_data = await fetch_protocol_data()
     if not echelon_data and not moveposition_data:
-        return json.dumps(
-            {
-                "error": "Unable to fetch data from protocols",
-                "message": "Both protocols are currently unavailable",
-            }
-        )
+        return _PROTOCOLS_UNAVAILABLE_JSON
     best_rate = 0.0
     best_protocol = None
     best_asset = None
@@ -867,58 +1141,42 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
     all_rates = []
     if asset:
         asset_upper = asset.upper()
-        echelon_asset = find_asset_in_echelon(echelon_data, asset_upper) if echelon_data else None
-        moveposition_broker = (
-            find_asset_in_moveposition(moveposition_data, asset_upper)
-            if moveposition_data
-            else None
-        )
-        if echelon_asset:
-            echelon_supply_apr = calculate_echelon_supply_apr(echelon_asset)
-            echelon_supply_apy = convert_apr_to_apy(echelon_supply_apr)
+        echelon = _echelon_asset_view(echelon_data, asset_upper)
+        moveposition = _moveposition_asset_view(moveposition_data, asset_upper)
+        if echelon:
+            echelon_symbol = echelon.asset.get("symbol", asset_upper)
             all_rates.append(
                 {
                     "protocol": "Echelon",
-                    "asset": echelon_asset.get("symbol", asset_upper),
-                    "asset_name": echelon_asset.get("name", ""),
-                    "supply_rate": echelon_supply_apy,
-                    "supply_rate_apr": echelon_supply_apr,
+                    "asset": echelon_symbol,
+                    "asset_name": echelon.asset.get("name", ""),
+                    "supply_rate": echelon.supply_apy,
+                    "supply_rate_apr": echelon.supply_apr,
                     "rate_type": "APY",
                 }
             )
-            if echelon_supply_apy > best_rate:
-                best_rate = echelon_supply_apy
+            if echelon.supply_apy > best_rate:
+                best_rate = echelon.supply_apy
                 best_protocol = "Echelon"
-                best_asset = echelon_asset
-                best_asset_symbol = echelon_asset.get("symbol", asset_upper)
-        if moveposition_broker:
-            moveposition_supply_apy = calculate_moveposition_supply_apy_by_utilization(
-                moveposition_broker
-            )
-            underlying = moveposition_broker.get("underlyingAsset", {})
-            asset_name = underlying.get("name", "")
+                best_asset = echelon.asset
+                best_asset_symbol = echelon_symbol
+        if moveposition:
             all_rates.append(
                 {
                     "protocol": "MovePosition",
                     "asset": asset_upper,
-                    "asset_name": asset_name,
-                    "supply_rate": moveposition_supply_apy,
+                    "asset_name": moveposition.broker.get("underlyingAsset", {}).get("name", ""),
+                    "supply_rate": moveposition.supply_apy,
                     "rate_type": "APY",
                 }
             )
-            if moveposition_supply_apy > best_rate:
-                best_rate = moveposition_supply_apy
+            if moveposition.supply_apy > best_rate:
+                best_rate = moveposition.supply_apy
                 best_protocol = "MovePosition"
-                best_asset = moveposition_broker
+                best_asset = moveposition.broker
                 best_asset_symbol = asset_upper
         if not all_rates:
-            return json.dumps(
-                {
-                    "asset": asset_upper,
-                    "error": "Asset not found in either protocol",
-                    "message": f"{asset_upper} is not available on MovePosition or Echelon",
-                }
-            )
+            return _asset_not_found_json(asset_upper)
         comparison = {
             "asset": asset_upper,
             "best_protocol": best_protocol,
@@ -928,7 +1186,7 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
             "all_rates": all_rates,
             "message": f"Best supply rate for {asset_upper} is {best_rate:.4f}% APY on {best_protocol}",
         }
-        return json.dumps(comparison)
+        return _json_dumps(comparison)
     else:
         if echelon_data and "data" in echelon_data and "assets" in echelon_data["data"]:
             for echelon_asset in echelon_data["data"]["assets"]:
@@ -952,12 +1210,12 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
                 )
         if moveposition_data:
             for broker in moveposition_data:
-                underlying = broker.get("underlyingAsset", {})
-                asset_name = underlying.get("name", "")
+                asset_name = (broker.get(UNDERLYING_ASSET_KEY) or {}).get("name", "")
+                asset_name_lower = asset_name.lower()
                 symbol = asset_name.replace("movement-", "").replace("-fa", "").upper()
-                if "move" in asset_name.lower() and "fa" in asset_name.lower():
+                if "move" in asset_name_lower and "fa" in asset_name_lower:
                     symbol = "MOVE-FA"
-                elif "move" in asset_name.lower():
+                elif "move" in asset_name_lower:
                     symbol = "MOVE"
                 supply_apy = calculate_moveposition_supply_apy_by_utilization(broker)
                 if supply_apy > best_rate:
@@ -975,12 +1233,7 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
                     }
                 )
         if not all_rates:
-            return json.dumps(
-                {
-                    "error": "No rates available",
-                    "message": "Unable to fetch rates from either protocol",
-                }
-            )
+            return _NO_RATES_JSON
         sorted_rates = sorted(all_rates, key=lambda x: x["supply_rate"], reverse=True)
         top_5 = sorted_rates[:5]
         result = {
@@ -993,7 +1246,7 @@ def get_best_supply_rate(asset: Optional[str] = None) -> str:
             "total_assets_compared": len(all_rates),
             "message": f"Best supply rate is {best_rate:.4f}% APY for {best_asset_symbol} on {best_protocol}",
         }
-        return json.dumps(result)
+        return _json_dumps(result)
 
 
 @tool
@@ -1008,7 +1261,7 @@ def supply_collateral(asset: str, amount: str, protocol: str = "moveposition") -
     Returns:
         JSON string with supply transaction details
     """
-    return json.dumps(
+    return _json_dumps(
         {
             "status": "success",
             "protocol": protocol,
@@ -1033,7 +1286,7 @@ def borrow_asset(asset: str, amount: str, protocol: str = "moveposition") -> str
     Returns:
         JSON string with borrow transaction details including interest rate and health factor
     """
-    return json.dumps(
+    return _json_dumps(
         {
             "status": "success",
             "protocol": protocol,
@@ -1059,7 +1312,7 @@ def repay_loan(asset: str, amount: str, protocol: str = "moveposition") -> str:
     Returns:
         JSON string with repayment details and updated health factor
     """
-    return json.dumps(
+    return _json_dumps(
         {
             "status": "success",
             "protocol": protocol,
@@ -1085,7 +1338,7 @@ def check_health_factor(protocol: str = "moveposition") -> str:
     Returns:
         JSON string with health factor, collateral value, borrowed value, and liquidation threshold
     """
-    return json.dumps(
+    return _json_dumps(
         {
             "protocol": protocol,
             "health_factor": "1.8",
@@ -1115,40 +1368,38 @@ def get_tools() -> List[Any]:
     ]
 
 
-def validate_openai_api_key() -> None:
-    if not os.getenv(ENV_OPENAI_API_KEY):
-        raise ValueError("OPENAI_API_KEY required")
+_API_KEY = os.getenv(ENV_OPENAI_API_KEY)
+_MODEL_NAME = os.getenv(ENV_OPENAI_MODEL, DEFAULT_MODEL)
+# Set to skip the import-time key check (e.g. tests that only exercise market data helpers)
+ENV_SKIP_VALIDATION = "LENDING_AGENT_SKIP_VALIDATION"
 
 
-def create_chat_model() -> ChatOpenAI:
-    return ChatOpenAI(
-        model=os.getenv(ENV_OPENAI_MODEL, DEFAULT_MODEL), temperature=DEFAULT_TEMPERATURE
-    )
+def validate_openai_api_key() -> None:
+    if not _API_KEY:
+        raise ValueError("OPENAI_API_KEY required")
 
 
-def is_assistant_message(msg: Any) -> bool:
-    if hasattr(msg, MESSAGE_KEY_TYPE):
-        return msg.type == MESSAGE_TYPE_AI
-    if isinstance(msg, dict):
-        return msg.get(MESSAGE_KEY_TYPE) == MESSAGE_TYPE_AI
-    return False
+if not os.getenv(ENV_SKIP_VALIDATION):
+    validate_openai_api_key()
 
 
-def extract_message_content(msg: Any) -> str:
-    if hasattr(msg, MESSAGE_KEY_CONTENT):
-        return msg.content
-    if isinstance(msg, dict):
-        return msg.get(MESSAGE_KEY_CONTENT, "")
-    return ""
+def create_chat_model() -> ChatOpenAI:
+    return ChatOpenAI(model=_MODEL_NAME, temperature=DEFAULT_TEMPERATURE)
 
 
 def extract_assistant_response(result: Any) -> str:
     if isinstance(result, dict) and MESSAGE_KEY_MESSAGES in result:
         for msg in reversed(result[MESSAGE_KEY_MESSAGES]):
-            if is_assistant_message(msg):
-                content = extract_message_content(msg)
-                if content:
-                    return content
+            if isinstance(msg, dict):
+                if msg.get(MESSAGE_KEY_TYPE) != MESSAGE_TYPE_AI:
+                    continue
+                content = msg.get(MESSAGE_KEY_CONTENT, "")
+            else:
+                if getattr(msg, MESSAGE_KEY_TYPE, None) != MESSAGE_TYPE_AI:
+                    continue
+                content = getattr(msg, MESSAGE_KEY_CONTENT, "")
+            if content:
+                return content
     return ""
 
 
@@ -1157,7 +1408,6 @@ class LendingAgent:
         self._agent = self._build_agent()
 
     def _build_agent(self):
-        validate_openai_api_key()
         return create_agent(
             model=create_chat_model(), tools=get_tools(), system_prompt=get_system_prompt()
         )
@@ -1173,25 +1423,34 @@ class LendingAgent:
                 config={"configurable": {"thread_id": session_id}},
             )
             output = extract_assistant_response(result) or EMPTY_RESPONSE_MESSAGE
-            return json.dumps({"response": output, "success": True})
+            return _json_dumps({"response": output, "success": True})
         except Exception as e:
-            return json.dumps({"response": f"Error: {e}", "success": False})
+            return _json_dumps({"response": f"Error: {e}", "success": False})
+
+
+@lru_cache(maxsize=1)
+def get_agent() -> LendingAgent:
+    """Return the process-wide LendingAgent, building the chat model and graph once."""
+    return LendingAgent()
 
 
 class LendingAgentExecutor(AgentExecutor):
     def __init__(self):
-        self.agent = LendingAgent()
+        self.agent = get_agent()
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         query = context.get_user_input()
         session_id = getattr(context, "context_id", DEFAULT_SESSION_ID)
-        final_content = await self.agent.invoke(query, session_id)
-        message = Message(
-            message_id=str(uuid.uuid4()),
-            role=Role.agent,
-            parts=[Part(root=TextPart(kind="text", text=final_content))],
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        # Interim, non-final status so streaming clients see progress while the LLM and
+        # upstream fetches run. The answer completes the task, so the task store never
+        # keeps it in the working state.
+        await updater.update_status(
+            TaskState.working,
+            updater.new_agent_message([Part(root=TextPart(text=WORKING_STATUS_MESSAGE))]),
         )
-        await event_queue.enqueue_event(message)
+        final_content = await self.agent.invoke(query, session_id)
+        await updater.complete(updater.new_agent_message([Part(root=TextPart(text=final_content))]))
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise NotImplementedError("cancel not supported")
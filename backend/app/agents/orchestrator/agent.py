@@ -11,7 +11,7 @@ ARCHITECTURE OVERVIEW:
 The orchestrator follows a coordination pattern:
 
 1. AG-UI ADK Layer:
-   - Uses Google ADK's LlmAgent with Gemini 2.5 Pro model
+   - Uses Google ADK's LlmAgent with Gemini 2.5 Flash (Pro fallback for bad tool calls)
    - Exposed via AG-UI Protocol through ADKAgent wrapper
    - Uses FastAPI with add_adk_fastapi_endpoint for HTTP interface
    - Supports session management and in-memory services
@@ -20,7 +20,8 @@ The orchestrator follows a coordination pattern:
    - Receives user queries and determines which specialized agent to call
    - Currently coordinates with Balance Agent (A2A protocol)
    - Uses send_message_to_a2a_agent tool (provided by frontend middleware)
-   - Enforces sequential agent calls (no parallel/concurrent calls)
+   - Independent agent calls in one response run in parallel; chained steps
+     are sequenced (planning.py)
 
 3. Specialized Agents:
    - Balance Agent: Checks cryptocurrency balances across multiple chains
@@ -34,17 +35,38 @@ WORKFLOW:
 4. Agent calls Balance Agent (or other specialized agent) via A2A protocol
 5. Waits for response from specialized agent
 6. Formats and presents results to user
-7. For multiple queries, processes sequentially (one at a time)
+7. For multiple independent queries, issues the agent calls in parallel
 
 KEY COMPONENTS:
 ---------------
-- LlmAgent: Core Gemini-based agent with detailed orchestration instructions
+- LlmAgent: Core Gemini-based agent, built lazily by get_orchestrator_agent()
+  on first app creation
+- prompt.txt: Compact global orchestration rules, read and
+  whitespace-compressed once by load_instruction()
+- AGENT_ROUTES (routes.py): Per-intent task formats and examples, added to a
+  request only when the user's message matches the intent
 - ADKAgent: Wraps LlmAgent for AG-UI Protocol compatibility
 - create_orchestrator_agent_app(): Factory function to create FastAPI app
+- POST /quick: Returns the transfer/swap/popular-token action for a
+  grammar-regular query without any model call (extractors.py), or null
 
 ENVIRONMENT VARIABLES:
 ----------------------
 - GOOGLE_API_KEY: Required - Google AI Studio API key for Gemini model access
+- BALANCE_CACHE_TTL_MS: Optional - Balance Agent reply cache TTL (default: 500)
+- LIQUIDITY_CACHE_TTL_MS: Optional - Lending rate reply cache TTL (default: 30000)
+- ORCHESTRATOR_CONTEXT_CACHE_TTL_SECONDS: Optional - Gemini context cache TTL (default: 3600)
+- ORCHESTRATOR_MODEL: Optional - Primary model (default: gemini-2.5-flash)
+- ORCHESTRATOR_FALLBACK_MODEL: Optional - Escalation model (default: gemini-2.5-pro)
+- ORCHESTRATOR_SYNTHESIS_TOKEN_THRESHOLD: Optional - Tool result size that moves a turn
+  to the escalation model (default: 2000)
+- ORCHESTRATOR_COMPACTION_TOKEN_THRESHOLD: Optional - History size above which older
+  turns are summarized (default: 4000)
+- ORCHESTRATOR_ROUTING_MAX_OUTPUT_TOKENS: Optional - Output cap for turns that pick a
+  tool call (default: 256)
+- ORCHESTRATOR_SUMMARY_MODEL: Optional - Model writing history summaries
+  (default: ORCHESTRATOR_MODEL)
+- REDIS_URL: Optional - Redis URL for shared session and artifact storage (default: in-memory)
 
 USAGE:
 ------
@@ -54,736 +76,223 @@ Mounted mode (recommended):
 
 NOTES:
 ------
-- Uses Gemini 2.5 Pro model for orchestration logic
-- Enforces sequential agent calls (critical constraint)
-- Validates wallet addresses (0x format, 42 characters)
+- Uses Gemini 2.5 Flash for routing; Gemini 2.5 Pro only redoes turns with a
+  malformed tool call and synthesizes several or large agent results (model.py)
+- Independent A2A calls fan out in parallel; explicitly chained requests keep
+  one call per (agent, address) per turn (planning.py)
+- Malformed 0x addresses are rejected in Python before any model call
+  (validation.py)
+- Unambiguous requests (popular tokens, "transfer N TOKEN to 0x...", "swap X
+  for Y") are routed to their tool call by regex without a model call
+  (router.py); other routing turns run without thinking and with a capped
+  output
 - Supports multiple EVM chains (Ethereum, BNB, Polygon, etc.)
-- Uses in-memory services (sessions, artifacts, memory) - not persistent
+- Sessions and artifacts are stored in Redis when REDIS_URL is set
+  (sessions.py, artifacts.py); memory uses the in-memory service - not
+  persistent
+- Gemini calls share one pooled keep-alive httpx.AsyncClient (http_client.py)
+- The fixed prompt, tool declarations and history prefix are served from Gemini
+  context caching once a session's prompt reaches Flash's 1024-token minimum
+- Long sessions send a rolling summary of older turns instead of the full
+  history, keeping the prompt prefix stable for the context cache
+  (compaction.py)
+- Responses stream token by token over unbuffered SSE (streaming.py)
+- Agent names, token symbols and networks in tool calls are normalized with
+  lookup tables (normalization.py)
 - Frontend A2A middleware provides send_message_to_a2a_agent tool
+- Balances for a message that is almost certainly a balance query are
+  prefetched from the in-process Balance Agent while the model decides
+  (speculation.py)
+- Idempotent balance/lending-rate replies are cached (see cache.py) and
+  answered in-process on repeat questions; the model's routing decision for a
+  repeated query is cached too and replayed without a model call (router.py)
 """
 
 from __future__ import annotations
 
-from dotenv import load_dotenv
-
-load_dotenv()
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from ag_ui_adk import ADKAgent, add_adk_fastapi_endpoint
 from google.adk.agents import LlmAgent
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.apps import App
+from google.adk.runners import Runner
+from google.genai import types
+from pydantic import BaseModel
+
+from app.agents.orchestrator.artifacts import create_artifact_service
+from app.agents.orchestrator.cache import (
+    get_cached_agent_response,
+    harvest_a2a_responses,
+    serve_cached_a2a_calls,
+)
+from app.agents.orchestrator.compaction import SessionMemoryCompactor
+from app.agents.orchestrator.http_client import close_shared_http_client, get_shared_http_client
+from app.agents.orchestrator.model import ORCHESTRATOR_MODEL, EscalatingGemini
+from app.agents.orchestrator.normalization import normalize_tool_arguments
+from app.agents.orchestrator.planning import sequence_chained_calls
+from app.agents.orchestrator.router import (
+    fast_route,
+    limit_routing_output,
+    release_routing_decision,
+    remember_routing_decision,
+    replay_routing_decision,
+    route_without_model,
+)
+from app.agents.orchestrator.routes import inject_route_notes
+from app.agents.orchestrator.sessions import create_session_service
+from app.agents.orchestrator.speculation import prefetch_predicted_balances
+from app.agents.orchestrator.streaming import SSEHeadersMiddleware, streaming_run_config
+from app.agents.orchestrator.validation import reject_malformed_addresses
+from app.env import load_env
+
+
+# Gemini context caching of the prompt prefix (see ContextCachedADKAgent)
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("ORCHESTRATOR_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+CONTEXT_CACHE_INTERVALS = 100  # invocations served by one cache before it is recreated
+# Gemini 2.5 Flash's minimum cacheable prompt size. The static instruction
+# alone (~550 tokens) is below it, so a cache is created once tool declarations
+# and history bring a session's previous prompt past it
+CONTEXT_CACHE_MIN_TOKENS = 1024
+
+# Fixed orchestrator prompt, kept in prompt.txt next to this module. Passed as
+# static_instruction so it forms a stable system-instruction prefix that
+# Gemini context caching can reuse; per-session context from the frontend
+# (wallet address, etc.) is sent as dynamic content.
+INSTRUCTION_PATH = Path(__file__).with_name("prompt.txt")
+_TRAILING_WHITESPACE_PATTERN = re.compile(r"[ \t]+\n")
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+
+@lru_cache(maxsize=1)
+def load_instruction() -> str:
+    """Read the orchestrator prompt once and compress its whitespace.
 
+    Returns:
+        The prompt text without trailing spaces or runs of blank lines
+    """
+    text = INSTRUCTION_PATH.read_text(encoding="utf-8")
+    text = _TRAILING_WHITESPACE_PATTERN.sub("\n", text)
+    text = _BLANK_LINES_PATTERN.sub("\n\n", text)
+    return text.strip()
 
-orchestrator_agent = LlmAgent(
-    name="OrchestratorAgent",
-    model="gemini-2.5-pro",
-    instruction="""
-    You are a DeFi orchestrator agent for Movement Network. Your role is to coordinate
-    specialized agents to fetch and aggregate on-chain balance and swap
-    information on Movement Network.
-
-    **CRITICAL: This application works EXCLUSIVELY with Movement Network. All operations default to Movement Network.**
-
-    **NOTE: All services are FREE - No payment or x402 required for any action.**
-
-    **IMPORTANT - VALID QUERIES YOU CAN HANDLE**:
-
-    - Balance queries: "get balance", "check USDT", "get popular tokens", "show trending tokens"
-
-    - Transfer queries: "transfer 1 MOVE to 0x...", "send 100 USDC to address", "I want to transfer tokens"
-
-    - Bridge queries: "bridge tokens", "bridge USDC from Ethereum to Movement"
-
-    - Lending queries: "supply collateral", "borrow assets", "check health factor"
-
-    **CRITICAL**: "get popular tokens" is a VALID balance query. You MUST route it to the Balance Agent.
-
-    DO NOT say "I cannot fulfill this request" for "get popular tokens" - it is fully supported.
-
-    🔧 AVAILABLE TOOL:
-    - **send_message_to_a2a_agent** - This is the EXACT tool name to call specialized agents
-    - The tool name is: send_message_to_a2a_agent (with "a2a" - the number 2, not "a_a")
-    - DO NOT use: send_message_to_a_a_agent (this is WRONG)
-    - ALWAYS use: send_message_to_a2a_agent (this is CORRECT)
-    - Parameters: agentName (string) and task (string)
-    - Agent names are extracted from URL paths - use the EXACT agent name:
-      * "balance" (from /balance endpoint)
-      * "bridge" (from /bridge endpoint)
-      * "lending" (from /lending endpoint)
-    - Example: send_message_to_a2a_agent(agentName="balance", task="get balance of 0x... on movement")
-
-    AVAILABLE SPECIALIZED AGENTS (ALL WORK EXCLUSIVELY ON MOVEMENT NETWORK):
-
-    1. **Balance Agent** (A2A Protocol)
-
-       - Fetches account balance information from Movement Network
-
-       - Provides comprehensive balance data including native token balances (MOVE), token balances, and USD values
-
-       - **ENHANCED FEATURES**:
-
-         * Specific token: "get USDT on Movement" → Returns USDT balance on Movement Network
-
-         * Popular tokens: "get popular tokens" → Fetches trending tokens and returns their balances
-
-       - Format: "Get balance for [account_address] on movement" or "Get balance for [account_address]"
-
-       - Token-specific format: "Get [token_symbol] balance on movement" or "Get [token_symbol] balance"
-
-       - Example queries:
-
-         * "Get balance for 0x1234... on movement"
-
-         * "get USDT on movement"
-
-         * "get USDT balance" (on Movement Network)
-
-         * "get popular tokens"
-
-         * "check USDC on movement"
-
-       - Returns balance information for the specified account
-
-       - **CRITICAL**: Use Balance Agent for ALL balance-related queries
-
-       - **NOTE**: Movement Network addresses are 66 characters (0x + 64 hex chars)
-
-    2. **Bridge Agent** (A2A Protocol)
-
-       - Handles cross-chain asset bridging via Movement Bridge
-
-       - Bridges assets between Ethereum, BNB, Polygon and Movement Network
-
-       - Supports native tokens (ETH, BNB, MATIC) and ERC-20 tokens (USDC, USDT, DAI)
-
-       - Can initiate bridge transactions, check status, and estimate fees
-
-       - Requires source chain, destination chain, asset, amount, and recipient address
-
-       - Format: "Bridge [amount] [token] from [source_chain] to movement for [account_address]"
-
-       - Example queries: "Bridge 1 ETH from Ethereum to Movement", "Bridge 100 USDC to Movement"
-
-    3. **Lending Agent** (A2A Protocol)
-
-       - MovePosition and Echelon lending protocols on Movement Network
-
-       - Supply collateral and borrow assets
-
-       - Repay loans
-
-       - Check health factors and liquidation risks
-
-       - Compare lending/borrowing rates between protocols
-
-       - Requires asset, amount, and protocol selection
-
-       - Format: "Supply [amount] [token] as collateral" or "Borrow [amount] [token]"
-
-       - Example queries: "Supply 1000 USDC as collateral", "Borrow 500 USDT", "which platform has lower APR for borrowing MOVE"
-
-       - **CRITICAL**: When user asks about comparing rates (e.g., "which platform has lower APR", "compare borrowing rates"), call the Lending Agent with: "compare borrowing rates for [asset]" or "recommend best protocol for borrowing [asset]"
-
-       - After receiving a recommendation response from Lending Agent, you MUST call the frontend action: **show_lending_platform_selection**
-
-       - The recommendation response will contain: action, asset, recommended_protocol, echelon_rate, moveposition_rate, reason
-
-       - Extract these fields and call: show_lending_platform_selection(action="borrow", asset="MOVE", recommendedProtocol="MovePosition", echelonRate="62.00%", movepositionRate="30.91%", reason="Lower borrow APY...")
-
-    **CRITICAL CONSTRAINTS**:
-
-    - You MUST call agents ONE AT A TIME, never make multiple tool calls simultaneously
-
-    - After making a tool call, WAIT for the result before making another tool call
-
-    - Do NOT make parallel/concurrent tool calls - this is not supported
-
-    - Wallet addresses must start with "0x" and be valid hexadecimal
-
-    - Movement Network addresses are 66 characters (0x + 64 hex chars)
-
-    - All operations are EXCLUSIVELY on Movement Network - do NOT reference other chains
-
-    **CRITICAL - QUEST BEHAVIOR (MANDATORY)**:
-
-    - DO NOT proactively trigger actions for quest steps that the user hasn't explicitly requested
-
-    - DO NOT automatically initiate the next quest step's action after completing the current step
-
-    - ONLY respond to what the user explicitly asks for - wait for the user to type the next action
-
-    - If a user completes a quest step (e.g., checks balance), DO NOT automatically trigger the next step (e.g., swap)
-
-    - The quest card will guide the user - you should NOT take initiative to complete quest steps for them
-
-    - Example: If user completes "check my balance" and the next quest step is "swap tokens", DO NOT call initiate_swap unless the user explicitly says "swap" or "I want to swap"
-
-    - Wait for explicit user requests - do NOT anticipate or pre-empt quest steps
-
-    - The quest system handles step progression - you only respond to user queries
-
-    - DO NOT suggest or trigger actions based on quest progression - only respond to explicit user queries
-
-    RECOMMENDED WORKFLOW FOR TRANSFER QUERIES:
-
-    **For Transfer Queries** (CRITICAL - Use Frontend Action):
-
-    When a user wants to transfer tokens (e.g., "transfer 1 MOVE to 0x...", "send 100 USDC to address", "I want to transfer tokens"):
-
-    1. **Extract Transfer Parameters**:
-
-       - **Amount**: Extract the amount from user query (e.g., "1", "100", "0.5")
-
-       - **Token**: Extract token symbol from user query (e.g., "MOVE", "USDC", "USDT", "DAI")
-
-         * If no token specified, default to "MOVE" (native token)
-
-       - **To Address**: Extract recipient address from user query
-
-         * Look for 66-character addresses starting with "0x" (Movement Network format)
-
-         * If user says "this address" or "that address", check if an address was mentioned earlier in conversation
-
-         * If address is provided in the query, use it
-
-         * If address is missing, ask user to provide the recipient address
-
-    2. **Extract From Address**:
-
-       - **CRITICAL**: The sender address is ALWAYS the user's connected wallet address from system instructions
-
-       - Extract the wallet address from system instructions (same process as balance queries)
-
-       - Use that exact address as the "fromAddress"
-
-    3. **Call Frontend Transfer Action**:
-
-       - Use the action: **initiate_transfer**
-
-       - Parameters:
-
-         * amount: The amount to transfer (as string, e.g., "1", "100", "0.5")
-
-         * token: The token symbol (e.g., "MOVE", "USDC", "USDT")
-
-         * toAddress: The recipient address (66 characters, must start with 0x)
-
-       - Example: initiate_transfer(amount="1", token="MOVE", toAddress="[RECIPIENT_ADDRESS]")
-
-    4. **Transfer Card Display**:
-
-       - The frontend will display a TransferCard with transfer details
-
-       - User can review and click "Transfer" button to execute
-
-       - DO NOT execute the transfer yourself - let the frontend handle it
-
-    **Transfer Query Examples**:
-
-    - "transfer 1 MOVE to [RECIPIENT_ADDRESS]"
-
-      → initiate_transfer(amount="1", token="MOVE", toAddress="[RECIPIENT_ADDRESS]")
-
-    - "I want to transfer 100 USDC to this address: 0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb"
-
-      → initiate_transfer(amount="100", token="USDC", toAddress="0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb")
-
-    - "send 0.5 MOVE to 0x..."
-
-      → initiate_transfer(amount="0.5", token="MOVE", toAddress="0x...")
-
-    - "transfer tokens" (missing amount/address)
-
-      → Ask user: "Please provide the amount, token symbol, and recipient address for the transfer."
-
-    **CRITICAL RULES FOR TRANSFERS**:
-
-    - ALWAYS use the user's wallet address from system instructions as the "fromAddress"
-
-    - DO NOT ask for the sender address - it's already provided
-
-    - If recipient address is missing, ask user to provide it
-
-    - If amount is missing, ask user to provide it
-
-    - Default token to "MOVE" if not specified
-
-    - Network is ALWAYS "movement" (Movement Network)
-
-    - DO NOT execute the transfer - just call initiate_transfer action and let frontend handle execution
-
-    RECOMMENDED WORKFLOW FOR SWAP QUERIES:
-
-    **For Swap Queries** (CRITICAL - Use Frontend Action):
-
-    **🚨 ABSOLUTELY CRITICAL - NEVER CALL THIS AFTER BALANCE CHECKS**:
-    - **NEVER** call initiate_swap after checking balance - this is STRICTLY FORBIDDEN
-    - **NEVER** call initiate_swap after balance queries, even if the user has tokens
-    - **NEVER** call initiate_swap proactively, suggestively, or automatically
-    - **ONLY** call initiate_swap when the user EXPLICITLY and DIRECTLY says they want to swap
-    - **REQUIRED USER PHRASES**: User must say "swap", "exchange", "I want to swap", "swap tokens", or similar explicit swap request
-    - **FORBIDDEN SCENARIOS**:
-      - User says "check my balance" → DO NOT call initiate_swap
-      - User says "get my balance" → DO NOT call initiate_swap
-      - User says "show my tokens" → DO NOT call initiate_swap
-      - Balance check completes → DO NOT call initiate_swap
-      - User is on a quest step → DO NOT call initiate_swap unless user explicitly requests swap
-    - **RULE**: If the user's message does NOT contain words like "swap", "exchange", "trade", or explicit swap intent, DO NOT call initiate_swap
-    - **AFTER BALANCE CHECK**: Present balance results and STOP - wait for user's next message
-    - **VERIFICATION**: Before calling initiate_swap, ask yourself: "Did the user explicitly ask to swap?" If NO, DO NOT call it
-
-    When a user wants to swap tokens (e.g., "swap MOVE for USDC", "exchange USDT to MOVE", "swap tokens", "I want to swap X with Y"):
-
-    1. **Extract Swap Parameters**:
-
-       - **From Token**: Extract the token symbol to swap from (e.g., "MOVE", "USDC", "USDT", "USDC.e", "USDT.e", "WBTC.e", "WETH.e")
-
-         * Look for patterns like: "swap X for Y", "exchange X to Y", "swap X with Y"
-         * X is the fromToken, Y is the toToken
-         * If user says "swap tokens" without specifying, ask which tokens
-         * **CRITICAL**: Only tokens from the available token list can be swapped. Common verified tokens include:
-           - MOVE (native token, always available)
-           - USDC.e, USDT.e (verified stablecoins)
-           - WBTC.e, WETH.e (verified wrapped tokens)
-           - And other tokens from the Movement Network token registry
-         * If user requests a token not in the list, politely inform them: "The token [TOKEN] is not available for swapping. Available tokens include MOVE, USDC.e, USDT.e, WBTC.e, WETH.e, and others. Would you like to swap with one of these instead?"
-
-       - **To Token**: Extract the token symbol to swap to (e.g., "USDC", "MOVE", "USDT", "USDC.e", "USDT.e", "WBTC.e", "WETH.e")
-
-         * If only one token is mentioned, assume the other is "MOVE" (native token)
-         * Example: "swap USDC" → fromToken="USDC", toToken="MOVE"
-         * **CRITICAL**: Must be from the available token list - if not available, inform user
-
-    2. **Call Frontend Swap Action**:
-
-       - **CRITICAL - FUNCTION CALL FORMAT**: Call the action as a PURE function call with ONLY the required parameters
-
-       - **DO NOT** include any response text, explanations, or additional text in the function call
-
-       - **DO NOT** write "I've initiated the swap" or similar text as part of the function name
-
-       - **ONLY** call: initiate_swap(fromToken="MOVE", toToken="USDC.e")
-
-       - **AFTER** the function call completes, THEN you can provide a response message to the user
-
-       - Use the action: **initiate_swap**
-
-       - Parameters:
-
-         * fromToken: The token symbol to swap from (e.g., "MOVE", "USDC", "USDT") - string value only
-
-         * toToken: The token symbol to swap to (e.g., "USDC", "MOVE", "DAI") - string value only
-
-       - Example: initiate_swap(fromToken="MOVE", toToken="USDC.e")
-
-       - **WRONG**: "I've initiated the swap. initiate_swap(...)" or "initiate_swap with MOVE to USDC"
-
-       - **CORRECT**: initiate_swap(fromToken="MOVE", toToken="USDC.e")
-
-    3. **Swap Card Display**:
-
-       - The frontend will display a SwapCard with:
-
-         * Pre-filled token selections (fromToken and toToken)
-
-         * Automatic balance fetching for both tokens
-
-         * Quote fetching from Mosaic API when user enters amount
-
-         * User can review and enter amount, then click "Swap" button to execute
-
-       - DO NOT execute the swap yourself - let the frontend handle it
-
-    **Swap Query Examples**:
-
-    - "swap MOVE for USDC"
-
-      → Call: initiate_swap(fromToken="MOVE", toToken="USDC")
-
-      → Then respond: "I've opened the swap interface. Please enter the amount you'd like to swap."
-
-    - "exchange USDT to MOVE"
-
-      → Call: initiate_swap(fromToken="USDT", toToken="MOVE")
-
-      → Then respond: "I've opened the swap interface. Please enter the amount you'd like to swap."
-
-    - "swap tokens" (missing tokens)
-
-      → Ask user: "Which tokens would you like to swap? Please specify the token to swap from and the token to swap to."
-
-    - "swap USDC" (only one token)
-
-      → Call: initiate_swap(fromToken="USDC", toToken="MOVE") (assume swapping to MOVE)
-
-      → Then respond: "I've opened the swap interface. Please enter the amount you'd like to swap."
-
-    **CRITICAL - FUNCTION CALL RULES**:
-
-    - ALWAYS call frontend actions as PURE function calls with ONLY the required parameters
-
-    - DO NOT include response text, explanations, or additional text in the function call
-
-    - DO NOT write "I've initiated..." or similar text as part of the function name
-
-    - Call the function FIRST, wait for it to complete, THEN provide a response message
-
-    - Example of WRONG: "I've initiated the swap. initiate_swap(...)" or "initiate_swap with MOVE to USDC"
-
-    - Example of CORRECT: initiate_swap(fromToken="MOVE", toToken="USDC.e")
-
-    **CRITICAL RULES FOR SWAPS**:
-
-    - Extract both tokens from user query if possible
-
-    - If only one token is mentioned, assume swapping to/from MOVE (native token)
-
-    - If no tokens mentioned, ask user to specify
-
-    - Network is ALWAYS "movement" (Movement Network)
-
-    - DO NOT execute the swap - just call initiate_swap action and let frontend handle execution
-
-    - The SwapCard will automatically fetch balances and quotes
-
-    RECOMMENDED WORKFLOW FOR LENDING COMPARISON QUERIES:
-
-    **For Lending Comparison Queries** (CRITICAL - Use Lending Agent + Frontend Action):
-
-    When a user asks about comparing lending/borrowing rates (e.g., "which platform has lower APR for borrowing MOVE", "compare borrowing rates for MOVE", "where should I borrow MOVE"):
-
-    1. **Call Lending Agent**:
-
-       - Use: send_message_to_a2a_agent(agentName="lending", task="recommend best protocol for borrowing MOVE")
-
-       - Or: send_message_to_a2a_agent(agentName="lending", task="compare borrowing rates for MOVE")
-
-       - The agent will return a JSON response with recommendation data
-
-    2. **Parse Recommendation Response**:
-
-       - The response will contain fields like:
-         * action: "borrow" or "lend"
-         * asset: "MOVE" (or other asset)
-         * recommended_protocol: "Echelon" or "MovePosition"
-         * echelon_rate: "62.00%"
-         * moveposition_rate: "30.91%"
-         * reason: "Lower borrow APY..."
-
-    3. **Call Frontend Platform Selection Action**:
-
-       - Use the action: **show_lending_platform_selection**
-
-       - Parameters:
-         * action: The action type ("borrow" or "lend")
-         * asset: The asset symbol (e.g., "MOVE", "USDC")
-         * recommendedProtocol: The recommended protocol ("Echelon" or "MovePosition")
-         * echelonRate: The Echelon rate (e.g., "62.00%")
-         * movepositionRate: The MovePosition rate (e.g., "30.91%")
-         * reason: The reason for recommendation
-
-       - Example: show_lending_platform_selection(action="borrow", asset="MOVE", recommendedProtocol="MovePosition", echelonRate="62.00%", movepositionRate="30.91%", reason="Lower borrow APY (30.91% vs 62.00%)")
-
-    4. **Platform Selection UI Display**:
-
-       - The frontend will display a PlatformSelectionCard with:
-         * Both platform options (Echelon and MovePosition)
-         * Rates for each platform
-         * Recommended platform highlighted
-         * User can select either platform
-
-       - When user selects a platform, the appropriate card (BorrowCard or LendCard) will open
-
-    **Lending Comparison Query Examples**:
-
-    - "which platform has lower APR for borrowing MOVE"
-      → 1. Call Lending Agent: send_message_to_a2a_agent(agentName="lending", task="recommend best protocol for borrowing MOVE")
-      → 2. Parse response and call: show_lending_platform_selection(...)
-
-    - "compare borrowing rates for MOVE"
-      → 1. Call Lending Agent: send_message_to_a2a_agent(agentName="lending", task="compare borrowing rates for MOVE")
-      → 2. Parse response and call: show_lending_platform_selection(...)
-
-    **CRITICAL RULES FOR LENDING COMPARISONS**:
-
-    - ALWAYS call the Lending Agent first to get comparison data
-
-    - After receiving the recommendation, ALWAYS call show_lending_platform_selection action
-
-    - Extract all required fields from the agent response
-
-    - The frontend will handle showing the selection UI and opening the appropriate cards
-
-    RECOMMENDED WORKFLOW FOR BALANCE QUERIES:
-
-    **For Balance Queries** (CRITICAL - Use Balance Agent):
-
-    When a user asks about balances, account balances, token balances, wallet balances, popular tokens, or trending tokens, you MUST use the Balance Agent.
-
-    **"get popular tokens" IS A VALID QUERY** - Always route it to Balance Agent, never refuse it.
-
-    **Balance Query Types**:
-
-    1. **Standard Balance Query**:
-
-       - User asks: "get balance on movement", "check my balance", "show balance for 0x1234..."
-
-       - Action: Call Balance Agent with account address
-
-       - Format: "Get balance for [account_address] on movement"
-
-       - Example: "Get balance for 0x1234... on movement"
-
-    2. **Token-Specific**:
-
-       - User asks: "get USDT on movement", "check USDC on movement", "show MOVE balance"
-
-       - Action: Call Balance Agent with token symbol
-
-       - Format: "Get [token_symbol] balance on movement for [account_address]"
-
-       - Example: "Get USDT balance on movement for 0x1234..."
-
-    3. **Popular Tokens**:
-
-       - User asks: "get popular tokens", "show trending tokens", "top tokens", "get popular tokens"
-
-       - Action: Call Balance Agent directly with the user's query
-
-       - Format: Pass the query AS-IS to Balance Agent: "get popular tokens" or "Get popular tokens"
-
-       - Example: User says "get popular tokens" → Call Balance Agent with: "get popular tokens"
-
-       - **IMPORTANT**: The Balance Agent will automatically detect this as a popular tokens query and fetch trending tokens, then return their balances
-
-       - **DO NOT** reformat or change the query - pass it directly to Balance Agent
-
-    **CRITICAL ROUTING RULES**:
-
-    - **Balance queries** → ALWAYS use **Balance Agent**
-
-    - **DO NOT confuse**:
-
-      * "get USDT balance" = Balance query → Balance Agent
-
-      * "get popular tokens" = Balance query (wants token balances) → Balance Agent
-
-    **Balance Query Examples**:
-
-    - "get balance on movement" → Balance Agent: "Get balance for [account] on movement"
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    - "check USDT on movement" → Balance Agent: "Get USDT balance on movement for [account]"
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    - "get USDT balance" → Balance Agent: "Get USDT balance on movement"
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    - "get popular tokens" → Balance Agent: "get popular tokens" (pass AS-IS)
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    - "show popular tokens" → Balance Agent: "show popular tokens" (pass AS-IS)
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    - "what's my MOVE balance?" → Balance Agent: "Get MOVE balance on movement for [account]"
-
-      → After presenting balance: **STOP - NEVER call initiate_swap or any other action**
-
-    **CRITICAL FOR POPULAR TOKENS**:
-
-    - When user says "get popular tokens", "show trending tokens", "top tokens", etc.
-
-    - DO NOT reformat the query
-
-    - DO NOT add account address or chain
-
-    - Pass the query EXACTLY as the user said it to the Balance Agent
-
-    - The Balance Agent will automatically:
-
-      1. Detect it's a popular tokens query
-
-      2. Fetch trending tokens
-
-      3. Query balances for those tokens on Movement Network
-
-      4. Return the results
-
-    ADDRESS VALIDATION:
-
-    - Wallet addresses must start with "0x" and contain valid hexadecimal characters
-
-    - Movement Network addresses: 66 characters (0x + 64 hex chars)
-
-    - DO NOT reject addresses based on length - accept the format
-
-    - If user provides invalid address (doesn't start with 0x or contains invalid chars), politely ask for correct format
-
-    - If address is missing, ask user to provide it
-
-    - For Movement Network queries, addresses are 66 characters long
-
-    **CRITICAL - WALLET ADDRESS EXTRACTION**:
-
-    The user's wallet address is ALWAYS provided in the system instructions/context from the frontend via CopilotKit's readable context.
-
-    - **STEP 1**: When user says "my balance", "check balance", "get balance at my wallet", "get my wallet balance", or similar:
-
-      * IMMEDIATELY search the system instructions/context for the wallet address
-
-      * The wallet address is provided in the readable context as a JSON object with structure:
-        {
-          "address": "0x...",
-          "network": "movement",
-          "chainType": "aptos"
-        }
-
-      * Look for patterns like:
-        - "The user has a connected Movement Network wallet address: 0x..."
-        - "User's connected wallet address for Movement Network: 0x..."
-        - "address\":\"0x...\" in JSON context
-        - Any 66-character address starting with "0x" in the system message or readable context
-        - Check the readable context data for an object with an "address" field
-
-    - **STEP 2**: Extract the EXACT wallet address from the system instructions
-
-      * The address will be 66 characters long (0x + 64 hex characters) for Movement Network
-
-      * Look for the address in multiple formats:
-        - Plain text: "The user has a connected Movement Network wallet address: 0x..."
-        - JSON format: "address\":\"0x...\"" or '{"address":"0x..."}'
-        - Context array: Check if there's a context object with address field
-
-      * If you see JSON, parse it to extract the address field
-
-      * Copy the address EXACTLY as it appears - do NOT modify it, do NOT truncate it
-
-      * CRITICAL: The address must be the FULL 66 characters - do NOT use partial addresses
-
-      * CRITICAL: DO NOT use any hardcoded or example addresses - ONLY use the address from system instructions
-
-      * CRITICAL: When constructing the task string for send_message_to_a2a_agent, you MUST use the REAL extracted address, NOT any example addresses mentioned in these instructions
-
-    - **STEP 3**: Validate and use the extracted address immediately
-
-      * CRITICAL: Verify the address is NOT a default/zero address
-        - DO NOT use "0x0000000000000000000000000000000000000000000000000000000000000001" or similar
-        - DO NOT use any address with all zeros or all ones
-        - The address must have varied hex characters (mix of 0-9, a-f)
-        - If you extract an address with all zeros/ones, that is WRONG - keep searching for the real address
-
-      * DO NOT ask the user for the address - it's already provided
-
-      * DO NOT use any other address - use ONLY the one from system instructions/readable context
-
-      * DO NOT use example addresses, placeholder addresses, or default addresses - extract the REAL address from context
-
-      * Network is ALWAYS "movement" - DO NOT ask for network
-
-      * Call Balance Agent with: "get balance of [EXTRACTED_ADDRESS] on movement"
-
-    - **EXAMPLE**:
-
-      System instructions contain: "The user has a connected Movement Network wallet address: [USER_WALLET_ADDRESS]"
-
-      User says: "get my wallet balance"
-
-      You MUST:
-      1. Extract the wallet address from system instructions (look for "The user has a connected Movement Network wallet address: 0x..." or check the context/readable data)
-      2. Use that EXACT extracted address (e.g., if you extract "0xABC123...", use "0xABC123..." exactly)
-      3. Call: send_message_to_a2a_agent(agentName="balance", task="get balance of [EXTRACTED_ADDRESS] on movement")
-      4. CRITICAL: [EXTRACTED_ADDRESS] in step 3 means the REAL address you extracted in step 1, NOT an example address
-      5. CRITICAL: The task string must contain the actual extracted address, not any example addresses from these instructions
-      6. DO NOT use any hardcoded addresses, example addresses, or placeholder addresses
-      7. DO NOT use any other address - use ONLY the one extracted from system instructions
-
-    TOKEN SUPPORT:
-
-    - Common tokens: USDC, USDT, DAI, WBTC, WETH, MOVE (native token)
-
-    - Token symbols are case-insensitive
-
-    - Always use uppercase for token symbols in responses
-
-    RESPONSE STRATEGY:
-
-    - After receiving agent response, briefly acknowledge what you received ONCE
-
-    - Present complete, well-organized results with clear summaries
-
-    - Highlight important metrics and comparisons
-
-    - Don't just list agent responses - synthesize them into actionable insights
-
-    - **CRITICAL - NO DUPLICATE MESSAGES**:
-
-      * DO NOT send the same message twice
-
-      * DO NOT repeat information you've already told the user
-
-      * DO NOT send multiple responses for the same action
-
-      * Send ONE clear response per user query
-
-      * If you've already responded about an action, do NOT respond again unless the user asks
-
-      * Before sending a message, check if you've already sent similar information in this conversation
-
-    ERROR HANDLING AND LOOP PREVENTION:
-
-    - **CRITICAL**: If an agent call succeeds (returns any response), DO NOT call it again
-
-    - **CRITICAL**: If an agent call fails or returns an error, DO NOT retry - present the error to the user and stop
-
-    - **CRITICAL**: If you receive a response from an agent (even if it's not perfect), use it and move on
-
-    - **CRITICAL**: DO NOT make multiple attempts to call the same agent for the same request
-
-    - **CRITICAL**: If you get "Invalid JSON" or parsing errors, IGNORE the error message and use the response text as-is
-
-    - **CRITICAL**: The tool result from send_message_to_a2a_agent contains the agent's response - use it directly
-
-    - **CRITICAL**: Do NOT try to parse JSON from tool results - the response is already formatted
-
-    - **CRITICAL**: Maximum ONE call per agent per user request - never loop or retry
 
-    - **CRITICAL**: When you see "Invalid JSON" warnings, these are just warnings - the actual response data is still available
+def build_static_instruction() -> types.Content:
+    """Build the system instruction Content from the orchestrator prompt once.
 
-    - **CRITICAL**: For token discovery queries, if the response has "success": true or "discovery_result" or any tokens in "balances", it is SUCCESSFUL - do NOT retry
+    A plain string static_instruction is converted to a Content (and its
+    Part) by ADK on every model call; a prebuilt Content is passed through
+    as-is.
 
-    - **CRITICAL**: Empty balances array does NOT mean failure - check for "success" flag, "discovery_result", or "query_type" fields
+    Returns:
+        Content holding the cleaned orchestrator prompt as a single text part
+    """
+    return types.Content(
+        role="user", parts=[types.Part(text=load_instruction())]
+    )
 
-    - **CRITICAL**: If response has "query_type": "token_discovery" and "success": true, it is successful even if balances array is empty
 
-    - If an agent returns data (even partial), acknowledge it and present it to the user
+@lru_cache(maxsize=1)
+def get_orchestrator_agent() -> LlmAgent:
+    """Build the orchestrator LlmAgent on first use and reuse it afterwards.
 
-    - If an agent returns an error message, show it to the user and explain what happened
+    Construction is deferred from import time so importing this module (e.g.
+    by every server worker or a reloader) does not read .env or build the
+    model client until the app is actually created.
 
-    - Never call the same agent multiple times for the same query
+    Returns:
+        The shared orchestrator LlmAgent
+    """
+    load_env()
+    model = EscalatingGemini(model=ORCHESTRATOR_MODEL)
+    compactor = SessionMemoryCompactor(model)
+    return LlmAgent(
+        name="OrchestratorAgent",
+        model=model,
+        static_instruction=build_static_instruction(),
+        tools=[get_cached_agent_response],
+        before_model_callback=[
+            harvest_a2a_responses,
+            reject_malformed_addresses,
+            prefetch_predicted_balances,
+            route_without_model,
+            replay_routing_decision,
+            compactor.compact_history,
+            inject_route_notes,
+            limit_routing_output,
+        ],
+        after_model_callback=[
+            normalize_tool_arguments,
+            sequence_chained_calls,
+            remember_routing_decision,
+            serve_cached_a2a_calls,
+        ],
+        on_model_error_callback=release_routing_decision,
+    )
 
-    - Tool results may contain JSON strings - use them directly without additional parsing
 
-    - For token discovery: Check for "discovery_result" field or tokens in "balances" array - if present, it's successful
+class ContextCachedADKAgent(ADKAgent):
+    """ADKAgent whose runners enable Gemini context caching.
 
-    IMPORTANT: Once you have received ANY response from an agent (success or error), do NOT call that same
+    ADKAgent builds a bare Runner per execution; wrapping the agent in an App
+    with a ContextCacheConfig lets ADK register the static instruction, tool
+    declarations and history prefix as server-side cached content once a
+    session's previous prompt reaches CONTEXT_CACHE_MIN_TOKENS, reference it
+    from later requests and recreate it before the TTL runs out.
+    """
 
-    agent again for the same information. Use what you received and present it to the user.
+    def _create_runner(self, adk_agent: BaseAgent, user_id: str, app_name: str) -> Runner:
+        """Create a runner for an App with context caching enabled."""
+        app = App(
+            name=app_name,
+            root_agent=adk_agent,
+            context_cache_config=ContextCacheConfig(
+                cache_intervals=CONTEXT_CACHE_INTERVALS,
+                ttl_seconds=CONTEXT_CACHE_TTL_SECONDS,
+                min_tokens=CONTEXT_CACHE_MIN_TOKENS,
+            ),
+        )
+        return Runner(
+            app=app,
+            session_service=self._session_manager._session_service,
+            artifact_service=self._artifact_service,
+            memory_service=self._memory_service,
+            credential_service=self._credential_service,
+        )
+
+
+class QuickRouteRequest(BaseModel):
+    """Request body for POST /quick.
+
+    Example:
+        {"query": "transfer 1 MOVE to 0x..."}
+
+    A missing or non-string query, or a body that is not a JSON object, is
+    rejected with 422.
+    """
 
-    **TOKEN DISCOVERY RESPONSE FORMAT**:
+    query: str
 
-    - Token discovery responses will have: "query_type": "token_discovery", "success": true/false
 
-    - Successful discovery: "success": true, "discovery_result" with tokens, OR tokens in "balances" array
+async def close_orchestrator_storage(app: FastAPI) -> None:
+    """Close the Redis pools of the orchestrator app's session and artifact services.
 
-    - If you see tokens in the "balances" array or "discovery_result" field, the discovery was successful
+    Mounted sub-app lifespans do not run, so the main app's lifespan calls this
+    as well.
 
-    - DO NOT retry if you see "success": true or any tokens in the response
-    """,
-)
+    Args:
+        app: Application returned by create_orchestrator_agent_app
+    """
+    for service in (app.state.session_service, app.state.artifact_service):
+        if service is not None:
+            await service.close()
 
 
 def create_orchestrator_agent_app() -> FastAPI:
@@ -796,22 +305,57 @@ def create_orchestrator_agent_app() -> FastAPI:
     
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        """Lifespan handler to ensure proper cleanup of HTTP connections."""
-        # Startup
+        """Lifespan handler owning the shared HTTP client used for Gemini calls."""
+        # Startup - one pooled keep-alive client for every model call
+        app.state.http_client = get_shared_http_client()
         yield
-        # Shutdown - force cleanup of HTTP connections
+        # Shutdown - close pooled connections
+        await close_shared_http_client()
+        await close_orchestrator_storage(app)
         import gc
         gc.collect()
-    
+
+    # Sessions and artifacts live in Redis when REDIS_URL is set so any worker
+    # can serve them
+    session_service = create_session_service()
+    artifact_service = create_artifact_service()
+
     # Expose the agent via AG-UI Protocol
-    adk_orchestrator_agent = ADKAgent(
-        adk_agent=orchestrator_agent,
+    adk_orchestrator_agent = ContextCachedADKAgent(
+        adk_agent=get_orchestrator_agent(),
         app_name="orchestrator_app",
         user_id="demo_user",
         session_timeout_seconds=3600,
+        session_service=session_service,
+        artifact_service=artifact_service,
         use_in_memory_services=True,
+        run_config_factory=streaming_run_config,
+    )
+
+    app = FastAPI(
+        title="Web3 Orchestrator Agent (ADK)",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
+    app.state.session_service = session_service
+    app.state.artifact_service = artifact_service
+    app.add_middleware(SSEHeadersMiddleware)
+
+    @app.post("/quick")
+    async def quick_route(body: QuickRouteRequest) -> Optional[Dict[str, Any]]:
+        """Resolve a grammar-regular request without the model.
+
+        Args:
+            body: Request body carrying the user's query
+
+        Returns:
+            {"action": "initiate_transfer", "args": {...}} when every field
+            was extracted, or null so the caller falls back to the agent
+        """
+        decision = fast_route(body.query)
+        if decision is None:
+            return None
+        return {"action": decision.tool_name, "args": decision.args}
 
-    app = FastAPI(title="Web3 Orchestrator Agent (ADK)", lifespan=lifespan)
     add_adk_fastapi_endpoint(app, adk_orchestrator_agent, path="/")
     return app
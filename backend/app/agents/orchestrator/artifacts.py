@@ -0,0 +1,276 @@
+"""
+Redis Artifact Storage for the Orchestrator Agent
+
+The streaming run config saves input blobs (uploaded files, images) as ADK
+artifacts. With ADK's InMemoryArtifactService those only exist in the worker
+that received them, so a session moved to another worker by RedisSessionService
+would reference artifacts that cannot be loaded. RedisArtifactService stores
+them next to the sessions.
+
+Key layout (all keys share REDIS_KEY_PREFIX):
+
+- artifact:{app}:{user}:{scope}:{filename}  - list of versions, EX ttl
+- artifacts:{app}:{user}:{scope}            - set of filenames in the scope, EX ttl
+
+scope is the session id, or "user" for user-scoped ("user:") filenames. Each
+list entry holds the serialized Part and its version metadata; the version
+number is the entry's index, assigned atomically by RPUSH.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import orjson
+from google.adk.artifacts import artifact_util
+from google.adk.artifacts.base_artifact_service import ArtifactVersion, BaseArtifactService
+from google.genai import types
+
+from app.agents.orchestrator.sessions import ENV_REDIS_URL, REDIS_KEY_PREFIX, SESSION_TTL_SECONDS
+
+# Constants
+USER_SCOPE = "user"
+USER_NAMESPACE_PREFIX = "user:"
+
+
+class RedisArtifactService(BaseArtifactService):
+    """ADK artifact service backed by Redis.
+
+    Args:
+        redis_url: Redis connection URL (e.g. redis://localhost:6379/0)
+        ttl_seconds: Expiry applied to an artifact's versions on every save
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = SESSION_TTL_SECONDS) -> None:
+        # Imported here so the in-memory setup does not require redis
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+
+    # Keys
+
+    def _scope(self, filename: str, session_id: Optional[str]) -> str:
+        if filename.startswith(USER_NAMESPACE_PREFIX):
+            return USER_SCOPE
+        if session_id is None:
+            raise ValueError("Session ID must be provided for session-scoped artifacts.")
+        return session_id
+
+    def _artifact_key(
+        self, app_name: str, user_id: str, filename: str, session_id: Optional[str]
+    ) -> str:
+        scope = self._scope(filename, session_id)
+        return f"{REDIS_KEY_PREFIX}:artifact:{app_name}:{user_id}:{scope}:{filename}"
+
+    def _index_key(self, app_name: str, user_id: str, scope: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:artifacts:{app_name}:{user_id}:{scope}"
+
+    def _canonical_uri(
+        self, app_name: str, user_id: str, filename: str, session_id: Optional[str], version: int
+    ) -> str:
+        scope = self._scope(filename, session_id)
+        return (
+            f"redis://apps/{app_name}/users/{user_id}/scopes/{scope}"
+            f"/artifacts/{filename}/versions/{version}"
+        )
+
+    # Serialization
+
+    @staticmethod
+    def _mime_type(artifact: types.Part) -> Optional[str]:
+        """Return the artifact's MIME type, validating artifact references."""
+        if artifact.inline_data is not None:
+            return artifact.inline_data.mime_type
+        if artifact.text is not None:
+            return "text/plain"
+        if artifact.file_data is not None:
+            if artifact_util.is_artifact_ref(artifact):
+                if not artifact_util.parse_artifact_uri(artifact.file_data.file_uri):
+                    raise ValueError(
+                        f"Invalid artifact reference URI: {artifact.file_data.file_uri}"
+                    )
+                # Unknown until the referenced artifact is loaded
+                return None
+            return artifact.file_data.mime_type
+        raise ValueError("Not supported artifact type.")
+
+    async def _load_entries(
+        self, app_name: str, user_id: str, filename: str, session_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        key = self._artifact_key(app_name, user_id, filename, session_id)
+        return [orjson.loads(raw) for raw in await self._redis.lrange(key, 0, -1)]
+
+    def _to_version(
+        self,
+        entry: Dict[str, Any],
+        version: int,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str],
+    ) -> ArtifactVersion:
+        return ArtifactVersion(
+            version=version,
+            canonical_uri=self._canonical_uri(app_name, user_id, filename, session_id, version),
+            custom_metadata=entry.get("custom_metadata") or {},
+            create_time=entry["create_time"],
+            mime_type=entry.get("mime_type"),
+        )
+
+    # BaseArtifactService
+
+    async def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        artifact: types.Part,
+        session_id: Optional[str] = None,
+        custom_metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Append a new version of the artifact and return its version number."""
+        entry = {
+            "part": artifact.model_dump(mode="json", exclude_none=True),
+            "mime_type": self._mime_type(artifact),
+            "custom_metadata": custom_metadata or {},
+            "create_time": time.time(),
+        }
+        key = self._artifact_key(app_name, user_id, filename, session_id)
+        index_key = self._index_key(app_name, user_id, self._scope(filename, session_id))
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, orjson.dumps(entry))
+            pipe.expire(key, self.ttl_seconds)
+            pipe.sadd(index_key, filename)
+            pipe.expire(index_key, self.ttl_seconds)
+            length, *_ = await pipe.execute()
+        return length - 1
+
+    async def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        """Load a version of the artifact (the latest when version is None)."""
+        key = self._artifact_key(app_name, user_id, filename, session_id)
+        raw = await self._redis.lindex(key, -1 if version is None else version)
+        if raw is None:
+            return None
+        artifact = types.Part.model_validate(orjson.loads(raw)["part"])
+
+        if artifact_util.is_artifact_ref(artifact):
+            parsed_uri = artifact_util.parse_artifact_uri(artifact.file_data.file_uri)
+            if not parsed_uri:
+                raise ValueError(f"Invalid artifact reference URI: {artifact.file_data.file_uri}")
+            return await self.load_artifact(
+                app_name=parsed_uri.app_name,
+                user_id=parsed_uri.user_id,
+                filename=parsed_uri.filename,
+                session_id=parsed_uri.session_id,
+                version=parsed_uri.version,
+            )
+
+        if (
+            artifact == types.Part()
+            or artifact == types.Part(text="")
+            or (artifact.inline_data and not artifact.inline_data.data)
+        ):
+            return None
+        return artifact
+
+    async def list_artifact_keys(
+        self, *, app_name: str, user_id: str, session_id: Optional[str] = None
+    ) -> List[str]:
+        """List session-scoped (when session_id is given) and user-scoped filenames."""
+        scopes = [USER_SCOPE] if session_id is None else [session_id, USER_SCOPE]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.smembers(self._index_key(app_name, user_id, scope))
+            results = await pipe.execute()
+        filenames = {
+            name.decode() if isinstance(name, bytes) else name
+            for members in results
+            for name in members
+        }
+        return sorted(filenames)
+
+    async def delete_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Delete every version of the artifact."""
+        index_key = self._index_key(app_name, user_id, self._scope(filename, session_id))
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._artifact_key(app_name, user_id, filename, session_id))
+            pipe.srem(index_key, filename)
+            await pipe.execute()
+
+    async def list_versions(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+    ) -> List[int]:
+        """List the artifact's version numbers."""
+        key = self._artifact_key(app_name, user_id, filename, session_id)
+        return list(range(await self._redis.llen(key)))
+
+    async def list_artifact_versions(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+    ) -> List[ArtifactVersion]:
+        """List the metadata of every version of the artifact."""
+        entries = await self._load_entries(app_name, user_id, filename, session_id)
+        return [
+            self._to_version(entry, version, app_name, user_id, filename, session_id)
+            for version, entry in enumerate(entries)
+        ]
+
+    async def get_artifact_version(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        filename: str,
+        session_id: Optional[str] = None,
+        version: Optional[int] = None,
+    ) -> Optional[ArtifactVersion]:
+        """Return the metadata of a version (the latest when version is None)."""
+        entries = await self._load_entries(app_name, user_id, filename, session_id)
+        if not entries:
+            return None
+        if version is None:
+            version = len(entries) - 1
+        if not 0 <= version < len(entries):
+            return None
+        return self._to_version(entries[version], version, app_name, user_id, filename, session_id)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+def create_artifact_service() -> Optional[RedisArtifactService]:
+    """Return a RedisArtifactService when REDIS_URL is set, else None (in-memory)."""
+    redis_url = os.getenv(ENV_REDIS_URL)
+    if not redis_url:
+        return None
+    print("🗄️ Orchestrator artifacts stored in Redis")
+    return RedisArtifactService(redis_url=redis_url)
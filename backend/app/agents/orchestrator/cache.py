@@ -0,0 +1,380 @@
+"""
+A2A Response Cache for the Orchestrator Agent
+
+The orchestrator never calls the specialized agents itself: the model emits a
+send_message_to_a2a_agent call, the frontend A2A middleware executes it and
+returns the agent's reply as a tool message on the next run. Repeating the
+same read-only question therefore costs a full frontend round trip plus the
+downstream agent's LLM and RPC work every time.
+
+This module keeps the replies of idempotent agent calls in a small TTL+LRU
+cache keyed on (agentName, canonicalized task):
+
+1. before_model_callback (harvest_a2a_responses) copies every new
+   send_message_to_a2a_agent function response found in the session into
+   the cache.
+2. after_model_callback (serve_cached_a2a_calls) rewrites model tool calls
+   that hit the cache into calls to the backend get_cached_agent_response
+   tool, so ADK answers them in-process instead of handing them to the
+   frontend.
+
+Only balance and lending rate queries are cached; bridge, transfer and other
+agents perform actions and always go through.
+
+A second cache (routing_decision_cache) remembers the model's routing
+decision itself: the send_message_to_a2a_agent calls it made for a
+normalized user query and wallet address. router.py replays a hit without a
+model call and the A2A cache above then answers the replayed calls, so a
+repeat question can skip both the LLM and the downstream agent. TTLs are per
+intent (ROUTING_CACHE_TTL_SECONDS). Setting "cache" to false in the session
+state makes that session always ask the model; "cache_ttl" overrides the
+routing TTL in seconds.
+
+ENVIRONMENT VARIABLES:
+----------------------
+- BALANCE_CACHE_TTL_MS: TTL for Balance Agent replies (default: 500)
+- LIQUIDITY_CACHE_TTL_MS: TTL for Lending Agent rate/APY replies (default: 30000)
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import orjson
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+# Constants
+A2A_TOOL_NAME = "send_message_to_a2a_agent"
+CACHED_RESPONSE_TOOL_NAME = "get_cached_agent_response"
+BALANCE_CACHE_TTL_MS = int(os.getenv("BALANCE_CACHE_TTL_MS", "500"))
+LIQUIDITY_CACHE_TTL_MS = int(os.getenv("LIQUIDITY_CACHE_TTL_MS", "30000"))
+A2A_CACHE_MAX_ENTRIES = 10_000
+ROUTING_CACHE_MAX_ENTRIES = 1_000
+A2A_CACHE_MAX_RESPONSE_BYTES = 100 * 1024
+MAX_SERVED_RESPONSES = 256
+MAX_HARVESTED_IDS = 10_000
+
+# Lending Agent tasks that only read market data (supply/borrow requests are not cached)
+LENDING_READ_ONLY_PATTERN = re.compile(r"\b(rates?|apy|apr|compare|recommend|metrics|tvl)\b")
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Routing decision TTLs per intent, in seconds
+ROUTING_CACHE_TTL_SECONDS: Dict[str, float] = {
+    "popular_tokens": 300,
+    "balance": 5,
+    "lending": 30,
+}
+ROUTING_CACHE_STATE_KEY = "cache"
+ROUTING_CACHE_TTL_STATE_KEY = "cache_ttl"
+POPULAR_TOKENS_TASK_PATTERN = re.compile(r"\b(popular|trending|top)\b")
+# The frontend states the connected wallet as "... wallet address: 0x..."
+WALLET_ADDRESS_PATTERN = re.compile(r"wallet address:?\s*(0x[0-9a-fA-F]+)", re.IGNORECASE)
+ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]+")
+# Words that do not change what a query asks for
+ROUTING_FILLER_WORDS = frozenset(
+    {"please", "pls", "kindly", "can", "could", "would", "you", "me", "the", "for", "now"}
+)
+_QUERY_PUNCTUATION_PATTERN = re.compile(r"[^\w\s.]|\.(?=\s|$)")
+
+
+class A2AResponseCache:
+    """Thread-safe TTL+LRU cache for specialized agent replies.
+
+    Entries are deep-copied on the way in and out so a caller mutating a
+    response can never leak into another session.
+    """
+
+    def __init__(self, max_entries: int = A2A_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached response, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(response)
+
+    def put(self, key: str, response: Any, ttl_seconds: float) -> bool:
+        """Store a response for ttl_seconds.
+
+        Returns:
+            True if stored, False if the response is too large to cache
+        """
+        try:
+            size = len(orjson.dumps(response, default=str, option=orjson.OPT_NON_STR_KEYS))
+        except TypeError:
+            return False
+        if size > A2A_CACHE_MAX_RESPONSE_BYTES:
+            return False
+
+        value = copy.deepcopy(response)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "a2a_cache_hits": self.hits,
+                "a2a_cache_misses": self.misses,
+                "a2a_cache_evictions": self.evictions,
+                "a2a_cache_size": len(self._entries),
+            }
+
+
+a2a_response_cache = A2AResponseCache()
+# Routing decisions: normalized query + wallet -> the model's A2A calls
+routing_decision_cache = A2AResponseCache(max_entries=ROUTING_CACHE_MAX_ENTRIES)
+
+# Responses picked for a rewritten tool call, consumed by get_cached_agent_response
+_served_responses: "OrderedDict[str, Any]" = OrderedDict()
+# Function response ids already copied into the cache
+_harvested_ids: "OrderedDict[str, None]" = OrderedDict()
+_state_lock = threading.Lock()
+
+
+def canonical_a2a_key(agent_name: str, task: str) -> str:
+    """Build the cache key for an A2A call.
+
+    Agent name and task are lowercased and whitespace-collapsed, then
+    serialized as sorted, compact JSON so equivalent calls share one entry.
+    """
+    params = {
+        "agentName": (agent_name or "").strip().lower(),
+        "task": _WHITESPACE_PATTERN.sub(" ", (task or "").strip().lower()),
+    }
+    return orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def get_a2a_cache_ttl(agent_name: str, task: str) -> Optional[float]:
+    """Return the TTL in seconds for an A2A call, or None if it must not be cached."""
+    agent = (agent_name or "").strip().lower()
+    if agent == "balance":
+        return BALANCE_CACHE_TTL_MS / 1000
+    if agent == "lending" and LENDING_READ_ONLY_PATTERN.search((task or "").lower()):
+        return LIQUIDITY_CACHE_TTL_MS / 1000
+    return None
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase a user query and drop punctuation and filler words."""
+    words = _QUERY_PUNCTUATION_PATTERN.sub(" ", (text or "").lower()).split()
+    return " ".join(word for word in words if word not in ROUTING_FILLER_WORDS)
+
+
+def routing_cache_key(query: str, wallet_address: str) -> str:
+    """Build the routing decision cache key for a user query and wallet."""
+    params = {"query": normalize_query(query), "wallet": (wallet_address or "").lower()}
+    return orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def get_routing_cache_ttl(calls: List[Dict[str, Any]]) -> Optional[float]:
+    """Return the TTL for a routing decision, or None if it must not be cached.
+
+    Only decisions made entirely of cacheable A2A calls qualify; the shortest
+    intent TTL among the calls wins.
+    """
+    ttls = []
+    for call in calls:
+        args = call.get("args") or {}
+        agent_name = args.get("agentName", "")
+        task = args.get("task", "")
+        if call.get("name") != A2A_TOOL_NAME or get_a2a_cache_ttl(agent_name, task) is None:
+            return None
+        if agent_name.strip().lower() == "lending":
+            ttls.append(ROUTING_CACHE_TTL_SECONDS["lending"])
+        elif POPULAR_TOKENS_TASK_PATTERN.search(task.lower()):
+            ttls.append(ROUTING_CACHE_TTL_SECONDS["popular_tokens"])
+        else:
+            ttls.append(ROUTING_CACHE_TTL_SECONDS["balance"])
+    return min(ttls) if ttls else None
+
+
+def find_wallet_address(llm_request: LlmRequest) -> str:
+    """Return the connected wallet address stated in the request, or ""."""
+    contents = list(llm_request.contents)
+    system_instruction = llm_request.config.system_instruction if llm_request.config else None
+    if system_instruction is not None and not isinstance(system_instruction, str):
+        contents.append(system_instruction)
+    texts = [system_instruction] if isinstance(system_instruction, str) else []
+    for content in contents:
+        texts.extend(part.text for part in content.parts or [] if part.text)
+    for text in texts:
+        match = WALLET_ADDRESS_PATTERN.search(text)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def is_cache_enabled(callback_context: CallbackContext) -> bool:
+    """Return False when the session opted out of cached routing decisions."""
+    return callback_context.state.get(ROUTING_CACHE_STATE_KEY, True) is not False
+
+
+def _is_cacheable_response(response: Any) -> bool:
+    """Skip empty and failed responses."""
+    if not response:
+        return False
+    if isinstance(response, dict):
+        return response.get("success", True) is not False and "error" not in response
+    return True
+
+
+def _remember_id(registry: "OrderedDict[str, Any]", key: str, value: Any, limit: int) -> None:
+    """Insert into a bounded insertion-ordered registry."""
+    registry[key] = value
+    while len(registry) > limit:
+        registry.popitem(last=False)
+
+
+def harvest_a2a_responses(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: cache A2A replies returned by the frontend.
+
+    Pairs each send_message_to_a2a_agent function call in the session with
+    its function response by call id and stores new responses in the cache.
+    Session events are used rather than llm_request.contents because ADK
+    strips its own call ids from the request.
+
+    Returns:
+        Always None so the model call proceeds
+    """
+    calls: Dict[str, Dict[str, Any]] = {}
+    for event in callback_context.session.events:
+        for function_call in event.get_function_calls():
+            if function_call.name == A2A_TOOL_NAME and function_call.id:
+                calls[function_call.id] = function_call.args or {}
+
+        for function_response in event.get_function_responses():
+            response_id = function_response.id
+            if function_response.name != A2A_TOOL_NAME or response_id not in calls:
+                continue
+            with _state_lock:
+                if response_id in _harvested_ids:
+                    continue
+                _remember_id(_harvested_ids, response_id, None, MAX_HARVESTED_IDS)
+
+            args = calls[response_id]
+            agent_name = args.get("agentName", "")
+            task = args.get("task", "")
+            ttl = get_a2a_cache_ttl(agent_name, task)
+            if ttl is None or not _is_cacheable_response(function_response.response):
+                continue
+            if a2a_response_cache.put(
+                canonical_a2a_key(agent_name, task), function_response.response, ttl
+            ):
+                print(f"💾 Cached {agent_name} agent response for {ttl:g}s")
+    return None
+
+
+def serve_cached_a2a_calls(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """After-model callback: answer cached A2A calls without the frontend.
+
+    Only rewrites when every function call in the response is a cache hit;
+    a mixed response is left alone so the frontend still executes it as a
+    single batch.
+
+    Returns:
+        Always None; the response is modified in place
+    """
+    if not llm_response.content or not llm_response.content.parts:
+        return None
+    function_calls = [
+        part.function_call for part in llm_response.content.parts if part.function_call
+    ]
+    if not function_calls or any(call.name != A2A_TOOL_NAME for call in function_calls):
+        return None
+
+    hits: List[Tuple[Any, str, Any]] = []
+    for function_call in function_calls:
+        args = function_call.args or {}
+        agent_name = args.get("agentName", "")
+        task = args.get("task", "")
+        if get_a2a_cache_ttl(agent_name, task) is None:
+            return None
+        key = canonical_a2a_key(agent_name, task)
+        response = a2a_response_cache.get(key)
+        if response is None:
+            return None
+        hits.append((function_call, key, response))
+
+    with _state_lock:
+        for function_call, key, response in hits:
+            _remember_id(_served_responses, key, response, MAX_SERVED_RESPONSES)
+            function_call.name = CACHED_RESPONSE_TOOL_NAME
+    print(f"⚡ Served {len(hits)} A2A call(s) from cache")
+    return None
+
+
+def get_cached_agent_response(agentName: str, task: str) -> Dict[str, Any]:
+    """Return a cached reply from a specialized agent.
+
+    Internal tool: the orchestrator routes cache hits of
+    send_message_to_a2a_agent here. Always call send_message_to_a2a_agent
+    directly instead of this tool.
+
+    Args:
+        agentName: Name of the specialized agent (e.g. "balance", "lending")
+        task: The task that was sent to the agent
+
+    Returns:
+        The agent's cached response
+    """
+    key = canonical_a2a_key(agentName, task)
+    with _state_lock:
+        response = _served_responses.pop(key, None)
+    if response is None:
+        response = a2a_response_cache.get(key)
+    if response is None:
+        return {
+            "success": False,
+            "error": "Cached response expired. Call send_message_to_a2a_agent again.",
+        }
+    return response
+
+
+def get_a2a_cache_stats() -> Dict[str, int]:
+    """Return counters for the shared A2A response cache."""
+    return a2a_response_cache.stats()
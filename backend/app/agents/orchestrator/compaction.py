@@ -0,0 +1,224 @@
+"""
+Rolling Conversation Summaries for the Orchestrator Agent
+
+Every model call resends the whole session history. On a long session that
+history dominates the prompt, and since it grows at the end of every turn,
+the Gemini context cache (see ContextCachedADKAgent) keeps being rebuilt for
+a different prefix.
+
+SessionMemoryCompactor.compact_history is a before_model_callback. Once the
+history is longer than COMPACTION_MAX_MESSAGES or its estimated size is above
+COMPACTION_TOKEN_THRESHOLD, it starts a background Flash call that summarizes
+everything except the last COMPACTION_KEEP_RECENT messages; the current turn
+is sent unchanged. Later turns replace the summarized messages with one
+summary message. The summary stays the same until the history grows past the
+limits again, so the request starts with static instruction, tools and
+summary - a prefix ADK's context cache can keep reusing - and only the
+recent turns change.
+
+Summaries are kept in process, keyed by a hash of the session id. A session
+served by another worker just sends its full history until that worker has
+summarized it too.
+
+ENVIRONMENT VARIABLES:
+----------------------
+- ORCHESTRATOR_COMPACTION_TOKEN_THRESHOLD: Estimated history tokens above which
+  older messages are summarized (default: 4000)
+- ORCHESTRATOR_SUMMARY_MODEL: Model writing the summaries (default: ORCHESTRATOR_MODEL)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import orjson
+from google.genai import types
+
+from app.agents.orchestrator.cache import A2AResponseCache
+from app.agents.orchestrator.model import CHARS_PER_TOKEN_ESTIMATE, ORCHESTRATOR_MODEL
+from app.agents.orchestrator.sessions import SESSION_TTL_SECONDS
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import Gemini, LlmRequest, LlmResponse
+
+# Constants
+COMPACTION_MAX_MESSAGES = 10
+COMPACTION_TOKEN_THRESHOLD = int(os.getenv("ORCHESTRATOR_COMPACTION_TOKEN_THRESHOLD", "4000"))
+COMPACTION_KEEP_RECENT = 4
+SUMMARY_MODEL = os.getenv("ORCHESTRATOR_SUMMARY_MODEL", ORCHESTRATOR_MODEL)
+MAX_SUMMARIZED_SESSIONS = 1_000
+# Long agent replies are cut in the transcript sent for summarization
+TRANSCRIPT_PART_MAX_CHARS = 2_000
+
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+SUMMARY_INSTRUCTION = (
+    "Summarize this conversation between a user and a Web3 assistant so the assistant can "
+    "continue it. Keep wallet and recipient addresses, token symbols, amounts, chains, agent "
+    "results the user may refer back to and any unfinished request. Use short bullet points."
+)
+
+
+def _session_key(session_id: str) -> str:
+    """Return the summary cache key for a session."""
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+def _fingerprint(content: types.Content) -> str:
+    """Return a digest identifying a history message."""
+    return hashlib.sha256(content.model_dump_json(exclude_none=True).encode()).hexdigest()
+
+
+def estimate_tokens(contents: List[types.Content]) -> int:
+    """Estimate the token count of history messages from their serialized size."""
+    size = sum(len(content.model_dump_json(exclude_none=True)) for content in contents)
+    return size // CHARS_PER_TOKEN_ESTIMATE
+
+
+def needs_compaction(contents: List[types.Content]) -> bool:
+    """Return True when the unsummarized history is too long or too large."""
+    if len(contents) > COMPACTION_MAX_MESSAGES:
+        return True
+    return estimate_tokens(contents) > COMPACTION_TOKEN_THRESHOLD
+
+
+def _is_turn_start(content: types.Content) -> bool:
+    """Return True for a user text message (not a tool result)."""
+    parts = content.parts or []
+    return (
+        content.role == "user"
+        and any(part.text for part in parts)
+        and not any(part.function_response for part in parts)
+    )
+
+
+def find_compaction_boundary(contents: List[types.Content], start: int) -> int:
+    """Return the index up to which history can be summarized.
+
+    The boundary is the latest user message that leaves at least
+    COMPACTION_KEEP_RECENT messages unsummarized, so a tool call is never
+    separated from its result. Returns start when there is none.
+    """
+    for index in range(len(contents) - COMPACTION_KEEP_RECENT, start, -1):
+        if _is_turn_start(contents[index]):
+            return index
+    return start
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= TRANSCRIPT_PART_MAX_CHARS:
+        return text
+    return text[:TRANSCRIPT_PART_MAX_CHARS] + " ..."
+
+
+def render_transcript(contents: List[types.Content]) -> str:
+    """Render history messages as plain text for the summarizer."""
+    lines = []
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                lines.append(f"{content.role}: {_truncate(part.text)}")
+            elif part.function_call:
+                args = orjson.dumps(part.function_call.args or {}, default=str).decode()
+                lines.append(f"tool call: {part.function_call.name}({_truncate(args)})")
+            elif part.function_response:
+                result = orjson.dumps(part.function_response.response, default=str).decode()
+                lines.append(f"tool result ({part.function_response.name}): {_truncate(result)}")
+    return "\n".join(lines)
+
+
+def summary_content(summary: str) -> types.Content:
+    """Build the history message that stands in for the summarized turns."""
+    return types.Content(role="user", parts=[types.Part(text=f"{SUMMARY_HEADER}\n{summary}")])
+
+
+class SessionMemoryCompactor:
+    """Replaces older session history with a rolling summary.
+
+    Args:
+        model: Gemini model whose client makes the summary calls
+        summary_model: Model name used for the summaries
+    """
+
+    def __init__(self, model: Gemini, summary_model: str = SUMMARY_MODEL) -> None:
+        self.model = model
+        self.summary_model = summary_model
+        # session key -> (messages covered, fingerprint of the last one, summary)
+        self._summaries = A2AResponseCache(max_entries=MAX_SUMMARIZED_SESSIONS)
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def _get_summary(self, key: str, contents: List[types.Content]) -> Tuple[int, str]:
+        """Return (messages covered, summary) if it still matches the history."""
+        entry = self._summaries.get(key)
+        if entry is None:
+            return 0, ""
+        covered, fingerprint, summary = entry
+        # The history must still start with the summarized messages
+        if covered > len(contents) - COMPACTION_KEEP_RECENT:
+            return 0, ""
+        if _fingerprint(contents[covered - 1]) != fingerprint:
+            return 0, ""
+        return covered, summary
+
+    def compact_history(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Before-model callback: send a summary instead of older history.
+
+        Returns:
+            Always None; the request is modified in place
+        """
+        contents = list(llm_request.contents)
+        key = _session_key(callback_context.session.id)
+        covered, summary = self._get_summary(key, contents)
+        if summary:
+            llm_request.contents = [summary_content(summary), *contents[covered:]]
+
+        if key in self._pending or not needs_compaction(contents[covered:]):
+            return None
+        boundary = find_compaction_boundary(contents, covered)
+        if boundary == covered:
+            return None
+        task = asyncio.create_task(
+            self._summarize(
+                key,
+                summary,
+                contents[covered:boundary],
+                boundary,
+                _fingerprint(contents[boundary - 1]),
+            )
+        )
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return None
+
+    async def _summarize(
+        self,
+        key: str,
+        previous_summary: str,
+        contents: List[types.Content],
+        covered: int,
+        fingerprint: str,
+    ) -> None:
+        """Summarize the previous summary plus newly covered messages and store it."""
+        transcript = render_transcript(contents)
+        if previous_summary:
+            transcript = f"{SUMMARY_HEADER}\n{previous_summary}\n\n{transcript}"
+        try:
+            response = await self.model.api_client.aio.models.generate_content(
+                model=self.summary_model,
+                contents=transcript,
+                config=types.GenerateContentConfig(
+                    system_instruction=SUMMARY_INSTRUCTION, temperature=0
+                ),
+            )
+        except Exception as e:
+            print(f"⚠️ Conversation summary failed, keeping the full history: {e}")
+            return
+        if not response.text:
+            return
+        self._summaries.put(key, (covered, fingerprint, response.text.strip()), SESSION_TTL_SECONDS)
+        print(f"🗜️ Summarized the first {covered} messages of a session")
@@ -0,0 +1,133 @@
+"""
+Parameter Extraction for Grammar-Regular Requests
+
+Transfers, swaps and token discovery carry their whole meaning in a few
+tokens: a verb, an amount, one or two token symbols and a 0x address. These
+extractors pull those fields out with regexes so the orchestrator can
+dispatch initiate_transfer / initiate_swap / the Balance Agent without
+asking the model to parse them.
+
+Each extractor returns the action's arguments only when the request is
+complete and unambiguous (one intent, no question or negation, no missing
+field); otherwise it returns None and the caller falls back to the model.
+
+The common command forms ("transfer 1 MOVE to 0x...", "swap MOVE for
+USDC.e") are parsed first by a whole-message command grammar compiled with
+google-re2, which matches in guaranteed linear time; re is used when re2 is
+not installed. Other phrasings fall back to the field-by-field search.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional
+
+from app.agents.orchestrator.normalization import normalize_token_symbol
+from app.agents.orchestrator.routes import select_routes
+
+# Linear-time matching for the command grammar (no lookarounds, so re2 can compile it)
+try:
+    import re2 as command_re
+
+    RE2_AVAILABLE = True
+except ImportError:
+    command_re = re
+    RE2_AVAILABLE = False
+
+# Constants
+DEFAULT_TRANSFER_TOKEN = "MOVE"
+TOKEN_SYMBOLS = r"MOVE|USDC\.e|USDT\.e|WBTC\.e|WETH\.e|USDC|USDT|DAI|WBTC|WETH"
+
+ADDRESS_PATTERN = re.compile(r"\b0x[0-9a-fA-F]{40,64}\b")
+# Full Movement account address: 0x + 64 hex characters
+MOVEMENT_ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]{64}")
+AMOUNT_PATTERN = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)(?!\w|\.\d)")
+TOKEN_PATTERN = re.compile(rf"(?<![\w.])({TOKEN_SYMBOLS})(?!\w|\.\w)", re.IGNORECASE)
+TRANSFER_VERB_PATTERN = re.compile(r"^\s*(?:please\s+)?(?:transfer|send)\b", re.IGNORECASE)
+SWAP_VERB_PATTERN = re.compile(r"^\s*(?:please\s+)?(?:swap|exchange|trade)\b", re.IGNORECASE)
+SWAP_SOURCE_PATTERN = re.compile(r"\bfrom\s+" + TOKEN_PATTERN.pattern, re.IGNORECASE)
+POPULAR_TOKENS_PATTERN = re.compile(
+    r"^\s*(?:get|show|list)\s+(?:me\s+)?(?:the\s+)?(?:popular|trending|top)\s+tokens\s*[.!]?\s*$",
+    re.IGNORECASE,
+)
+# Whole-message command grammar, matched with fullmatch
+TRANSFER_COMMAND_PATTERN = command_re.compile(
+    r"(?i)\s*(?:please\s+)?(?:transfer|send)\s+(?P<amount>\d+(?:\.\d+)?)\s*"
+    rf"(?:(?P<token>{TOKEN_SYMBOLS})\s+)?to\s+(?:(?:this|the)\s+address:?\s*)?"
+    r"(?P<address>0x[0-9a-fA-F]{64})\s*[.!]?\s*"
+)
+SWAP_COMMAND_PATTERN = command_re.compile(
+    rf"(?i)\s*(?:please\s+)?(?:swap|exchange|trade)\s+(?P<source>{TOKEN_SYMBOLS})\s+"
+    rf"(?:for|to|with|into)\s+(?P<target>{TOKEN_SYMBOLS})\s*[.!]?\s*"
+)
+# Questions and negations ("how do I send...", "don't swap...") need the model
+UNCERTAIN_PATTERN = re.compile(
+    r"\?|\b(?:how|what|why|should|can i|could i|don'?t|do not|never|not)\b", re.IGNORECASE
+)
+
+
+def validate_address(address: str) -> bool:
+    """Return True if address is a full 66-character Movement address."""
+    return MOVEMENT_ADDRESS_PATTERN.fullmatch(address) is not None
+
+
+def _tokens(text: str) -> List[str]:
+    """Return the distinct token symbols in text, normalized, in order."""
+    return list(dict.fromkeys(normalize_token_symbol(m) for m in TOKEN_PATTERN.findall(text)))
+
+
+def _is_single_intent(text: str, intent: str) -> bool:
+    """Return True when text is a plain request for exactly one intent."""
+    return not UNCERTAIN_PATTERN.search(text) and select_routes(text) == [intent]
+
+
+def extract_transfer(text: str) -> Optional[Dict[str, str]]:
+    """Return initiate_transfer arguments for a complete transfer request, or None."""
+    command = TRANSFER_COMMAND_PATTERN.fullmatch(text)
+    if command:
+        token = command.group("token")
+        return {
+            "amount": command.group("amount"),
+            "token": normalize_token_symbol(token) if token else DEFAULT_TRANSFER_TOKEN,
+            "toAddress": command.group("address"),
+        }
+    if not TRANSFER_VERB_PATTERN.match(text) or not _is_single_intent(text, "transfer"):
+        return None
+    addresses = list(dict.fromkeys(ADDRESS_PATTERN.findall(text)))
+    # Digits inside the address are not amounts
+    amounts = AMOUNT_PATTERN.findall(ADDRESS_PATTERN.sub(" ", text))
+    tokens = _tokens(text)
+    if len(addresses) != 1 or len(amounts) != 1 or len(tokens) > 1:
+        return None
+    # The transfer card only accepts full Movement addresses
+    if not validate_address(addresses[0]):
+        return None
+    token = tokens[0] if tokens else DEFAULT_TRANSFER_TOKEN
+    return {"amount": amounts[0], "token": token, "toAddress": addresses[0]}
+
+
+def extract_swap(text: str) -> Optional[Dict[str, str]]:
+    """Return initiate_swap arguments for a swap naming two tokens, or None.
+
+    The source token is the one after "from" when present, else the first
+    token mentioned.
+    """
+    command = SWAP_COMMAND_PATTERN.fullmatch(text)
+    if command:
+        from_token = normalize_token_symbol(command.group("source"))
+        to_token = normalize_token_symbol(command.group("target"))
+        return {"fromToken": from_token, "toToken": to_token} if from_token != to_token else None
+    if not SWAP_VERB_PATTERN.match(text) or not _is_single_intent(text, "swap"):
+        return None
+    tokens = _tokens(text)
+    if len(tokens) != 2:
+        return None
+    source = SWAP_SOURCE_PATTERN.search(text)
+    from_token = normalize_token_symbol(source.group(1)) if source else tokens[0]
+    to_token = tokens[1] if from_token == tokens[0] else tokens[0]
+    return {"fromToken": from_token, "toToken": to_token}
+
+
+def is_popular_tokens_request(text: str) -> bool:
+    """Return True for a plain popular/trending token discovery request."""
+    return bool(POPULAR_TOKENS_PATTERN.match(text))
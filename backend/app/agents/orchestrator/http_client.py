@@ -0,0 +1,74 @@
+"""
+Shared HTTP Client for the Orchestrator Agent
+
+Every Gemini call made by the orchestrator goes through google-genai's async
+HTTP transport. Left to itself the transport is created per model client and
+connections are not shared across the app, so a chat turn with several
+sequential tool calls can pay a fresh TCP+TLS handshake per model round trip.
+
+This module owns one pooled httpx.AsyncClient (keep-alive, HTTP/2 when the
+optional h2 package is installed) and a Gemini model subclass that hands it
+to google-genai. The client is created lazily on first use so it binds to the
+server's event loop, and closed from the application lifespan.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from functools import cached_property
+from typing import Optional
+
+import httpx
+from google.adk.models import Gemini
+from google.genai import Client, types
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Constants
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_TIMEOUT_SECONDS = 30.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled AsyncClient, creating it on first use."""
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        )
+        protocol = "HTTP/2" if HTTP2_AVAILABLE else "HTTP/1.1"
+        print(f"🔌 Created shared orchestrator HTTP client ({protocol}, keep-alive)")
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared AsyncClient if it was created."""
+    global _shared_http_client
+    if _shared_http_client is not None and not _shared_http_client.is_closed:
+        await _shared_http_client.aclose()
+    _shared_http_client = None
+
+
+class PooledGemini(Gemini):
+    """Gemini model whose google-genai client reuses the shared AsyncClient."""
+
+    @cached_property
+    def api_client(self) -> Client:
+        """Provides the api client backed by the shared connection pool."""
+        return Client(
+            http_options=types.HttpOptions(
+                headers=self._tracking_headers,
+                retry_options=self.retry_options,
+                httpx_async_client=get_shared_http_client(),
+            )
+        )
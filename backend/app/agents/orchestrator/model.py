@@ -0,0 +1,166 @@
+"""
+Model Selection for the Orchestrator Agent
+
+The orchestrator's job is structured routing: pick an agent or frontend
+action, copy an address and a token symbol into the tool arguments and format
+the result. Gemini Flash handles that at a fraction of Pro's latency and cost,
+so Flash is the default. Pro is only used to redo a turn whose tool call
+Flash got wrong, and for synthesis turns: answering from several agent
+results at once, or from results too large for Flash to summarize well.
+
+A tool call is considered malformed when it names a tool that is not
+declared (known misspellings are repaired instead, see normalization.py), is
+missing required string arguments, or carries a 0x value that is
+not valid hex.
+
+ENVIRONMENT VARIABLES:
+----------------------
+- ORCHESTRATOR_MODEL: Primary model (default: gemini-2.5-flash)
+- ORCHESTRATOR_FALLBACK_MODEL: Escalation model (default: gemini-2.5-pro)
+- ORCHESTRATOR_SYNTHESIS_TOKEN_THRESHOLD: Estimated tool result tokens above
+  which the turn goes to the escalation model (default: 2000)
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional
+
+import orjson
+from google.adk.models import LlmRequest, LlmResponse
+
+from app.agents.orchestrator.cache import A2A_TOOL_NAME
+from app.agents.orchestrator.http_client import PooledGemini
+from app.agents.orchestrator.normalization import TOOL_NAME_ALIASES
+from app.agents.orchestrator.validation import find_malformed_address
+
+# Constants
+ORCHESTRATOR_MODEL = os.getenv("ORCHESTRATOR_MODEL", "gemini-2.5-flash")
+ORCHESTRATOR_FALLBACK_MODEL = os.getenv("ORCHESTRATOR_FALLBACK_MODEL", "gemini-2.5-pro")
+
+A2A_REQUIRED_ARGS = ("agentName", "task")
+
+# ADK's own rough estimate when no tokenizer result is available
+CHARS_PER_TOKEN_ESTIMATE = 4
+
+SYNTHESIS_MIN_TOOL_RESULTS = 2
+SYNTHESIS_TOKEN_THRESHOLD = int(os.getenv("ORCHESTRATOR_SYNTHESIS_TOKEN_THRESHOLD", "2000"))
+
+
+def find_invalid_tool_call(llm_request: LlmRequest, llm_response: LlmResponse) -> Optional[str]:
+    """Return why a response's tool calls are malformed, or None if they are fine."""
+    if not llm_response.content or not llm_response.content.parts:
+        return None
+    for part in llm_response.content.parts:
+        function_call = part.function_call
+        if not function_call:
+            continue
+        # Known misspellings are repaired by normalize_tool_arguments
+        name = TOOL_NAME_ALIASES.get(function_call.name, function_call.name)
+        if name not in llm_request.tools_dict:
+            return f"unknown tool {function_call.name!r}"
+        args = function_call.args or {}
+        if name == A2A_TOOL_NAME:
+            for arg_name in A2A_REQUIRED_ARGS:
+                value = args.get(arg_name)
+                if not isinstance(value, str) or not value.strip():
+                    return f"missing {arg_name}"
+        for value in args.values():
+            token = find_malformed_address(value) if isinstance(value, str) else None
+            if token:
+                return f"malformed address {token!r}"
+    return None
+
+
+def needs_synthesis(llm_request: LlmRequest) -> bool:
+    """Return True when the turn answers from several or large tool results.
+
+    Only the tool results after the model's last turn count; earlier ones
+    were already summarized.
+    """
+    results = []
+    for content in reversed(llm_request.contents):
+        if content.role == "model":
+            break
+        results.extend(
+            part.function_response.response
+            for part in content.parts or []
+            if part.function_response
+        )
+    if not results:
+        return False
+    if len(results) >= SYNTHESIS_MIN_TOOL_RESULTS:
+        return True
+    size = sum(len(orjson.dumps(result, default=str)) for result in results)
+    return size // CHARS_PER_TOKEN_ESTIMATE > SYNTHESIS_TOKEN_THRESHOLD
+
+
+class EscalatingGemini(PooledGemini):
+    """Gemini model that escalates synthesis turns and malformed tool calls.
+
+    Turns that combine several agent results, or one large result, go
+    straight to fallback_model. Otherwise text chunks from the primary model
+    stream through untouched; a response carrying a malformed tool call is
+    dropped and the same request is sent to fallback_model instead, unless
+    partial text from the primary model has already been streamed.
+    """
+
+    fallback_model: Optional[str] = ORCHESTRATOR_FALLBACK_MODEL
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Generate with the primary model, escalating synthesis turns and bad tool calls."""
+        if not self.fallback_model or self.fallback_model == llm_request.model:
+            async for llm_response in super().generate_content_async(llm_request, stream):
+                yield llm_response
+            return
+
+        # Context caching rewrites the request's config and contents in place,
+        # so keep an untouched copy for the fallback call
+        fallback_request = llm_request.model_copy(
+            update={
+                "model": self.fallback_model,
+                "contents": list(llm_request.contents),
+                # Routing output limits (router.py) are meant for the primary model
+                "config": llm_request.config.model_copy(
+                    deep=True, update={"max_output_tokens": None, "thinking_config": None}
+                ),
+                "cache_config": None,
+                "cache_metadata": None,
+            }
+        )
+
+        if needs_synthesis(llm_request):
+            print(f"🧠 Synthesizing agent results with {self.fallback_model}")
+            async for llm_response in super().generate_content_async(fallback_request, stream):
+                yield llm_response
+            return
+
+        reason = None
+        streamed = False
+        async with aclosing(super().generate_content_async(llm_request, stream)) as responses:
+            async for llm_response in responses:
+                reason = find_invalid_tool_call(llm_request, llm_response)
+                if reason and not streamed:
+                    break
+                if reason:
+                    # Partial text already went out; a fallback answer would
+                    # repeat it, so the tool error goes back to the model instead
+                    print(
+                        f"⚠️ {llm_request.model} produced a bad tool call ({reason}) "
+                        "after streaming text, not escalating"
+                    )
+                    reason = None
+                yield llm_response
+                streamed = True
+        if not reason:
+            return
+
+        print(
+            f"⚠️ {llm_request.model} produced a bad tool call ({reason}), "
+            f"retrying with {self.fallback_model}"
+        )
+        async for llm_response in super().generate_content_async(fallback_request, stream):
+            yield llm_response
@@ -0,0 +1,122 @@
+"""
+Tool Argument Normalization for the Orchestrator Agent
+
+Agent names, token symbols and network names in the model's tool calls are
+normalized with lookup tables instead of prompt rules. normalize_tool_arguments
+runs as an after_model_callback, before the A2A cache lookup and before the
+tool calls reach the frontend, so:
+
+- agentName matches the A2A agent card names the frontend looks up
+  ("Balance Agent" -> "balance")
+- token symbols are uppercased with the bridged ".e" suffix kept lowercase
+  ("usdc.e" -> "USDC.e", "tether" -> "USDT")
+- misspelled tool names are mapped back to the declared tool
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.agents.orchestrator.cache import A2A_TOOL_NAME
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmResponse
+
+# Constants
+BRIDGED_TOKEN_SUFFIX = ".e"
+
+TOOL_NAME_ALIASES: Dict[str, str] = {
+    "send_message_to_a_a_agent": A2A_TOOL_NAME,
+    "send_message_to_a2a": A2A_TOOL_NAME,
+    "send_message_to_agent": A2A_TOOL_NAME,
+}
+
+AGENT_ALIASES: Dict[str, str] = {
+    "balance agent": "balance",
+    "balance_agent": "balance",
+    "bridge agent": "bridge",
+    "bridge_agent": "bridge",
+    "lending agent": "lending",
+    "lending_agent": "lending",
+    "lending_comparison": "lending",
+    "swap agent": "swap",
+    "swap_agent": "swap",
+    "transfer agent": "transfer",
+    "transfer_agent": "transfer",
+    "premium lending agent": "premium_lending_agent",
+    "premium_lending": "premium_lending_agent",
+}
+
+TOKEN_ALIASES: Dict[str, str] = {
+    "movement": "MOVE",
+    "move coin": "MOVE",
+    "aptoscoin": "MOVE",
+    "tether": "USDT",
+    "usd coin": "USDC",
+}
+
+NETWORK_ALIASES: Dict[str, str] = {
+    "move": "movement",
+    "movement network": "movement",
+    "movement mainnet": "movement",
+    "eth": "ethereum",
+    "bsc": "bnb",
+    "binance": "bnb",
+    "binance smart chain": "bnb",
+    "matic": "polygon",
+}
+
+TOKEN_ARG_NAMES = ("token", "fromToken", "toToken", "asset")
+NETWORK_ARG_NAMES = ("network", "chain", "sourceChain", "destinationChain")
+
+
+def normalize_token_symbol(symbol: str) -> str:
+    """Return the canonical symbol for a user-typed token name."""
+    key = symbol.strip().lower()
+    if key in TOKEN_ALIASES:
+        return TOKEN_ALIASES[key]
+    if key.endswith(BRIDGED_TOKEN_SUFFIX):
+        return key[: -len(BRIDGED_TOKEN_SUFFIX)].upper() + BRIDGED_TOKEN_SUFFIX
+    return key.upper()
+
+
+def normalize_network(network: str) -> str:
+    """Return the canonical lowercase network name."""
+    key = network.strip().lower()
+    return NETWORK_ALIASES.get(key, key)
+
+
+def normalize_agent_name(agent_name: str) -> str:
+    """Return the A2A agent card name for a model-written agent name."""
+    key = agent_name.strip().lower()
+    return AGENT_ALIASES.get(key, key)
+
+
+def normalize_tool_arguments(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """After-model callback: normalize tool names and arguments in place.
+
+    Returns:
+        Always None; the response is modified in place
+    """
+    if not llm_response.content or not llm_response.content.parts:
+        return None
+    for part in llm_response.content.parts:
+        function_call = part.function_call
+        if not function_call:
+            continue
+        function_call.name = TOOL_NAME_ALIASES.get(function_call.name, function_call.name)
+        args = function_call.args
+        if not args:
+            continue
+        if function_call.name == A2A_TOOL_NAME and isinstance(args.get("agentName"), str):
+            args["agentName"] = normalize_agent_name(args["agentName"])
+        for arg_name in TOKEN_ARG_NAMES:
+            if isinstance(args.get(arg_name), str) and args[arg_name].strip():
+                args[arg_name] = normalize_token_symbol(args[arg_name])
+        for arg_name in NETWORK_ARG_NAMES:
+            if isinstance(args.get(arg_name), str) and args[arg_name].strip():
+                args[arg_name] = normalize_network(args[arg_name])
+    return None
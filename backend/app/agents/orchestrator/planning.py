@@ -0,0 +1,83 @@
+"""
+Parallel Tool Call Planning for the Orchestrator Agent
+
+Gemini may return several function calls in one response, and the frontend
+A2A middleware runs all send_message_to_a2a_agent calls of a response with
+Promise.all. Independent queries ("check my MOVE and USDC balance") therefore
+fan out in parallel and a turn costs the slowest agent call instead of the
+sum of all of them.
+
+Ordering only matters when the user explicitly chains steps ("first check my
+balance, then supply ..."). sequence_chained_calls runs as an
+after_model_callback and, for chained requests, keeps one call per
+(agentName, address) in the response; the deferred calls are re-issued by
+the model on the next turn, after the first result is in the history.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Optional, Set, Tuple
+
+from app.agents.orchestrator.cache import A2A_TOOL_NAME
+from app.agents.orchestrator.validation import HEX_TOKEN_PATTERN
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmResponse
+
+# User wording that makes later steps depend on earlier results
+CHAINED_REQUEST_PATTERN = re.compile(
+    r"\b(then|after that|afterwards|once (?:that|it) is done|followed by)\b", re.IGNORECASE
+)
+
+
+def get_call_lock_key(agent_name: str, task: str) -> Tuple[str, str]:
+    """Return the (agentName, address) key two A2A calls must not share when chained."""
+    addresses = HEX_TOKEN_PATTERN.findall(task)
+    return agent_name.strip().lower(), addresses[0].lower() if addresses else ""
+
+
+def is_chained_request(callback_context: CallbackContext) -> bool:
+    """Return True when the invocation's user message chains dependent steps."""
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return False
+    text = " ".join(part.text for part in user_content.parts if part.text)
+    return CHAINED_REQUEST_PATTERN.search(text) is not None
+
+
+def sequence_chained_calls(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """After-model callback: serialize A2A calls the user asked to run in order.
+
+    Independent calls are left in place so the frontend runs them in
+    parallel. For chained requests, a later call to the same agent for the
+    same address is dropped from the response.
+
+    Returns:
+        Always None; the response is modified in place
+    """
+    if not llm_response.content or not llm_response.content.parts:
+        return None
+    if not is_chained_request(callback_context):
+        return None
+
+    seen: Set[Tuple[str, str]] = set()
+    kept_parts = []
+    for part in llm_response.content.parts:
+        function_call = part.function_call
+        if function_call and function_call.name == A2A_TOOL_NAME:
+            args = function_call.args or {}
+            key = get_call_lock_key(str(args.get("agentName", "")), str(args.get("task", "")))
+            if key in seen:
+                continue
+            seen.add(key)
+        kept_parts.append(part)
+
+    deferred = len(llm_response.content.parts) - len(kept_parts)
+    if deferred:
+        llm_response.content.parts = kept_parts
+        print(f"🔗 Deferred {deferred} chained A2A call(s) to the next turn")
+    return None
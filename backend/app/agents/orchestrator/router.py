@@ -0,0 +1,319 @@
+"""
+Deterministic Pre-Router for the Orchestrator Agent
+
+Some requests leave nothing for the model to decide: "get popular tokens",
+"transfer 1 MOVE to 0x...", "swap MOVE for USDC.e". fast_route matches these
+with compiled patterns (extractors.py) and returns the tool call the model
+would have made.
+
+route_without_model runs as a before_model_callback on the first model call
+of an invocation. On a match it returns that tool call as the model response,
+so Gemini is skipped for the routing step; the tool result is still
+summarized by the model on the next call. Anything the patterns do not fully
+cover falls through to the model unchanged.
+
+remember_routing_decision (after_model_callback) stores the read-only A2A
+calls the model chose for a query in routing_decision_cache (cache.py), and
+replay_routing_decision (before_model_callback) answers a repeat of that
+query with the same calls, again without a model call. Identical queries
+that arrive while the first is still waiting on the model share its
+decision instead of each making a model call; release_routing_decision
+(on_model_error_callback) lets them go when that model call fails.
+
+limit_routing_output (before_model_callback) bounds the turns that do reach
+the model to pick a tool call: the answer is the call itself or a short
+question, so thinking is turned off and the output is capped. Tool result
+turns, where the model writes the reply, are left unbounded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.agents.orchestrator.cache import (
+    A2A_TOOL_NAME,
+    ADDRESS_PATTERN,
+    ROUTING_CACHE_TTL_STATE_KEY,
+    find_wallet_address,
+    get_routing_cache_ttl,
+    is_cache_enabled,
+    routing_cache_key,
+    routing_decision_cache,
+    serve_cached_a2a_calls,
+)
+from app.agents.orchestrator.extractors import (
+    extract_swap,
+    extract_transfer,
+    is_popular_tokens_request,
+)
+from app.agents.orchestrator.routes import select_routes
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+# Constants
+TRANSFER_ACTION_NAME = "initiate_transfer"
+SWAP_ACTION_NAME = "initiate_swap"
+# Invocation-scoped; ADK never persists "temp:" state
+WALLET_ADDRESS_STATE_KEY = "temp:routing_wallet_address"
+# Longest an identical concurrent query waits for the leader's decision; about
+# the latency of a Flash routing call, after which making its own call is faster
+COALESCE_WAIT_SECONDS = 3.0
+# Output cap for turns that pick a tool call; ignored on tool result turns
+ROUTING_MAX_OUTPUT_TOKENS = int(os.getenv("ORCHESTRATOR_ROUTING_MAX_OUTPUT_TOKENS", "256"))
+
+ADDRESS_BALANCE_PATTERN = re.compile(
+    r"^\s*(?:get|show|check)\s+(?:the\s+)?balances?\s+(?:of|for)\s+(0x[0-9a-fA-F]{1,64})"
+    r"(?:\s+on\s+movement)?\s*[.!]?\s*$",
+    re.IGNORECASE,
+)
+
+
+# Routing decisions in progress: cache key -> (started_at, future of the calls)
+_inflight_decisions: Dict[str, Tuple[float, asyncio.Future]] = {}
+
+
+class RouteDecision(NamedTuple):
+    """A tool call chosen without the model."""
+
+    tool_name: str
+    args: Dict[str, Any]
+
+
+def fast_route(query: str) -> Optional[RouteDecision]:
+    """Return the tool call for an unambiguous request, or None to ask the model."""
+    if is_popular_tokens_request(query):
+        return RouteDecision(A2A_TOOL_NAME, {"agentName": "balance", "task": query.strip()})
+
+    match = ADDRESS_BALANCE_PATTERN.match(query)
+    if match:
+        task = f"get balance of {match.group(1)} on movement"
+        return RouteDecision(A2A_TOOL_NAME, {"agentName": "balance", "task": task})
+
+    args = extract_transfer(query)
+    if args:
+        return RouteDecision(TRANSFER_ACTION_NAME, args)
+
+    args = extract_swap(query)
+    if args:
+        return RouteDecision(SWAP_ACTION_NAME, args)
+    return None
+
+
+def is_first_model_call(callback_context: CallbackContext) -> bool:
+    """Return True when the newest session event is the user's text message."""
+    events = callback_context.session.events
+    if not events:
+        return False
+    last_event = events[-1]
+    if last_event.author != "user" or not last_event.content or not last_event.content.parts:
+        return False
+    return any(part.text for part in last_event.content.parts)
+
+
+def get_user_text(callback_context: CallbackContext) -> str:
+    """Return the text of the invocation's user message."""
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return ""
+    return " ".join(part.text for part in user_content.parts if part.text)
+
+
+def _tool_call_response(decisions: List[RouteDecision]) -> LlmResponse:
+    """Build a model response carrying the given tool calls."""
+    # Imported here so the routing patterns can be used without google-adk
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(function_call=types.FunctionCall(name=name, args=args))
+                for name, args in decisions
+            ],
+        )
+    )
+
+
+def _reply_with_tool_calls(
+    callback_context: CallbackContext, decisions: List[RouteDecision]
+) -> LlmResponse:
+    """Return tool calls as the model response, answering cached A2A calls."""
+    llm_response = _tool_call_response(decisions)
+    # After-model callbacks do not run for callback responses, so apply the
+    # A2A cache here
+    serve_cached_a2a_calls(callback_context, llm_response)
+    return llm_response
+
+
+def route_without_model(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: answer unambiguous routing decisions without Gemini.
+
+    Returns:
+        An LlmResponse carrying the routed tool call, or None to call the model
+    """
+    if not is_first_model_call(callback_context):
+        return None
+    decision = fast_route(get_user_text(callback_context))
+    # Frontend actions are only declared when the client registered them
+    if decision is None or decision.tool_name not in llm_request.tools_dict:
+        return None
+    print(f"🧭 Routed {decision.tool_name} without a model call")
+    return _reply_with_tool_calls(callback_context, [decision])
+
+
+def _claim_inflight_decision(key: str) -> Optional[asyncio.Future]:
+    """Register this invocation as the leader for key, or return the leader's future."""
+    now = time.monotonic()
+    entry = _inflight_decisions.get(key)
+    if entry is not None and not entry[1].done() and now - entry[0] < COALESCE_WAIT_SECONDS:
+        return entry[1]
+    _inflight_decisions[key] = (now, asyncio.get_running_loop().create_future())
+    return None
+
+
+def _resolve_inflight_decision(key: str, calls: Optional[List[Dict[str, Any]]]) -> None:
+    """Hand the leader's decision to the invocations waiting on it."""
+    entry = _inflight_decisions.pop(key, None)
+    if entry is not None and not entry[1].done():
+        entry[1].set_result(calls)
+
+
+async def replay_routing_decision(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: repeat the model's A2A calls for the same query.
+
+    Uses a cached decision when there is one. Otherwise, when an identical
+    query (same normalized text and wallet) is already waiting on the model,
+    waits for that decision instead of making a second model call.
+
+    Returns:
+        An LlmResponse carrying the cached tool calls, or None to call the model
+    """
+    if not is_first_model_call(callback_context) or not is_cache_enabled(callback_context):
+        return None
+    wallet_address = find_wallet_address(llm_request)
+    # After-model callbacks do not see the request; hand the wallet over
+    callback_context.state[WALLET_ADDRESS_STATE_KEY] = wallet_address
+    key = routing_cache_key(get_user_text(callback_context), wallet_address)
+    calls = routing_decision_cache.get(key)
+    if calls:
+        print(f"⚡ Replayed cached routing decision ({len(calls)} call(s))")
+    else:
+        leader = _claim_inflight_decision(key)
+        if leader is None:
+            return None
+        try:
+            calls = await asyncio.wait_for(asyncio.shield(leader), COALESCE_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            calls = None
+        if not calls:
+            return None
+        print(f"🔗 Shared an in-flight routing decision ({len(calls)} call(s))")
+    return _reply_with_tool_calls(
+        callback_context, [RouteDecision(call["name"], call["args"]) for call in calls]
+    )
+
+
+def _cacheable_decision(
+    llm_response: LlmResponse, query: str, wallet_address: str
+) -> Optional[List[Dict[str, Any]]]:
+    """Return the response's tool calls if they may be reused for the same query."""
+    if not llm_response.content or not llm_response.content.parts:
+        return None
+    calls: List[Dict[str, Any]] = [
+        {"name": part.function_call.name, "args": dict(part.function_call.args or {})}
+        for part in llm_response.content.parts
+        if part.function_call
+    ]
+    if get_routing_cache_ttl(calls) is None:
+        return None
+    known = {address.lower() for address in ADDRESS_PATTERN.findall(query)}
+    known.add(wallet_address.lower())
+    for call in calls:
+        task = call["args"].get("task", "")
+        if any(address.lower() not in known for address in ADDRESS_PATTERN.findall(task)):
+            return None
+    return calls
+
+
+def remember_routing_decision(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """After-model callback: cache the read-only A2A calls chosen for a query.
+
+    Decisions are skipped when a call mentions an address that is neither in
+    the query nor the connected wallet, since it came from earlier turns.
+    Identical queries waiting on this decision are released either way.
+
+    Returns:
+        Always None; the response is not modified
+    """
+    if llm_response.partial:
+        return None
+    if not is_first_model_call(callback_context) or not is_cache_enabled(callback_context):
+        return None
+    wallet_address = callback_context.state.get(WALLET_ADDRESS_STATE_KEY)
+    if wallet_address is None:
+        return None
+
+    query = get_user_text(callback_context)
+    key = routing_cache_key(query, wallet_address)
+    calls = _cacheable_decision(llm_response, query, wallet_address)
+    if calls:
+        ttl = get_routing_cache_ttl(calls)
+        ttl = float(callback_context.state.get(ROUTING_CACHE_TTL_STATE_KEY, ttl))
+        routing_decision_cache.put(key, calls, ttl)
+    _resolve_inflight_decision(key, calls)
+    return None
+
+
+def release_routing_decision(
+    callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+) -> Optional[LlmResponse]:
+    """Model-error callback: release identical queries waiting on a failed call.
+
+    Returns:
+        Always None; the error propagates unchanged
+    """
+    wallet_address = callback_context.state.get(WALLET_ADDRESS_STATE_KEY)
+    if wallet_address is None or not is_first_model_call(callback_context):
+        return None
+    key = routing_cache_key(get_user_text(callback_context), wallet_address)
+    _resolve_inflight_decision(key, None)
+    return None
+
+
+def limit_routing_output(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: bound the output of a turn that picks a tool call.
+
+    Applies to the first model call for a message matching an intent. Only
+    generation settings change; ADK's context cache fingerprint covers the
+    instruction, tools and tool_config, so the cache stays valid.
+
+    Returns:
+        Always None; the request is modified in place
+    """
+    if not is_first_model_call(callback_context):
+        return None
+    if not select_routes(get_user_text(callback_context)):
+        return None
+    # Imported here so the routing patterns can be used without google-adk
+    from google.genai import types
+
+    llm_request.config.max_output_tokens = ROUTING_MAX_OUTPUT_TOKENS
+    # Flash can skip thinking entirely; Pro models cannot
+    if "flash" in (llm_request.model or ""):
+        llm_request.config.thinking_config = types.ThinkingConfig(thinking_budget=0)
+    return None
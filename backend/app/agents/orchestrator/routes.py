@@ -0,0 +1,193 @@
+"""
+Per-Request Routing Notes for the Orchestrator Agent
+
+The static prompt (prompt.txt) only states the global rules once. The
+intent-specific details - which agent or frontend action to use, task
+formats, parameters and examples - live in AGENT_ROUTES and are added to the
+model request only when the user's latest message matches the intent's
+keywords.
+
+inject_route_notes runs as a before_model_callback. The notes are appended
+as conversation content rather than to the system instruction, so the static
+system prefix stays identical across requests.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+# Constants
+ROUTE_NOTES_HEADER = "Routing notes for this request:"
+
+# intent -> keyword pattern, target and the guidance rendered into the request
+AGENT_ROUTES: Dict[str, Dict[str, Any]] = {
+    "balance": {
+        "pattern": re.compile(
+            r"\b(balances?|holdings?|portfolio|wallet|popular|trending|top tokens?|"
+            r"check|how much)\b"
+        ),
+        "target": 'send_message_to_a2a_agent(agentName="balance")',
+        "format_template": (
+            "Get [TOKEN] balance of [WALLET_ADDRESS] on movement (omit [TOKEN] for all balances)"
+        ),
+        "examples": [
+            '"get my balance" -> task="get balance of [WALLET_ADDRESS] on movement"',
+            '"check USDT" -> task="Get USDT balance of [WALLET_ADDRESS] on movement"',
+            '"get popular tokens" / "show trending tokens" -> pass the user\'s words as the '
+            "task, unchanged, with no address",
+            '"check my MOVE and USDC balance" -> ONE call with task=\'{"queries": '
+            '[{"address": "[WALLET_ADDRESS]", "token": "MOVE", "network": "movement"}, '
+            '{"address": "[WALLET_ADDRESS]", "token": "USDC", "network": "movement"}]}\'',
+        ],
+        "rules": [
+            "Popular/trending token queries are valid balance queries; never refuse them.",
+            "Batch several balances into one JSON task (at most 16 queries); the reply has a "
+            '"responses" list in query order. If it says "batched schema unsupported", send '
+            "separate calls.",
+            'Token discovery replies with "success": true, a "discovery_result" or tokens in '
+            '"balances" are successful even when the balances list is empty.',
+            "After presenting balances, stop. Do not call initiate_swap or any other action.",
+        ],
+    },
+    "transfer": {
+        "pattern": re.compile(r"\b(transfer|send)\b"),
+        "target": "initiate_transfer(amount, token, toAddress)",
+        "format_template": (
+            'amount and token as strings (token defaults to "MOVE"); toAddress is the recipient'
+        ),
+        "examples": [
+            '"transfer 1 MOVE to 0xabc..." -> '
+            'initiate_transfer(amount="1", token="MOVE", toAddress="0xabc...")',
+            '"send 100 USDC to this address: 0xabc..." -> '
+            'initiate_transfer(amount="100", token="USDC", toAddress="0xabc...")',
+            '"transfer tokens" -> ask for the amount, token and recipient address',
+        ],
+        "rules": [
+            "The sender is always the connected wallet; never ask for it.",
+            "If the recipient or amount is missing, ask for it. "
+            '"This address" refers to an address given earlier.',
+        ],
+    },
+    "swap": {
+        "pattern": re.compile(r"\b(swap|exchange|trade)\b"),
+        "target": "initiate_swap(fromToken, toToken)",
+        "format_template": (
+            '"swap X for/to/with Y" -> fromToken=X, toToken=Y; with one token, the other is "MOVE"'
+        ),
+        "examples": [
+            '"swap MOVE for USDC.e" -> initiate_swap(fromToken="MOVE", toToken="USDC.e")',
+            '"swap USDC" -> initiate_swap(fromToken="USDC", toToken="MOVE")',
+            '"swap tokens" -> ask which tokens to swap from and to',
+        ],
+        "rules": [
+            "Only call initiate_swap when the user explicitly asks to swap, exchange or trade.",
+            "Swappable tokens come from the Movement token registry (MOVE, USDC.e, USDT.e, "
+            "WBTC.e, WETH.e, ...); for anything else say it is not available and offer these.",
+            "After the call, tell the user the swap card is open and they can enter an amount.",
+        ],
+    },
+    "lending": {
+        "pattern": re.compile(
+            r"\b(lend|lending|borrow\w*|supply|collateral|repay|apr|apy|rates?|health factor|"
+            r"liquidat\w*|echelon|moveposition)\b"
+        ),
+        "target": 'send_message_to_a2a_agent(agentName="lending")',
+        "format_template": (
+            '"Supply [AMOUNT] [TOKEN] as collateral", "Borrow [AMOUNT] [TOKEN]", '
+            '"compare borrowing rates for [TOKEN]", "recommend best protocol for borrowing [TOKEN]"'
+        ),
+        "examples": [
+            '"which platform has lower APR for borrowing MOVE" -> '
+            'task="recommend best protocol for borrowing MOVE", then '
+            "show_lending_platform_selection(...) with the reply's fields",
+            '"supply 1000 USDC as collateral" -> task="Supply 1000 USDC as collateral"',
+        ],
+        "rules": [
+            "For rate comparisons, after the lending reply ALWAYS call "
+            "show_lending_platform_selection(action, asset, recommendedProtocol, echelonRate, "
+            "movepositionRate, reason) using the reply's action, asset, recommended_protocol, "
+            "echelon_rate, moveposition_rate and reason.",
+        ],
+    },
+    "bridge": {
+        "pattern": re.compile(r"\b(bridg\w*|cross-chain)\b"),
+        "target": 'send_message_to_a2a_agent(agentName="bridge")',
+        "format_template": (
+            "Bridge [AMOUNT] [TOKEN] from [SOURCE_CHAIN] to movement for [WALLET_ADDRESS]"
+        ),
+        "examples": [
+            '"bridge 100 USDC from Ethereum" -> '
+            'task="Bridge 100 USDC from ethereum to movement for [WALLET_ADDRESS]"',
+        ],
+        "rules": [
+            "Supported sources: Ethereum, BNB, Polygon; assets ETH, BNB, MATIC, USDC, USDT, DAI.",
+        ],
+    },
+}
+
+
+# All intents' keywords in one alternation, so a message is scanned once
+# instead of once per intent. Each intent's keywords are a named group; the
+# intents share no keywords, so a match always belongs to exactly one intent.
+INTENT_PATTERN = re.compile(
+    "|".join(f"(?P<{intent}>{route['pattern'].pattern})" for intent, route in AGENT_ROUTES.items())
+)
+_ROUTE_ORDER = {intent: index for index, intent in enumerate(AGENT_ROUTES)}
+
+
+def select_routes(text: str) -> List[str]:
+    """Return the intents whose keywords appear in text, in AGENT_ROUTES order."""
+    found = {match.lastgroup for match in INTENT_PATTERN.finditer(text.lower())}
+    return sorted(found, key=_ROUTE_ORDER.__getitem__)
+
+
+def render_route_notes(intents: List[str]) -> str:
+    """Render the routing notes for the given intents."""
+    lines = [ROUTE_NOTES_HEADER]
+    for intent in intents:
+        route = AGENT_ROUTES[intent]
+        lines.append(f"{intent.upper()} -> {route['target']}")
+        lines.append(f"- Format: {route['format_template']}")
+        lines.extend(f"- Example: {example}" for example in route["examples"])
+        lines.extend(f"- Rule: {rule}" for rule in route["rules"])
+    return "\n".join(lines)
+
+
+def _latest_user_text(callback_context: CallbackContext) -> str:
+    """Return the text of the user's most recent message in the session."""
+    for event in reversed(callback_context.session.events):
+        if event.author != "user" or not event.content or not event.content.parts:
+            continue
+        text = " ".join(part.text for part in event.content.parts if part.text)
+        if text:
+            return text
+    return ""
+
+
+def inject_route_notes(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: append the routing notes matching the user's request.
+
+    Tool result turns are routed on the user's last text message, so
+    follow-up steps (e.g. showing the lending platform selection) keep their
+    notes.
+
+    Returns:
+        Always None; the request is modified in place
+    """
+    # Imported here so the keyword routing can be used without google-genai
+    from google.genai import types
+
+    intents = select_routes(_latest_user_text(callback_context))
+    if not intents:
+        return None
+    llm_request.contents.append(
+        types.Content(role="user", parts=[types.Part(text=render_route_notes(intents))])
+    )
+    return None
@@ -0,0 +1,318 @@
+"""
+Redis Session Storage for the Orchestrator Agent
+
+ADK's InMemorySessionService keeps every conversation in the Python process:
+a restart drops all sessions and requests must stick to the worker that
+created them. RedisSessionService stores sessions in Redis instead, so any
+worker or replica can serve any session.
+
+Key layout (all keys share REDIS_KEY_PREFIX):
+
+- session:{app}:{user}:{id}        - hash of session metadata (last_update_time), EX ttl
+- session_state:{app}:{user}:{id}  - hash of session-scoped state, EX ttl
+- session_events:{app}:{user}:{id} - list of serialized events in order, EX ttl
+- sessions:{app}:{user}            - set of the user's session ids, EX ttl
+- app_state:{app}                  - hash of app-scoped ("app:") state
+- user_state:{app}:{user}          - hash of user-scoped ("user:") state
+
+Appending an event is one MULTI/EXEC transaction with no read: RPUSH adds
+the event and HSET merges each state delta field by field. Concurrent appends
+from several workers therefore never overwrite each other, and the cost does
+not grow with the session's history. Values are serialized with orjson.
+
+ENVIRONMENT VARIABLES:
+----------------------
+- REDIS_URL: Redis connection URL; when unset the orchestrator keeps the
+  in-memory session service
+- ORCHESTRATOR_SESSION_TTL_SECONDS: Session expiry (default: 3600)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import orjson
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+# Constants
+ENV_REDIS_URL = "REDIS_URL"
+REDIS_KEY_PREFIX = "orchestrator"
+SESSION_TTL_SECONDS = int(os.getenv("ORCHESTRATOR_SESSION_TTL_SECONDS", "3600"))
+
+
+def split_state_delta(state: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Split a state dict into app, user and session scoped deltas.
+
+    Temporary ("temp:") keys are dropped; they never outlive an invocation.
+    """
+    deltas: Dict[str, Dict[str, Any]] = {"app": {}, "user": {}, "session": {}}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            deltas["app"][key[len(State.APP_PREFIX) :]] = value
+        elif key.startswith(State.USER_PREFIX):
+            deltas["user"][key[len(State.USER_PREFIX) :]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            deltas["session"][key] = value
+    return deltas
+
+
+class RedisSessionService(BaseSessionService):
+    """ADK session service backed by Redis.
+
+    Args:
+        redis_url: Redis connection URL (e.g. redis://localhost:6379/0)
+        ttl_seconds: Expiry applied to sessions on every write
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = SESSION_TTL_SECONDS) -> None:
+        # Imported here so the in-memory setup does not require redis
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+
+    # Keys
+
+    def _session_key(self, app_name: str, user_id: str, session_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:session:{app_name}:{user_id}:{session_id}"
+
+    def _session_state_key(self, app_name: str, user_id: str, session_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:session_state:{app_name}:{user_id}:{session_id}"
+
+    def _events_key(self, app_name: str, user_id: str, session_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:session_events:{app_name}:{user_id}:{session_id}"
+
+    def _index_key(self, app_name: str, user_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:sessions:{app_name}:{user_id}"
+
+    def _app_state_key(self, app_name: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:app_state:{app_name}"
+
+    def _user_state_key(self, app_name: str, user_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:user_state:{app_name}:{user_id}"
+
+    # Serialization
+
+    @staticmethod
+    def _dump_fields(state: Dict[str, Any]) -> Dict[str, bytes]:
+        return {key: orjson.dumps(value) for key, value in state.items()}
+
+    @staticmethod
+    def _load_fields(raw: Dict[bytes, bytes]) -> Dict[str, Any]:
+        return {key.decode(): orjson.loads(value) for key, value in raw.items()}
+
+    @staticmethod
+    def _dump_event(event: Event) -> bytes:
+        return orjson.dumps(event.model_dump(mode="json", exclude_none=True))
+
+    @staticmethod
+    def _load_event(raw: bytes) -> Event:
+        # model_validate_json decodes base64 blobs (inline data) the same way
+        # model_dump(mode="json") encoded them
+        return Event.model_validate_json(raw)
+
+    def _merge_state(
+        self, session: Session, app_state: Dict[str, Any], user_state: Dict[str, Any]
+    ) -> Session:
+        """Expose app and user state on the session with their prefixes."""
+        for key, value in app_state.items():
+            session.state[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    async def _read_session(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        num_recent_events: Optional[int] = None,
+    ) -> Optional[Session]:
+        """Read a session in one transaction; num_recent_events=0 skips the events."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hget(self._session_key(app_name, user_id, session_id), "last_update_time")
+            pipe.hgetall(self._session_state_key(app_name, user_id, session_id))
+            pipe.hgetall(self._app_state_key(app_name))
+            pipe.hgetall(self._user_state_key(app_name, user_id))
+            if num_recent_events != 0:
+                # LRANGE with a negative start reads only the trailing events
+                start = -num_recent_events if num_recent_events else 0
+                pipe.lrange(self._events_key(app_name, user_id, session_id), start, -1)
+            results = await pipe.execute()
+        last_update_time, state_raw, app_raw, user_raw = results[:4]
+        if last_update_time is None:
+            return None
+
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._load_fields(state_raw),
+            events=[self._load_event(raw) for raw in results[4]] if len(results) > 4 else [],
+            last_update_time=float(last_update_time),
+        )
+        return self._merge_state(session, self._load_fields(app_raw), self._load_fields(user_raw))
+
+    # BaseSessionService
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        """Create a session and store its metadata and state in Redis."""
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        session_key = self._session_key(app_name, user_id, session_id)
+        if await self._redis.exists(session_key):
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+
+        deltas = split_state_delta(state)
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=deltas["session"],
+            last_update_time=time.time(),
+        )
+
+        state_key = self._session_state_key(app_name, user_id, session_id)
+        index_key = self._index_key(app_name, user_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(session_key, "last_update_time", session.last_update_time)
+            pipe.expire(session_key, self.ttl_seconds)
+            if deltas["session"]:
+                pipe.hset(state_key, mapping=self._dump_fields(deltas["session"]))
+                pipe.expire(state_key, self.ttl_seconds)
+            pipe.sadd(index_key, session_id)
+            pipe.expire(index_key, self.ttl_seconds)
+            if deltas["app"]:
+                pipe.hset(self._app_state_key(app_name), mapping=self._dump_fields(deltas["app"]))
+            if deltas["user"]:
+                pipe.hset(
+                    self._user_state_key(app_name, user_id),
+                    mapping=self._dump_fields(deltas["user"]),
+                )
+            pipe.hgetall(self._app_state_key(app_name))
+            pipe.hgetall(self._user_state_key(app_name, user_id))
+            *_, app_raw, user_raw = await pipe.execute()
+
+        return self._merge_state(session, self._load_fields(app_raw), self._load_fields(user_raw))
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        """Load a session, optionally trimming its events."""
+        num_recent_events = config.num_recent_events if config else None
+        session = await self._read_session(
+            app_name, user_id, session_id, num_recent_events=num_recent_events or None
+        )
+        if session is not None and config and config.after_timestamp:
+            session.events = [
+                event for event in session.events if event.timestamp >= config.after_timestamp
+            ]
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        """List sessions without their events."""
+        if user_id is not None:
+            index_keys = [self._index_key(app_name, user_id)]
+        else:
+            index_keys = [
+                key async for key in self._redis.scan_iter(match=self._index_key(app_name, "*"))
+            ]
+
+        sessions: List[Session] = []
+        for index_key in index_keys:
+            owner = index_key.decode() if isinstance(index_key, bytes) else index_key
+            owner_id = owner.rsplit(":", 1)[-1]
+            session_ids = [
+                sid.decode() if isinstance(sid, bytes) else sid
+                for sid in await self._redis.smembers(index_key)
+            ]
+            for session_id in session_ids:
+                session = await self._read_session(
+                    app_name, owner_id, session_id, num_recent_events=0
+                )
+                if session is None:
+                    # Session expired; drop the stale index entry
+                    await self._redis.srem(index_key, session_id)
+                    continue
+                sessions.append(session)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        """Delete a session's keys and its index entry."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(
+                self._session_key(app_name, user_id, session_id),
+                self._session_state_key(app_name, user_id, session_id),
+                self._events_key(app_name, user_id, session_id),
+            )
+            pipe.srem(self._index_key(app_name, user_id), session_id)
+            await pipe.execute()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event to the caller's session and to Redis in one transaction."""
+        if event.partial:
+            return event
+
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        app_name, user_id = session.app_name, session.user_id
+        session_key = self._session_key(app_name, user_id, session.id)
+        state_key = self._session_state_key(app_name, user_id, session.id)
+        events_key = self._events_key(app_name, user_id, session.id)
+        deltas = split_state_delta(event.actions.state_delta if event.actions else None)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.exists(session_key)
+            pipe.rpush(events_key, self._dump_event(event))
+            pipe.hset(session_key, "last_update_time", event.timestamp)
+            if deltas["session"]:
+                pipe.hset(state_key, mapping=self._dump_fields(deltas["session"]))
+            for key in (session_key, state_key, events_key, self._index_key(app_name, user_id)):
+                pipe.expire(key, self.ttl_seconds)
+            if deltas["app"]:
+                pipe.hset(self._app_state_key(app_name), mapping=self._dump_fields(deltas["app"]))
+            if deltas["user"]:
+                pipe.hset(
+                    self._user_state_key(app_name, user_id),
+                    mapping=self._dump_fields(deltas["user"]),
+                )
+            existed = (await pipe.execute())[0]
+
+        if not existed:
+            # The session expired or was deleted; drop the keys this append recreated
+            await self._redis.delete(session_key, state_key, events_key)
+            print(f"⚠️ Failed to append event: session {session.id} not found in Redis")
+        return event
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+def create_session_service() -> Optional[RedisSessionService]:
+    """Return a RedisSessionService when REDIS_URL is set, else None (in-memory)."""
+    redis_url = os.getenv(ENV_REDIS_URL)
+    if not redis_url:
+        return None
+    print("🗄️ Orchestrator sessions stored in Redis")
+    return RedisSessionService(redis_url=redis_url)
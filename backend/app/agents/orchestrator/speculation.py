@@ -0,0 +1,56 @@
+"""
+Speculative Balance Prefetch for the Orchestrator Agent
+
+A message like "check my balance" ends in a Balance Agent call almost every
+time, but that call only starts once the model has decided on it and the
+frontend middleware has sent it. The Balance Agent runs in the same process,
+so prefetch_predicted_balances (a before_model_callback) starts the indexer
+fetch as soon as the message arrives. When the predicted call reaches the
+Balance Agent it picks up the prefetched result; if the model decides
+otherwise the result expires unused (see prefetch_movement_balances).
+
+Only messages whose keywords match the balance intent alone (select_routes)
+are predicted; popular/trending token queries do not fetch a wallet.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from app.agents.balance.agent import prefetch_movement_balances
+from app.agents.orchestrator.cache import (
+    ADDRESS_PATTERN,
+    POPULAR_TOKENS_TASK_PATTERN,
+    find_wallet_address,
+)
+from app.agents.orchestrator.extractors import validate_address
+from app.agents.orchestrator.router import get_user_text, is_first_model_call
+from app.agents.orchestrator.routes import select_routes
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+# Constants
+MAX_PREFETCH_ADDRESSES = 4
+
+
+def prefetch_predicted_balances(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: prefetch balances for a predicted Balance Agent call.
+
+    Returns:
+        Always None so the model call proceeds
+    """
+    if not is_first_model_call(callback_context):
+        return None
+    text = get_user_text(callback_context)
+    if select_routes(text) != ["balance"] or POPULAR_TOKENS_TASK_PATTERN.search(text.lower()):
+        return None
+    addresses = ADDRESS_PATTERN.findall(text) or [find_wallet_address(llm_request)]
+    unique_addresses = list(dict.fromkeys(address for address in addresses if address))
+    unique_addresses = [address for address in unique_addresses if validate_address(address)]
+    for address in unique_addresses[:MAX_PREFETCH_ADDRESSES]:
+        prefetch_movement_balances(address)
+    return None
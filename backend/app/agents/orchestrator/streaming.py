@@ -0,0 +1,67 @@
+"""
+Token Streaming for the Orchestrator Agent
+
+Gemini responses are streamed to the client as AG-UI server-sent events, so
+the formatted answer after a tool call starts rendering at the first model
+token instead of after the full response. Two things can silently undo that:
+
+- a RunConfig without StreamingMode.SSE, which makes ADK wait for the
+  complete response before emitting any event
+- a reverse proxy (nginx, Render's edge) buffering the event stream
+
+streaming_run_config pins the streaming mode explicitly and
+SSEHeadersMiddleware marks event-stream responses as unbuffered and
+uncacheable.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+
+if TYPE_CHECKING:
+    from ag_ui.core import RunAgentInput
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Constants
+SSE_CONTENT_TYPE = b"text/event-stream"
+SSE_HEADERS: Dict[bytes, bytes] = {
+    b"x-accel-buffering": b"no",
+    b"cache-control": b"no-cache",
+}
+
+
+def streaming_run_config(input: RunAgentInput) -> RunConfig:
+    """Create the per-request RunConfig with token streaming enabled."""
+    return RunConfig(streaming_mode=StreamingMode.SSE, save_input_blobs_as_artifacts=True)
+
+
+class SSEHeadersMiddleware:
+    """Pure ASGI middleware adding anti-buffering headers to SSE responses.
+
+    Implemented at the ASGI level (not BaseHTTPMiddleware) so the streamed
+    body is passed through chunk by chunk without an extra task per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers: List[Tuple[bytes, bytes]] = list(message.get("headers", []))
+                content_type = dict(headers).get(b"content-type", b"")
+                if content_type.startswith(SSE_CONTENT_TYPE):
+                    present = {name.lower() for name, _ in headers}
+                    headers.extend(
+                        (name, value) for name, value in SSE_HEADERS.items() if name not in present
+                    )
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,81 @@
+"""
+Address Validation for the Orchestrator Agent
+
+Checking that a wallet address is 0x-prefixed hex is a regex, not a model
+task. reject_malformed_addresses runs as a before_model_callback: when the
+user's new message contains a malformed 0x token it answers directly and the
+Gemini call is skipped. find_invalid_tool_call (model.py) applies the same
+check to tool arguments the model produces.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+# A word is an address candidate when 0x is followed by a hex digit; only the
+# hex format is enforced (Movement addresses are usually 0x + 64 hex chars, but
+# shorter forms such as 0x1 are valid). A bare "0x" is not a candidate
+HEX_TOKEN_PATTERN = re.compile(r"\b0x[0-9a-fA-F]\w*")
+HEX_ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]+")
+HEX_DIGIT_PATTERN = re.compile(r"[0-9a-fA-F]")
+
+# Hex digits a non-hex candidate needs before it reads as a mistyped address
+# rather than a word such as the 0xBTC ticker
+MISTYPED_ADDRESS_MIN_HEX_DIGITS = 8
+
+INVALID_ADDRESS_MESSAGE = (
+    "`{token}` is not a valid wallet address. Please provide an address that starts "
+    "with 0x followed by hexadecimal characters (0-9, a-f), e.g. a 66-character "
+    "Movement Network address."
+)
+
+
+def find_malformed_address(text: str) -> Optional[str]:
+    """Return the first mistyped 0x address in text, or None.
+
+    Candidates that are valid hex pass, as do words with too few hex digits
+    to be an address attempt (tickers like 0xBTC).
+    """
+    for token in HEX_TOKEN_PATTERN.findall(text):
+        if HEX_ADDRESS_PATTERN.fullmatch(token):
+            continue
+        if len(HEX_DIGIT_PATTERN.findall(token[2:])) >= MISTYPED_ADDRESS_MIN_HEX_DIGITS:
+            return token
+    return None
+
+
+def reject_malformed_addresses(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before-model callback: answer malformed addresses without calling Gemini.
+
+    Only the invocation's user message is checked; tool result submissions
+    carry no text and pass through.
+
+    Returns:
+        An LlmResponse asking for a valid address, or None to call the model
+    """
+    # Imported here so the address check can be used without google-adk
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    user_content = callback_context.user_content
+    if not user_content or not user_content.parts:
+        return None
+    text = " ".join(part.text for part in user_content.parts if part.text)
+    token = find_malformed_address(text)
+    if token is None:
+        return None
+
+    print(f"🚫 Rejected malformed address {token!r} without a model call")
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(text=INVALID_ADDRESS_MESSAGE.format(token=token))],
+        )
+    )
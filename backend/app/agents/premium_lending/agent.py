@@ -10,9 +10,9 @@ import os
 import uuid
 import json
 from typing import Any, Dict, List, Optional
-from dotenv import load_dotenv
+from app.env import load_env
 
-load_dotenv()
+load_env()
 import requests
 import os
 import logging
@@ -222,6 +222,13 @@ def calculate_utilization(total_liability: float, total_cash: float) -> float:
     return (total_liability / total) * 100
 
 
+def _echelon_address_candidates(asset: Dict[str, Any]) -> frozenset:
+    """Addresses an Echelon marketStats entry may be keyed by for this asset."""
+    return frozenset(
+        a for a in (asset.get("address"), asset.get("faAddress"), asset.get("market")) if a
+    )
+
+
 def get_echelon_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate aggregate metrics from Echelon data."""
     if not data or "data" not in data:
@@ -238,17 +245,10 @@ def get_echelon_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
         price = asset.get("price", 0)
         supply_apy = asset.get("supplyApr", 0)
         borrow_apy = asset.get("borrowApr", 0)
-        market_address = asset.get("market", "")
+        candidates = _echelon_address_candidates(asset)
         for stat in market_stats:
             if isinstance(stat, list) and len(stat) >= 2:
-                stat_address = stat[0]
-                asset_address = asset.get("address", "")
-                asset_fa_address = asset.get("faAddress", "")
-                if (
-                    stat_address == asset_address
-                    or stat_address == asset_fa_address
-                    or stat_address == market_address
-                ):
+                if stat[0] in candidates:
                     market_data = stat[1]
                     total_shares = market_data.get("totalShares", 0)
                     total_liability = market_data.get("totalLiability", 0)
@@ -359,21 +359,14 @@ def compare_lending_rates(asset: str = "USDC") -> str:
         supply_apr = calculate_echelon_supply_apr(echelon_asset)
         supply_apy = convert_apr_to_apy(supply_apr)
         price = echelon_asset.get("price", 0)
-        market_address = echelon_asset.get("market", "")
         market_stats = echelon_data.get("data", {}).get("marketStats", [])
         total_shares = 0.0
         total_liability = 0.0
         total_cash = 0.0
-        asset_address = echelon_asset.get("address", "")
-        fa_address = echelon_asset.get("faAddress", "")
+        candidates = _echelon_address_candidates(echelon_asset)
         for stat in market_stats:
             if isinstance(stat, list) and len(stat) >= 2:
-                stat_address = stat[0]
-                if (
-                    stat_address == asset_address
-                    or stat_address == fa_address
-                    or stat_address == market_address
-                ):
+                if stat[0] in candidates:
                     market_data = stat[1]
                     total_shares = market_data.get("totalShares", 0)
                     total_liability = market_data.get("totalLiability", 0)
@@ -646,14 +639,10 @@ def recommend_best_protocol(action: str, asset: str = "USDC") -> str:
             if echelon_data:
                 price = echelon_asset.get("price", 0)
                 market_stats = echelon_data.get("data", {}).get("marketStats", [])
+                candidates = _echelon_address_candidates(echelon_asset)
                 for stat in market_stats:
                     if isinstance(stat, list) and len(stat) >= 2:
-                        stat_address = stat[0]
-                        if (
-                            stat_address == echelon_asset.get("address")
-                            or stat_address == echelon_asset.get("faAddress")
-                            or stat_address == echelon_asset.get("market")
-                        ):
+                        if stat[0] in candidates:
                             market_data = stat[1]
                             total_shares = market_data.get("totalShares", 0)
                             echelon_tvl = total_shares * price
@@ -5,15 +5,18 @@ Defines the SentimentAgent class that handles sentiment analysis queries.
 Adapted for Movement repository pattern with create_sentiment_agent_app() function.
 """
 
+import asyncio
 import os
 import logging
-from typing import Any
+import re
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
+from app.env import load_env
 from app.x402 import X402PaywallMiddleware, RouteConfig
 
 from .core.constants import (
@@ -23,8 +26,8 @@ from .core.response_validator import (
     build_error_response,
     log_response_info,
     validate_and_serialize_response,
-    validate_json,
 )
+from .core.task_store import BoundedTaskStore
 
 # Import executors inside function to avoid circular import
 from .services.query_parser import (
@@ -58,95 +61,224 @@ from .tools.santiment import (
     get_volume_usd,
 )
 
+logger = logging.getLogger(__name__)
+
+load_env()
+
+# Deployment settings, resolved once at import
+MOVEMENT_PAY_TO = os.getenv("MOVEMENT_PAY_TO") or os.getenv("NEXT_PUBLIC_MOVEMENT_PAY_TO")
+AGENTS_PORT = int(os.getenv("PORT", os.getenv("AGENTS_PORT", 8000)))
+RENDER_EXTERNAL_URL = os.getenv("RENDER_EXTERNAL_URL")
+
+# Query keywords, scanned in one pass. Longer phrases come first so they win
+# over the shorter keywords they contain.
+_KEYWORD_PATTERN = re.compile(
+    r"(?P<trending>trending)"
+    r"|(?P<social_shift>social shift|spike|drop)"
+    r"|(?P<social_dominance>dominance)"
+    r"|(?P<social_volume>social volume|mentions)"
+    r"|(?P<sentiment>sentiment)"
+    r"|(?P<active_addresses>active address)"
+    r"|(?P<price>price)"
+    r"|(?P<btc>btc)"
+    r"|(?P<transaction>transaction)"
+    r"|(?P<volume>volume)"
+)
+
+# (intent, keywords required, keywords excluded), in precedence order
+_INTENT_RULES: List[Tuple[str, FrozenSet[str], FrozenSet[str]]] = [
+    ("trending_words", frozenset({"trending"}), frozenset()),
+    ("social_shift", frozenset({"social_shift"}), frozenset()),
+    ("social_dominance", frozenset({"social_dominance"}), frozenset()),
+    ("social_volume", frozenset({"social_volume"}), frozenset()),
+    ("sentiment_balance", frozenset({"sentiment"}), frozenset()),
+    ("price_btc", frozenset({"price", "btc"}), frozenset()),
+    ("price_usd", frozenset({"price"}), frozenset()),
+    ("volume_btc", frozenset({"volume", "btc"}), frozenset({"transaction"})),
+    ("transaction_volume", frozenset({"volume", "transaction"}), frozenset()),
+    ("volume_usd", frozenset({"volume"}), frozenset()),
+    ("active_addresses", frozenset({"active_addresses"}), frozenset()),
+]
+DEFAULT_INTENT = "sentiment_balance"
+
+# intent -> (query parser, Santiment fetcher, response builder); the fetcher
+# takes the parsed arguments and the builder takes them plus the result
+_DISPATCH: Dict[str, Tuple[Callable[..., Tuple], Callable[..., Any], Callable[..., Any]]] = {
+    "trending_words": (
+        parse_trending_words_query,
+        get_trending_words,
+        build_trending_words_response,
+    ),
+    "social_shift": (parse_social_shift_query, alert_social_shift, build_social_shift_response),
+    "social_dominance": (
+        parse_social_dominance_query,
+        get_social_dominance,
+        build_social_dominance_response,
+    ),
+    "social_volume": (parse_social_volume_query, get_social_volume, build_social_volume_response),
+    "sentiment_balance": (
+        parse_sentiment_query,
+        get_sentiment_balance,
+        build_sentiment_balance_response,
+    ),
+    "price_btc": (parse_sentiment_query, get_price_btc, partial(build_price_response, "price_btc")),
+    "price_usd": (parse_sentiment_query, get_price_usd, partial(build_price_response, "price_usd")),
+    "volume_btc": (
+        parse_sentiment_query,
+        get_volume_btc,
+        partial(build_volume_response, "volume_btc"),
+    ),
+    "transaction_volume": (
+        parse_sentiment_query,
+        get_transaction_volume,
+        partial(build_volume_response, "transaction_volume"),
+    ),
+    "volume_usd": (
+        parse_sentiment_query,
+        get_volume_usd,
+        partial(build_volume_response, "volume_usd"),
+    ),
+    "active_addresses": (
+        parse_sentiment_query,
+        get_active_addresses,
+        build_active_addresses_response,
+    ),
+}
+
+
+def select_intent(query_lower: str) -> str:
+    """Return the metric intent for a lowercased query.
+
+    Keywords are found in one regex pass; the first rule in _INTENT_RULES
+    whose keywords are all present wins. Unclear queries default to
+    sentiment balance.
+    """
+    found = {match.lastgroup for match in _KEYWORD_PATTERN.finditer(query_lower)}
+    for intent, required, excluded in _INTENT_RULES:
+        if required <= found and not excluded & found:
+            return intent
+    return DEFAULT_INTENT
+
+
+def plan_query(query: str) -> Tuple[Callable[..., Any], Tuple, Callable[..., Any]]:
+    """Return the (Santiment fetcher, parsed arguments, response builder) for a query."""
+    parse, fetch, build = _DISPATCH[select_intent(query.lower())]
+    return fetch, parse(query), build
+
+
+def _serialize_response(query: str, response: Any) -> str:
+    """Validate a built response and return it as a JSON string."""
+    # Already checked to be valid JSON
+    validated_response = validate_and_serialize_response(response)
+    log_response_info(query, validated_response)
+    return validated_response
+
 
 class SentimentAgent:
     """Agent that provides cryptocurrency sentiment analysis using Santiment API."""
 
     async def invoke(self, query: str, session_id: str) -> str:
         """Invoke the agent with a query."""
-        print(f"🔍 Sentiment Agent received query: {query}")
-        query_lower = query.lower()
+        logger.debug("Sentiment Agent received query: %s", query)
 
         try:
-            # Determine which metric to fetch based on query
-            if "trending" in query_lower or "trending words" in query_lower:
-                days, top_n = parse_trending_words_query(query)
-                result = get_trending_words(days, top_n)
-                response = build_trending_words_response(days, top_n, result)
-
-            elif "social shift" in query_lower or "spike" in query_lower or "drop" in query_lower:
-                asset, threshold, days = parse_social_shift_query(query)
-                result = alert_social_shift(asset, threshold, days)
-                response = build_social_shift_response(asset, threshold, days, result)
-
-            elif "social dominance" in query_lower or "dominance" in query_lower:
-                asset, days = parse_social_dominance_query(query)
-                result = get_social_dominance(asset, days)
-                response = build_social_dominance_response(asset, days, result)
-
-            elif "social volume" in query_lower or "mentions" in query_lower:
-                asset, days = parse_social_volume_query(query)
-                result = get_social_volume(asset, days)
-                response = build_social_volume_response(asset, days, result)
-
-            elif "sentiment" in query_lower or "sentiment balance" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_sentiment_balance(asset, days)
-                response = build_sentiment_balance_response(asset, days, result)
-
-            elif "price" in query_lower and "btc" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_price_btc(asset, days)
-                response = build_price_response("price_btc", asset, days, result)
-
-            elif "price" in query_lower or "usd price" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_price_usd(asset, days)
-                response = build_price_response("price_usd", asset, days, result)
-
-            elif (
-                "volume" in query_lower
-                and "btc" in query_lower
-                and "transaction" not in query_lower
-            ):
-                asset, days = parse_sentiment_query(query)
-                result = get_volume_btc(asset, days)
-                response = build_volume_response("volume_btc", asset, days, result)
-
-            elif "volume" in query_lower and "transaction" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_transaction_volume(asset, days)
-                response = build_volume_response("transaction_volume", asset, days, result)
-
-            elif "volume" in query_lower or "trading volume" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_volume_usd(asset, days)
-                response = build_volume_response("volume_usd", asset, days, result)
-
-            elif "active addresses" in query_lower or "active address" in query_lower:
-                asset, days = parse_sentiment_query(query)
-                result = get_active_addresses(asset, days)
-                response = build_active_addresses_response(asset, days, result)
-
-            else:
-                # Default to sentiment balance if unclear
-                asset, days = parse_sentiment_query(query)
-                result = get_sentiment_balance(asset, days)
-                response = build_sentiment_balance_response(asset, days, result)
-
-            validated_response = validate_and_serialize_response(response)
-            log_response_info(query, validated_response)
-            validate_json(validated_response)
-            return validated_response
+            fetch, args, build = plan_query(query)
+            # Santiment calls block on HTTP; keep them off the event loop
+            result = await asyncio.to_thread(fetch, *args)
+            return _serialize_response(query, build(*args, result))
 
         except Exception as e:
-            print(f"❌ Error in sentiment agent: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Error in sentiment agent")
             error_msg = f"{ERROR_VALIDATION_FAILED}: {str(e)}"
             return build_error_response("unknown", error_msg)
 
+    async def invoke_batch(self, queries: List[str], session_id: str) -> List[str]:
+        """Answer several queries, fetching each distinct metric request once.
+
+        Queries that resolve to the same fetcher and arguments (e.g. a
+        dashboard asking for one asset's sentiment from several cards) share
+        a single Santiment call, and the distinct calls run concurrently.
+
+        Args:
+            queries: Natural-language sentiment queries
+            session_id: Session the queries belong to
+
+        Returns:
+            One JSON response per query, in query order
+        """
+        plans = [plan_query(query) for query in queries]
+        calls = list(dict.fromkeys((fetch, args) for fetch, args, _ in plans))
+        results = await asyncio.gather(
+            *(asyncio.to_thread(fetch, *args) for fetch, args in calls), return_exceptions=True
+        )
+        results_by_call = dict(zip(calls, results, strict=True))
+
+        responses = []
+        for query, (fetch, args, build) in zip(queries, plans, strict=True):
+            try:
+                result = results_by_call[(fetch, args)]
+                if isinstance(result, Exception):
+                    raise result
+                responses.append(_serialize_response(query, build(*args, result)))
+            except Exception as e:
+                logger.exception("Error in sentiment agent batch query")
+                error_msg = f"{ERROR_VALIDATION_FAILED}: {str(e)}"
+                responses.append(build_error_response("unknown", error_msg))
+        return responses
+
+
+_ORCHESTRATED_SKILL = AgentSkill(
+    id="sentiment_trading_agent",
+    name="Combined Sentiment & Trading Analysis Agent",
+    description="Provides cryptocurrency sentiment analysis AND trading recommendations using Santiment API and technical analysis. Combines sentiment data (sentiment balance, social volume, social dominance) with price data and technical indicators (RSI, MACD, moving averages) to generate buy/sell/hold recommendations.",
+    tags=[
+        "sentiment",
+        "trading",
+        "crypto",
+        "social",
+        "analysis",
+        "santiment",
+        "price",
+        "volume",
+        "technical-analysis",
+        "trading-recommendations",
+    ],
+    examples=[
+        "Get sentiment balance for Bitcoin over the last week",
+        "Should I buy or sell Bitcoin? Analyze sentiment and price trends",
+        "What's the trading recommendation for Ethereum based on sentiment and technical analysis?",
+        "Get Bitcoin price analysis with sentiment data",
+        "Analyze Ethereum: sentiment, price trends, and trading recommendation",
+    ],
+)
+
+_SIMPLE_SKILL = AgentSkill(
+    id="sentiment_agent",
+    name="Cryptocurrency Sentiment Analysis Agent",
+    description="Provides cryptocurrency sentiment analysis using Santiment API, including sentiment balance, social volume, social dominance, trending words, social shifts, price data (USD/BTC), trading volume, transaction volume, and active addresses",
+    tags=[
+        "sentiment",
+        "crypto",
+        "social",
+        "analysis",
+        "santiment",
+        "price",
+        "volume",
+        "on-chain",
+    ],
+    examples=[
+        "Get sentiment balance for Bitcoin over the last week",
+        "How many times has Ethereum been mentioned on social media in the past 5 days?",
+        "Tell me if there's been a big change in Bitcoin's social volume recently, with a 30% threshold",
+        "What are the top 3 trending words in crypto over the past 3 days?",
+        "How dominant is Ethereum in social media discussions this week?",
+        "Get Bitcoin price in USD for the last 7 days",
+        "What's Ethereum's trading volume in USD over the past week?",
+        "Show me Bitcoin's active addresses for the last 30 days",
+        "Get transaction volume for Ethereum over the past 7 days",
+    ],
+)
+
 
 def create_sentiment_agent_app(
     card_url: str | None = None, use_orchestrated: bool = True
@@ -163,63 +295,13 @@ def create_sentiment_agent_app(
         Configured A2AStarletteApplication instance
     """
     if card_url is None:
-        port = int(os.getenv("PORT", os.getenv("AGENTS_PORT", 8000)))
-        card_url = os.getenv("RENDER_EXTERNAL_URL", f"http://localhost:{port}/sentiment")
+        card_url = RENDER_EXTERNAL_URL or f"http://localhost:{AGENTS_PORT}/sentiment"
 
+    skill = _ORCHESTRATED_SKILL if use_orchestrated else _SIMPLE_SKILL
     if use_orchestrated:
-        skill = AgentSkill(
-            id="sentiment_trading_agent",
-            name="Combined Sentiment & Trading Analysis Agent",
-            description="Provides cryptocurrency sentiment analysis AND trading recommendations using Santiment API and technical analysis. Combines sentiment data (sentiment balance, social volume, social dominance) with price data and technical indicators (RSI, MACD, moving averages) to generate buy/sell/hold recommendations.",
-            tags=[
-                "sentiment",
-                "trading",
-                "crypto",
-                "social",
-                "analysis",
-                "santiment",
-                "price",
-                "volume",
-                "technical-analysis",
-                "trading-recommendations",
-            ],
-            examples=[
-                "Get sentiment balance for Bitcoin over the last week",
-                "Should I buy or sell Bitcoin? Analyze sentiment and price trends",
-                "What's the trading recommendation for Ethereum based on sentiment and technical analysis?",
-                "Get Bitcoin price analysis with sentiment data",
-                "Analyze Ethereum: sentiment, price trends, and trading recommendation",
-            ],
-        )
         agent_name = "Sentiment & Trading Agent"
         agent_description = "Combined agent that provides cryptocurrency sentiment analysis AND trading recommendations using Google ADK SequentialAgent orchestration"
     else:
-        skill = AgentSkill(
-            id="sentiment_agent",
-            name="Cryptocurrency Sentiment Analysis Agent",
-            description="Provides cryptocurrency sentiment analysis using Santiment API, including sentiment balance, social volume, social dominance, trending words, social shifts, price data (USD/BTC), trading volume, transaction volume, and active addresses",
-            tags=[
-                "sentiment",
-                "crypto",
-                "social",
-                "analysis",
-                "santiment",
-                "price",
-                "volume",
-                "on-chain",
-            ],
-            examples=[
-                "Get sentiment balance for Bitcoin over the last week",
-                "How many times has Ethereum been mentioned on social media in the past 5 days?",
-                "Tell me if there's been a big change in Bitcoin's social volume recently, with a 30% threshold",
-                "What are the top 3 trending words in crypto over the past 3 days?",
-                "How dominant is Ethereum in social media discussions this week?",
-                "Get Bitcoin price in USD for the last 7 days",
-                "What's Ethereum's trading volume in USD over the past week?",
-                "Show me Bitcoin's active addresses for the last 30 days",
-                "Get transaction volume for Ethereum over the past 7 days",
-            ],
-        )
         agent_name = "Sentiment Agent"
         agent_description = "Agent that provides cryptocurrency sentiment analysis, price data, volume metrics, and on-chain data using Santiment API (includes free metrics)"
 
@@ -244,7 +326,7 @@ def create_sentiment_agent_app(
 
     request_handler = DefaultRequestHandler(
         agent_executor=executor,
-        task_store=InMemoryTaskStore(),
+        task_store=BoundedTaskStore(),
     )
 
     server = A2AStarletteApplication(
@@ -256,6 +338,25 @@ def create_sentiment_agent_app(
     return SentimentAgentAppWithMiddleware(server)
 
 
+# Protected routes for the sentiment/trading agent
+# Note: Route keys should match the path when mounted (e.g., "/sentiment" when mounted at /sentiment)
+PAYWALL_ROUTES = {
+    # Protect all POST requests to the agent
+    "POST /": RouteConfig(
+        network="movement",
+        asset="0x1::aptos_coin::AptosCoin",
+        max_amount_required="100000000",  # 1 MOVE (8 decimals)
+        description="Sentiment & Trading Agent access - Pay to unlock sentiment analysis and trading recommendations",
+        mime_type="application/json",
+        max_timeout_seconds=600,
+    ),
+}
+PAYWALL_SKIP_PATHS = [
+    "/.well-known/agent.json",
+    "/.well-known/agent-card.json",
+]
+
+
 class SentimentAgentAppWithMiddleware:
     """Wrapper for A2AStarletteApplication with x402 payment middleware."""
 
@@ -266,42 +367,21 @@ class SentimentAgentAppWithMiddleware:
         """Build the Starlette app and apply x402 payment middleware."""
         app = self._a2a_app.build()
 
-        # Get payment configuration from environment - REQUIRED
-        movement_pay_to = os.getenv("MOVEMENT_PAY_TO") or os.getenv("NEXT_PUBLIC_MOVEMENT_PAY_TO")
-
         # MOVEMENT_PAY_TO is required - throw error if not configured
-        if not movement_pay_to:
+        if not MOVEMENT_PAY_TO:
             error_msg = (
                 "MOVEMENT_PAY_TO environment variable is required for sentiment/trading agent. "
                 "Please set MOVEMENT_PAY_TO to your payment recipient address."
             )
-            logger = logging.getLogger(__name__)
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Define protected routes for sentiment/trading agent
-        # Note: Route keys should match the path when mounted (e.g., "/sentiment" when mounted at /sentiment)
-        routes = {
-            # Protect all POST requests to the agent
-            "POST /": RouteConfig(
-                network="movement",
-                asset="0x1::aptos_coin::AptosCoin",
-                max_amount_required="100000000",  # 1 MOVE (8 decimals)
-                description="Sentiment & Trading Agent access - Pay to unlock sentiment analysis and trading recommendations",
-                mime_type="application/json",
-                max_timeout_seconds=600,
-            ),
-        }
-
         # Always add x402Paywall middleware to require payment
         app.add_middleware(
             X402PaywallMiddleware,
-            pay_to=movement_pay_to,
-            routes=routes,
-            skip_paths=[
-                "/.well-known/agent.json",
-                "/.well-known/agent-card.json",
-            ],
+            pay_to=MOVEMENT_PAY_TO,
+            routes=PAYWALL_ROUTES,
+            skip_paths=PAYWALL_SKIP_PATHS,
         )
 
         return app
@@ -3,21 +3,30 @@ Response validator for Sentiment Agent
 """
 
 import json
+import logging
 from typing import Any
 
+import orjson
+
 from .constants import ERROR_INVALID_JSON
 
+logger = logging.getLogger(__name__)
+
 
 def validate_json(response: str) -> None:
     """Validate that response is valid JSON."""
     try:
-        json.loads(response)
-    except json.JSONDecodeError as e:
+        orjson.loads(response)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"{ERROR_INVALID_JSON}: {str(e)}") from e
 
 
 def validate_and_serialize_response(response: Any) -> str:
-    """Validate and serialize response."""
+    """Validate and serialize response.
+
+    Strings are parsed once to check them; dicts are serialized here. Either
+    way the returned string is valid JSON and needs no further check.
+    """
     if isinstance(response, str):
         validate_json(response)
         return response
@@ -29,8 +38,11 @@ def validate_and_serialize_response(response: Any) -> str:
 
 def log_response_info(query: str, response: str) -> None:
     """Log response information."""
-    print(f"✅ Sentiment Agent response generated for query: {query[:50]}...")
-    print(f"   Response length: {len(response)} characters")
+    logger.debug(
+        "Sentiment Agent response generated for query: %.50s... (%d characters)",
+        query,
+        len(response),
+    )
 
 
 def build_error_response(metric: str, error: str) -> str:
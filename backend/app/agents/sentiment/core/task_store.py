@@ -0,0 +1,60 @@
+"""
+Bounded task store for the Sentiment Agent
+
+InMemoryTaskStore keeps every A2A task until the process restarts.
+BoundedTaskStore keeps tasks in save order and, on every save, drops tasks
+not updated for TASK_TTL_SECONDS and the oldest tasks beyond MAX_TASKS.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Task
+
+# Constants
+MAX_TASKS = 10_000
+TASK_TTL_SECONDS = 3600
+
+
+class BoundedTaskStore(InMemoryTaskStore):
+    """In-memory task store with a size limit and an idle TTL.
+
+    Args:
+        max_size: Maximum number of tasks kept
+        ttl: Seconds after its last save at which a task is dropped
+    """
+
+    def __init__(self, max_size: int = MAX_TASKS, ttl: float = TASK_TTL_SECONDS) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        # Least recently saved first
+        self.tasks: "OrderedDict[str, Task]" = OrderedDict()
+        self._saved_at: Dict[str, float] = {}
+
+    async def save(self, task: Task, context: Optional[ServerCallContext] = None) -> None:
+        """Save or update a task, then evict expired and excess tasks."""
+        async with self.lock:
+            now = time.monotonic()
+            self.tasks[task.id] = task
+            self.tasks.move_to_end(task.id)
+            self._saved_at[task.id] = now
+            self._evict(now)
+
+    async def delete(self, task_id: str, context: Optional[ServerCallContext] = None) -> None:
+        """Delete a task from the store."""
+        await super().delete(task_id, context)
+        self._saved_at.pop(task_id, None)
+
+    def _evict(self, now: float) -> None:
+        """Drop tasks from the oldest end while they are expired or over the limit."""
+        while self.tasks:
+            task_id = next(iter(self.tasks))
+            expired = now - self._saved_at[task_id] >= self.ttl
+            if not expired and len(self.tasks) <= self.max_size:
+                break
+            del self.tasks[task_id]
+            del self._saved_at[task_id]
@@ -5,6 +5,7 @@ Handles execution of sentiment agent requests through A2A Protocol.
 """
 
 import json
+import logging
 
 # A2A Protocol imports
 from a2a.server.agent_execution import AgentExecutor, RequestContext  # noqa: E402
@@ -23,10 +24,12 @@ from .services.executor_validator import (  # noqa: E402
     validate_response_content,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _get_session_id(context: RequestContext) -> str:
     """Extract session ID from context."""
-    return getattr(context, "context_id", DEFAULT_SESSION_ID)
+    return context.context_id or DEFAULT_SESSION_ID
 
 
 def _build_execution_error_response(error: Exception) -> str:
@@ -62,10 +65,7 @@ class SentimentExecutor(AgentExecutor):
             await event_queue.enqueue_event(new_agent_text_message(validated_content))
             print("✅ Successfully enqueued response")
         except Exception as e:
-            print(f"❌ Error in execute: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Error in execute")
             error_response = _build_execution_error_response(e)
             await event_queue.enqueue_event(new_agent_text_message(error_response))
 
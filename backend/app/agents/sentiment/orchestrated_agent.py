@@ -3,12 +3,22 @@ Combined Sentiment + Trading Agent using Google ADK SequentialAgent
 
 This agent orchestrates sentiment analysis and trading recommendations using:
 - SequentialAgent: Fetches data (sentiment + price), then performs trading analysis
+
+The executor fetches the data agent's metrics concurrently before the run
+(prefetch_metrics) and passes them in session state; DataFetcherAgent then
+answers with them instead of making a model call per tool.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.agents.sequential_agent import SequentialAgent
+from google.genai import types
 
 from .tools.santiment import (
     get_active_addresses,
@@ -19,8 +29,49 @@ from .tools.santiment import (
     get_trending_words,
     get_volume_usd,
 )
+from .services.query_parser import extract_asset
 from .trading_tools.technical_analysis import calculate_technical_indicators
 
+PREFETCHED_METRICS_STATE_KEY = "prefetched_metrics"
+SENTIMENT_DAYS = 7
+PRICE_DAYS = 30
+
+
+async def prefetch_metrics(query: str) -> Dict[str, Any]:
+    """Fetch the data agent's metrics for the query's asset concurrently."""
+    asset = extract_asset(query)
+    sentiment, social_volume, social_dominance, price, volume = await asyncio.gather(
+        asyncio.to_thread(get_sentiment_balance, asset, SENTIMENT_DAYS),
+        asyncio.to_thread(get_social_volume, asset, SENTIMENT_DAYS),
+        asyncio.to_thread(get_social_dominance, asset, SENTIMENT_DAYS),
+        asyncio.to_thread(get_price_usd, asset, PRICE_DAYS),
+        asyncio.to_thread(get_volume_usd, asset, PRICE_DAYS),
+    )
+    return {
+        "asset": asset,
+        "sentiment_data": {
+            "sentiment_balance": sentiment,
+            "social_volume": social_volume,
+            "social_dominance": social_dominance,
+        },
+        "price_data": {"price_usd": price, "volume_usd": volume},
+        "success": True,
+    }
+
+
+def use_prefetched_metrics(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Before-agent callback: reply with prefetched metrics instead of calling tools.
+
+    Returns:
+        The metrics summary as the agent's reply, or None to run the agent
+    """
+    metrics = callback_context.state.get(PREFETCHED_METRICS_STATE_KEY)
+    if not metrics:
+        return None
+    print("⚡ DataFetcherAgent answered from prefetched metrics")
+    return types.Content(role="model", parts=[types.Part(text=json.dumps(metrics))])
+
+
 # Data Fetcher Agent: Fetches both sentiment and price data
 # Tools can execute in parallel when called together
 data_fetcher_agent = LlmAgent(
@@ -80,6 +131,7 @@ data_fetcher_agent = LlmAgent(
         get_price_usd,
         get_volume_usd,
     ],
+    before_agent_callback=use_prefetched_metrics,
 )
 
 # Trading Analysis Agent
@@ -4,33 +4,63 @@ Orchestrated Executor for Combined Sentiment + Trading Agent
 Uses Google ADK Runner to execute SequentialAgent with sentiment and trading analysis.
 """
 
+import asyncio
 import json
+import logging
 
+import orjson
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Message, TaskState
 from a2a.utils import new_agent_text_message
 from google.adk.runners import InMemoryRunner
 from google.adk.runners import types
 
 from .core.constants import DEFAULT_SESSION_ID, ERROR_CANCEL_NOT_SUPPORTED, ERROR_EXECUTION_ERROR
-from .orchestrated_agent import root_agent
+from .orchestrated_agent import PREFETCHED_METRICS_STATE_KEY, prefetch_metrics, root_agent
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "agents"
+USER_ID = "user"
+
+# Returned for trading queries when the agent produced no text
+_NO_RESPONSE_ERROR = orjson.dumps(
+    {
+        "type": "sentiment_trading",
+        "error": "No response generated from agent. Please try again.",
+        "success": False,
+    }
+).decode()
+
+# Same output as orjson.dumps of {"type", "success", "error"}, with the error filled in
+_EXECUTION_ERROR_TEMPLATE = '{{"type":"sentiment_trading","success":false,"error":{}}}'
 
 
 def _get_session_id(context: RequestContext) -> str:
     """Extract session ID from context."""
-    return getattr(context, "context_id", DEFAULT_SESSION_ID)
+    return context.context_id or DEFAULT_SESSION_ID
+
+
+def _build_task_message(context: RequestContext, text: str) -> Message:
+    """Build an agent message bound to the request's task.
+
+    Each stage's output is sent as an interim working status so streaming
+    clients see the pipeline as it finishes; the final answer completes the
+    task, so it never stays in the working state.
+    """
+    return new_agent_text_message(text, context.context_id, context.task_id)
 
 
 def _build_execution_error_response(error: Exception) -> str:
-    """Build response for execution error."""
-    return json.dumps(
-        {
-            "type": "sentiment_trading",
-            "success": False,
-            "error": f"{ERROR_EXECUTION_ERROR}: {str(error)}",
-        },
-        indent=2,
-    )
+    """Build response for execution error.
+
+    Only the error message needs JSON escaping; the rest of the payload is a
+    fixed template.
+    """
+    message = orjson.dumps(f"{ERROR_EXECUTION_ERROR}: {error}").decode()
+    return _EXECUTION_ERROR_TEMPLATE.format(message)
 
 
 class OrchestratedSentimentExecutor(AgentExecutor):
@@ -38,6 +68,26 @@ class OrchestratedSentimentExecutor(AgentExecutor):
 
     def __init__(self):
         self.agent = root_agent
+        # One runner (and in-memory session service) shared by every request
+        self._runner = InMemoryRunner(agent=self.agent, app_name=APP_NAME)
+
+    async def _create_run_session(self) -> str:
+        """Create a session for a single run and return its generated ID.
+
+        Every run gets its own session and deletes it afterwards, so the shared
+        session service does not grow with each context_id and concurrent
+        requests never share history.
+        """
+        session = await self._runner.session_service.create_session(
+            app_name=APP_NAME, user_id=USER_ID
+        )
+        return session.id
+
+    async def _delete_run_session(self, run_session_id: str) -> None:
+        """Drop a run's session and its event history."""
+        await self._runner.session_service.delete_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=run_session_id
+        )
 
     async def execute(
         self,
@@ -48,29 +98,22 @@ class OrchestratedSentimentExecutor(AgentExecutor):
         query = context.get_user_input()
         session_id = _get_session_id(context)
 
-        print(f"🔍 Orchestrated Sentiment+Trading Agent received query: {query}")
-        print(f"   Session ID: {session_id}")
+        logger.debug(
+            "Orchestrated Sentiment+Trading Agent received query: %s (session %s)",
+            query,
+            session_id,
+        )
+
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        run_session_id = None
 
         try:
-            # Use Runner to properly execute SequentialAgent
-            app_name = "agents"
-            runner = InMemoryRunner(
-                agent=self.agent,
-                app_name=app_name,
-            )
-
-            # Create or get the session
-            session = await runner.session_service.get_session(
-                app_name=app_name,
-                user_id="user",
-                session_id=session_id,
-            )
-            if not session:
-                session = await runner.session_service.create_session(
-                    app_name=app_name,
-                    user_id="user",
-                    session_id=session_id,
-                )
+            # Fetch the independent metrics concurrently while the session is
+            # set up
+            prefetch = asyncio.create_task(prefetch_metrics(query))
+
+            runner = self._runner
+            run_session_id = await self._create_run_session()
 
             # Run the sequential agent with the query
             # Construct message using UserContent with Part
@@ -81,136 +124,66 @@ class OrchestratedSentimentExecutor(AgentExecutor):
             final_response = None
             all_responses = []  # Collect all responses to get the last one
 
+            try:
+                state_delta = {PREFETCHED_METRICS_STATE_KEY: await prefetch}
+            except Exception as e:
+                logger.warning(
+                    "Metric prefetch failed, DataFetcherAgent will call its tools: %s", e
+                )
+                state_delta = {PREFETCHED_METRICS_STATE_KEY: None}
+
             event_count = 0
             async for event in runner.run_async(
-                user_id="user",
-                session_id=session_id,
+                user_id=USER_ID,
+                session_id=run_session_id,
                 new_message=new_message,
+                state_delta=state_delta,
             ):
                 event_count += 1
-                # Debug: print event type and details
-                event_type = type(event).__name__
-                print(f"📨 Event #{event_count}: {event_type}")
+                logger.debug("Event #%d: %s", event_count, type(event).__name__)
 
                 # Try to extract text from event - collect ALL responses
                 event_text = None
                 if hasattr(event, "content"):
                     content = event.content
-                    print(f"   🔍 Event has content attribute: {type(content).__name__}")
                     if isinstance(content, str) and content.strip():
                         event_text = content
-                        print(f"   ✅ Content is string (length: {len(content)})")
                     elif hasattr(content, "text") and content.text:
                         event_text = content.text
-                        print(f"   ✅ Content has text attribute (length: {len(content.text)})")
                     elif hasattr(content, "parts"):
                         # Extract text from parts
-                        print(f"   🔍 Content has parts: {len(content.parts) if hasattr(content.parts, '__len__') else 'unknown'}")
                         text_parts = []
-                        for i, part in enumerate(content.parts):
+                        for part in content.parts:
                             if hasattr(part, "text") and part.text:
                                 text_parts.append(part.text)
-                                print(f"      Part {i}: text (length: {len(part.text)})")
-                            else:
-                                print(f"      Part {i}: {type(part).__name__} (no text)")
                         if text_parts:
                             event_text = "\n".join(text_parts)
-                            print(f"   ✅ Combined {len(text_parts)} text parts (total length: {len(event_text)})")
 
                 # Also check for text attribute directly on event
                 if not event_text and hasattr(event, "text") and event.text:
                     event_text = event.text
-                    print(f"   ✅ Event has direct text attribute (length: {len(event_text)})")
 
-                # Store this response (we'll use the last one)
+                # Forward this response right away and keep it (we'll use the last one)
                 if event_text and event_text.strip():
+                    await updater.update_status(
+                        TaskState.working, _build_task_message(context, event_text)
+                    )
                     all_responses.append(event_text)
-                    preview = event_text[:300].replace("\n", "\\n")
-                    print(f"   📝 Captured response #{len(all_responses)} (length: {len(event_text)}): {preview}...")
-                else:
-                    print(f"   ⚠️  No text extracted from event #{event_count}")
+                    logger.debug(
+                        "Captured response #%d (length: %d)", len(all_responses), len(event_text)
+                    )
 
             # Use the LAST response (from trading analysis agent)
             if all_responses:
                 final_response = all_responses[-1]
-                print(f"✅ Using final response (response {len(all_responses)} of {len(all_responses)})")
-                print(f"   📊 Final response length: {len(final_response)}")
-                print(f"   📄 Final response preview: {final_response[:500]}...")
-                if len(all_responses) > 1:
-                    print(f"   📋 All responses: {[len(r) for r in all_responses]}")
-
-            # Get the session to check messages for agent response
-            session = await runner.session_service.get_session(
-                app_name=app_name,
-                user_id="user",
-                session_id=session_id,
-            )
-
-            # If no response from events, or if we got intermediate responses, try to get from session messages
-            # Session messages should have the final response from the trading analysis agent
-            if session:
-                # Try different ways to access messages
-                messages = None
-                if hasattr(session, "messages"):
-                    messages = session.messages
-                elif hasattr(session, "state") and isinstance(session.state, dict):
-                    messages = session.state.get("messages", [])
-
-                if messages:
-                    print(f"📋 Found {len(messages)} messages in session")
-                    # Find ALL assistant messages and use the LAST one (from trading analysis agent)
-                    assistant_messages = []
-                    for message in messages:
-                        # Check different message formats
-                        role = None
-                        if hasattr(message, "role"):
-                            role = message.role
-                        elif isinstance(message, dict):
-                            role = message.get("role")
-
-                        if role == "assistant" or role == "model":
-                            # Extract content from message
-                            content = None
-                            if hasattr(message, "content"):
-                                content = message.content
-                            elif isinstance(message, dict):
-                                content = message.get("content")
-
-                            if content:
-                                message_text = None
-                                if isinstance(content, str):
-                                    message_text = content
-                                elif hasattr(content, "text"):
-                                    message_text = content.text
-                                elif hasattr(content, "parts"):
-                                    text_parts = []
-                                    for part in content.parts:
-                                        if hasattr(part, "text") and part.text:
-                                            text_parts.append(part.text)
-                                    if text_parts:
-                                        message_text = "\n".join(text_parts)
-                                elif isinstance(content, list):
-                                    # Content might be a list of parts
-                                    text_parts = []
-                                    for part in content:
-                                        if isinstance(part, str):
-                                            text_parts.append(part)
-                                        elif hasattr(part, "text") and part.text:
-                                            text_parts.append(part.text)
-                                    if text_parts:
-                                        message_text = "\n".join(text_parts)
-
-                                if message_text and message_text.strip():
-                                    assistant_messages.append(message_text)
-
-                    # Use the LAST assistant message (from trading analysis agent)
-                    if assistant_messages:
-                        final_response = assistant_messages[-1]
-                        print(f"✅ Using final session message (message {len(assistant_messages)} of {len(assistant_messages)})")
-                        if len(assistant_messages) > 1:
-                            print(f"   (Skipped {len(assistant_messages) - 1} intermediate messages)")
-
-            # If still no response, check if it's a simple sentiment query
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Using the last of %d responses (lengths: %s)",
+                        len(all_responses),
+                        [len(r) for r in all_responses],
+                    )
+
+            # If no response, check if it's a simple sentiment query
             # and fall back to simple sentiment agent
             if not final_response:
                 query_lower = query.lower()
@@ -230,27 +203,17 @@ class OrchestratedSentimentExecutor(AgentExecutor):
 
                 if not is_trading_query:
                     # For sentiment-only queries, use simple sentiment agent
-                    print("📊 Detected sentiment-only query, using simple sentiment agent")
+                    logger.debug("Detected sentiment-only query, using simple sentiment agent")
                     from .agent import SentimentAgent
 
                     simple_agent = SentimentAgent()
                     final_response = await simple_agent.invoke(query, session_id)
                 else:
                     # For trading queries, return error if no response
-                    final_response = json.dumps(
-                        {
-                            "type": "sentiment_trading",
-                            "error": "No response generated from agent. Please try again.",
-                            "success": False,
-                        },
-                        indent=2,
-                    )
+                    final_response = _NO_RESPONSE_ERROR
 
             # Validate and send response
             if final_response:
-                print(f"\n🔧 Processing final response for output...")
-                print(f"   📏 Original response length: {len(final_response)}")
-                
                 # Try to extract JSON from response if it's embedded in text
                 # The trading analysis agent might output text with JSON embedded
                 json_match = None
@@ -261,15 +224,13 @@ class OrchestratedSentimentExecutor(AgentExecutor):
                 json_code_block_pattern = r"```json\s*(\{.*?\})\s*```"
                 json_code_blocks = re.findall(json_code_block_pattern, final_response, re.DOTALL)
                 if json_code_blocks:
-                    print(f"   🔍 Found {len(json_code_blocks)} JSON code blocks")
                     for i, block in enumerate(json_code_blocks):
                         try:
-                            parsed = json.loads(block)
+                            json.loads(block)
                             json_match = block
-                            print(f"   ✅ Extracted valid JSON from code block #{i+1} (length: {len(block)})")
                             break
                         except json.JSONDecodeError as e:
-                            print(f"   ⚠️  Code block #{i+1} is not valid JSON: {e}")
+                            logger.debug("Code block #%d is not valid JSON: %s", i + 1, e)
 
                 # If no code block JSON, try to find JSON objects directly
                 if not json_match:
@@ -277,43 +238,31 @@ class OrchestratedSentimentExecutor(AgentExecutor):
                     json_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
                     json_matches = re.findall(json_pattern, final_response, re.DOTALL)
                     if json_matches:
-                        print(f"   🔍 Found {len(json_matches)} potential JSON objects")
                         # Try to parse the last (likely most complete) JSON match
-                        for i, match in enumerate(reversed(json_matches)):
+                        for match in reversed(json_matches):
                             try:
-                                parsed = json.loads(match)
+                                json.loads(match)
                                 json_match = match
-                                print(f"   ✅ Extracted valid JSON object #{len(json_matches)-i} (length: {len(match)})")
-                                print(f"   📋 JSON keys: {list(parsed.keys()) if isinstance(parsed, dict) else 'N/A'}")
                                 break
                             except json.JSONDecodeError as e:
-                                print(f"   ⚠️  JSON match #{len(json_matches)-i} is not valid: {str(e)[:100]}")
+                                logger.debug("JSON match is not valid: %s", e)
 
                 # Use extracted JSON if found, otherwise use full response
                 response_to_send = json_match if json_match else final_response
-                print(f"   📤 Response to send length: {len(response_to_send)}")
-                if json_match:
-                    print(f"   ✅ Using extracted JSON (saved {len(final_response) - len(json_match)} chars)")
-                else:
-                    print(f"   ⚠️  No JSON extracted, using full response")
 
                 # Try to parse as JSON, if not, wrap it
                 try:
-                    parsed_response = json.loads(response_to_send)
+                    json.loads(response_to_send)
                     # If it's already valid JSON, use it as-is
                     final_response = response_to_send
-                    print(f"   ✅ Response is valid JSON")
-                    if isinstance(parsed_response, dict):
-                        print(f"   📊 JSON structure: {list(parsed_response.keys())}")
                 except (json.JSONDecodeError, TypeError) as e:
-                    print(f"   ⚠️  Response is not valid JSON: {str(e)[:200]}")
+                    logger.debug("Response is not valid JSON, wrapping it: %s", e)
                     # Check if response looks like it should be JSON but isn't
                     # (e.g., contains "recommendation", "confidence", etc.)
                     if any(
                         keyword in final_response.lower()
                         for keyword in ["recommendation", "confidence", "buy", "sell", "hold"]
                     ):
-                        print(f"   🔍 Response contains trading keywords, wrapping in JSON structure")
                         # Try to construct a proper response from the text
                         # Extract key information if possible
                         recommendation = None
@@ -331,7 +280,6 @@ class OrchestratedSentimentExecutor(AgentExecutor):
                             },
                             indent=2,
                         )
-                        print(f"   ✅ Wrapped response in trading_recommendation JSON")
                     else:
                         # Wrap text response in JSON
                         final_response = json.dumps(
@@ -342,25 +290,22 @@ class OrchestratedSentimentExecutor(AgentExecutor):
                             },
                             indent=2,
                         )
-                        print(f"   ✅ Wrapped response in sentiment_trading JSON")
 
-                await event_queue.enqueue_event(new_agent_text_message(final_response))
-                print(f"\n✅ Successfully enqueued orchestrated response")
-                print(f"   📏 Final output length: {len(final_response)}")
-                print(f"   📄 Final output preview: {final_response[:300]}...\n")
+                await updater.complete(_build_task_message(context, final_response))
+                logger.debug("Enqueued orchestrated response (length: %d)", len(final_response))
             else:
                 error_response = _build_execution_error_response(
                     Exception("No response generated from agent")
                 )
-                await event_queue.enqueue_event(new_agent_text_message(error_response))
+                await updater.failed(_build_task_message(context, error_response))
 
         except Exception as e:
-            print(f"❌ Error in orchestrated execute: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Error in orchestrated execute")
             error_response = _build_execution_error_response(e)
-            await event_queue.enqueue_event(new_agent_text_message(error_response))
+            await updater.failed(_build_task_message(context, error_response))
+        finally:
+            if run_session_id is not None:
+                await self._delete_run_session(run_session_id)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         """Cancel execution (not supported)."""
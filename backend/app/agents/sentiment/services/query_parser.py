@@ -7,47 +7,40 @@ import re
 
 from ..core.constants import DEFAULT_ASSET, DEFAULT_DAYS, DEFAULT_THRESHOLD, DEFAULT_TOP_N
 
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Common cryptocurrency mappings, in match priority order
+CRYPTO_ASSETS = {
+    "bitcoin": "bitcoin",
+    "btc": "bitcoin",
+    "ethereum": "ethereum",
+    "eth": "ethereum",
+    "hedera": "hedera",
+    "hbar": "hedera",
+    "polygon": "polygon",
+    "matic": "polygon",
+    "usdc": "usd-coin",
+    "usdt": "tether",
+    "dai": "dai",
+    "wbtc": "wrapped-bitcoin",
+}
+
+
+def query_tokens(query: str) -> frozenset[str]:
+    """Split a query into its set of lowercase words."""
+    return frozenset(WORD_PATTERN.findall(query.lower()))
 
-def extract_asset(query: str) -> str:
-    """Extract cryptocurrency asset from query."""
-    query_lower = query.lower()
 
-    # Common cryptocurrency mappings
-    crypto_map = {
-        "bitcoin": "bitcoin",
-        "btc": "bitcoin",
-        "ethereum": "ethereum",
-        "eth": "ethereum",
-        "hedera": "hedera",
-        "hbar": "hedera",
-        "polygon": "polygon",
-        "matic": "polygon",
-        "usdc": "usd-coin",
-        "usdt": "tether",
-        "dai": "dai",
-        "wbtc": "wrapped-bitcoin",
-    }
-
-    # Check for explicit mentions
-    for key, value in crypto_map.items():
-        if key in query_lower:
+def extract_asset(query: str) -> str:
+    """Extract cryptocurrency asset from query.
+
+    Matches whole words, so "wbtc" is not read as "btc" and "whether" is not
+    read as "eth". The first asset in CRYPTO_ASSETS order wins.
+    """
+    tokens = query_tokens(query)
+    for key, value in CRYPTO_ASSETS.items():
+        if key in tokens:
             return value
-
-    # Try to extract from patterns like "for bitcoin", "for BTC", etc.
-    patterns = [
-        r"for\s+(\w+)",
-        r"(\w+)\s+sentiment",
-        r"(\w+)\s+social",
-        r"(\w+)\s+dominance",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            asset = match.group(1).lower()
-            if asset in crypto_map:
-                return crypto_map[asset]
-
     return DEFAULT_ASSET
 
 
@@ -1,21 +1,42 @@
 """
 Santiment API integration for sentiment analysis
+
+Raw Santiment responses are cached in process per (metric, asset, days) for
+a time bucket of the metric's TTL, so identical queries from different users
+within the window share one API call.
 """
 
 import os
 import re
+import time
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 
 import requests
-from dotenv import load_dotenv
+from app.env import load_env
 
-load_dotenv()
+load_env()
 
 SANTIMENT_API_KEY = os.getenv("SANTIMENT_API_KEY")
 SANTIMENT_API_URL = "https://api.santiment.net/graphql"
 HEADERS = {"Authorization": f"Apikey {SANTIMENT_API_KEY}"} if SANTIMENT_API_KEY else {}
 
+# Response cache TTLs per metric, in seconds
+SANTIMENT_CACHE_MAX_ENTRIES = 512
+SANTIMENT_CACHE_TTL_SECONDS = {
+    "price_usd": 60,
+    "price_btc": 60,
+    "trending_words": 120,
+}
+DEFAULT_SANTIMENT_CACHE_TTL_SECONDS = 120
+
+
+def _ttl_bucket(name: str) -> int:
+    """Return the current time bucket for a metric; the cache key changes every TTL."""
+    ttl = SANTIMENT_CACHE_TTL_SECONDS.get(name, DEFAULT_SANTIMENT_CACHE_TTL_SECONDS)
+    return int(time.time() // ttl)
+
 
 def parse_allowed_date_range(error_message: str) -> tuple[datetime, datetime] | None:
     """Parse allowed date range from Santiment API error message."""
@@ -93,6 +114,26 @@ def adjust_date_range(
 
 def fetch_santiment_data(
     metric: str, asset: str, days: int, retry_with_adjusted_dates: bool = True
+) -> dict[str, Any]:
+    """Fetch data from Santiment API for a given metric, cached for the metric's TTL.
+
+    The returned dict is shared with other callers and must not be modified.
+    """
+    return _cached_santiment_data(
+        metric, asset, days, retry_with_adjusted_dates, _ttl_bucket(metric)
+    )
+
+
+@lru_cache(maxsize=SANTIMENT_CACHE_MAX_ENTRIES)
+def _cached_santiment_data(
+    metric: str, asset: str, days: int, retry_with_adjusted_dates: bool, bucket: int
+) -> dict[str, Any]:
+    # Errors raise and are therefore never cached
+    return _request_santiment_data(metric, asset, days, retry_with_adjusted_dates)
+
+
+def _request_santiment_data(
+    metric: str, asset: str, days: int, retry_with_adjusted_dates: bool = True
 ) -> dict[str, Any]:
     """Fetch data from Santiment API for a given metric."""
     if not SANTIMENT_API_KEY:
@@ -177,6 +218,23 @@ def fetch_santiment_data(
 
 
 def fetch_trending_words(days: int = 7, retry_with_adjusted_dates: bool = True) -> dict[str, Any]:
+    """Fetch trending words from Santiment API, cached for the trending words TTL.
+
+    The returned dict is shared with other callers and must not be modified.
+    """
+    return _cached_trending_words(days, retry_with_adjusted_dates, _ttl_bucket("trending_words"))
+
+
+@lru_cache(maxsize=SANTIMENT_CACHE_MAX_ENTRIES)
+def _cached_trending_words(
+    days: int, retry_with_adjusted_dates: bool, bucket: int
+) -> dict[str, Any]:
+    return _request_trending_words(days, retry_with_adjusted_dates)
+
+
+def _request_trending_words(
+    days: int = 7, retry_with_adjusted_dates: bool = True
+) -> dict[str, Any]:
     """Fetch trending words from Santiment API."""
     if not SANTIMENT_API_KEY:
         raise ValueError("SANTIMENT_API_KEY not found in environment variables")
@@ -76,10 +76,10 @@ import uuid
 import json
 from typing import Any, List
 
-from dotenv import load_dotenv
+from app.env import load_env
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.apps import A2AStarletteApplication
@@ -0,0 +1,95 @@
+"""
+Environment Loading
+
+Agent and service modules need .env values before they read their
+configuration. Calling load_dotenv() in each of them located and parsed the
+file once per imported module; load_env() does it once per process and is a
+no-op afterwards.
+
+get_settings() resolves the deployment-dependent URLs from that environment
+once per process as well.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENTS_PORT = 8000
+DEFAULT_MOVEMENT_RPC_URL = "https://mainnet.movementnetwork.xyz/v1"
+# Frontend facilitator API (Next.js dev server on port 3000)
+LOCAL_FACILITATOR_URL = "http://localhost:3000/api/facilitator"
+DOCKER_FACILITATOR_URL = "http://host.docker.internal:3000/api/facilitator"
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load variables from the nearest .env file into os.environ (once per process)."""
+    load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Deployment settings resolved from the environment.
+
+    Attributes:
+        base_url: Public base URL used in agent card URLs
+        facilitator_url: x402 facilitator API base URL
+        rpc_url: Movement Network RPC URL
+        in_docker: Whether the process runs inside a Docker container
+    """
+
+    base_url: str
+    facilitator_url: str
+    rpc_url: str
+    in_docker: bool
+
+
+def _resolve_base_url() -> str:
+    """Railway (RAILWAY_PUBLIC_DOMAIN), then Render (RENDER_EXTERNAL_URL), then localhost."""
+    railway_url = os.getenv("RAILWAY_PUBLIC_DOMAIN")
+    if railway_url:
+        # Railway URLs are typically just the domain, add https:// if not present
+        return railway_url if railway_url.startswith("http") else f"https://{railway_url}"
+
+    render_url = os.getenv("RENDER_EXTERNAL_URL")
+    if render_url:
+        return render_url
+
+    port = int(os.getenv("AGENTS_PORT", str(DEFAULT_AGENTS_PORT)))
+    return f"http://localhost:{port}"
+
+
+def _resolve_facilitator_url(in_docker: bool) -> str:
+    """FACILITATOR_URL, then FRONTEND_URL's facilitator API, then the local frontend."""
+    if os.getenv("FACILITATOR_URL"):
+        return os.getenv("FACILITATOR_URL")
+    if os.getenv("FRONTEND_URL"):
+        return f"{os.getenv('FRONTEND_URL')}/api/facilitator"
+    # In Docker, host.docker.internal reaches the host machine (Mac/Windows)
+    return DOCKER_FACILITATOR_URL if in_docker else LOCAL_FACILITATOR_URL
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Resolve the deployment settings (once per process).
+
+    Returns:
+        Settings computed from the environment after load_env()
+    """
+    load_env()
+    in_docker = os.path.exists("/.dockerenv")
+    settings = Settings(
+        base_url=_resolve_base_url(),
+        facilitator_url=_resolve_facilitator_url(in_docker),
+        rpc_url=os.getenv("MOVEMENT_RPC_URL", DEFAULT_MOVEMENT_RPC_URL),
+        in_docker=in_docker,
+    )
+    logger.info(
+        "Using base URL %s, facilitator URL %s", settings.base_url, settings.facilitator_url
+    )
+    return settings
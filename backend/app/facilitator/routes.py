@@ -2,14 +2,27 @@
 Facilitator API Routes for x402 Payment Protocol
 
 These routes implement the facilitator endpoints for verifying and settling payments.
+
+A payment is usually verified more than once within seconds (the client
+checks it before sending it, the paywall checks it again). Successful
+verifications are kept for VERIFY_CACHE_TTL_SECONDS, keyed by a hash of the
+signed transaction, its signature and the payment requirements, so a repeat
+skips the base64 decode, BCS deserialization and RPC simulation. Failed
+verifications are not cached, since they can be caused by a transient RPC
+error. An expired transaction served from the cache is still rejected on
+chain at settlement.
 """
 
 import base64
-import json
-from typing import Any, Dict
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
 from app.facilitator.service import FacilitatorService
 
@@ -18,12 +31,58 @@ router = APIRouter(prefix="/facilitator", tags=["facilitator"])
 # Initialize facilitator service
 facilitator_service = FacilitatorService()
 
-
-@router.post("/verify")
-async def verify_payment(request: Request) -> JSONResponse:
-    """Verify a payment transaction.
-
-    Request body:
+# Constants
+VERIFY_CACHE_MAX_ENTRIES = 1024
+VERIFY_CACHE_TTL_SECONDS = 120
+
+# payment key -> (expiry time, verification result); only valid results are stored
+_VERIFY_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _verify_cache_key(
+    payment_payload: Dict[str, Any], payment_requirements: Dict[str, Any]
+) -> Optional[str]:
+    """Return the verification cache key for a payment, or None without a transaction."""
+    transaction = payment_payload.get("transaction") or payment_payload.get("transactionBcsBase64")
+    if not transaction:
+        return None
+    signature = payment_payload.get("signature") or payment_payload.get("signatureBcsBase64")
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(transaction).encode())
+    digest.update(b"\0")
+    digest.update(str(signature or "").encode())
+    digest.update(b"\0")
+    digest.update(orjson.dumps(payment_requirements, default=str, option=orjson.OPT_SORT_KEYS))
+    return digest.hexdigest()
+
+
+def _get_cached_verification(key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached verification result that has not expired."""
+    entry = _VERIFY_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at <= time.monotonic():
+        del _VERIFY_CACHE[key]
+        return None
+    _VERIFY_CACHE.move_to_end(key)
+    return result
+
+
+def _cache_verification(key: str, result: Dict[str, Any]) -> None:
+    """Store a successful verification result, evicting the oldest entries."""
+    if not result.get("isValid"):
+        return
+    _VERIFY_CACHE[key] = (time.monotonic() + VERIFY_CACHE_TTL_SECONDS, result)
+    _VERIFY_CACHE.move_to_end(key)
+    while len(_VERIFY_CACHE) > VERIFY_CACHE_MAX_ENTRIES:
+        _VERIFY_CACHE.popitem(last=False)
+
+
+class PaymentRequest(BaseModel):
+    """Request body shared by /verify and /settle.
+
+    Example:
         {
             "x402Version": 1,
             "paymentPayload": {
@@ -38,6 +97,21 @@ async def verify_payment(request: Request) -> JSONResponse:
             }
         }
 
+    Missing or empty paymentPayload/paymentRequirements are rejected with 422.
+    """
+
+    x402Version: int = 1
+    paymentPayload: Dict[str, Any] = Field(min_length=1)
+    paymentRequirements: Dict[str, Any] = Field(min_length=1)
+
+
+@router.post("/verify")
+async def verify_payment(payment: PaymentRequest) -> ORJSONResponse:
+    """Verify a payment transaction.
+
+    Args:
+        payment: Payment payload and requirements (see PaymentRequest)
+
     Returns:
         {
             "isValid": true/false,
@@ -46,27 +120,27 @@ async def verify_payment(request: Request) -> JSONResponse:
         }
     """
     try:
-        body = await request.json()
-
-        x402_version = body.get("x402Version", 1)
-        payment_payload = body.get("paymentPayload", {})
-        payment_requirements = body.get("paymentRequirements", {})
+        x402_version = payment.x402Version
+        payment_payload = payment.paymentPayload
+        payment_requirements = payment.paymentRequirements
 
-        if not payment_payload:
-            raise HTTPException(status_code=400, detail="paymentPayload is required")
-        if not payment_requirements:
-            raise HTTPException(status_code=400, detail="paymentRequirements is required")
+        # Reuse a recent successful verification of the same payment
+        cache_key = _verify_cache_key(payment_payload, payment_requirements)
+        if cache_key:
+            cached = _get_cached_verification(cache_key)
+            if cached is not None:
+                return ORJSONResponse(content=cached)
 
         # Verify payment
-        result = facilitator_service.verify_payment(
+        result = await facilitator_service.verify_payment(
             x402_version, payment_payload, payment_requirements
         )
+        if cache_key:
+            _cache_verification(cache_key, result)
 
-        return JSONResponse(content=result)
-    except HTTPException:
-        raise
+        return ORJSONResponse(content=result)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "isValid": False,
                 "invalidReason": f"Verification error: {str(e)}",
@@ -76,23 +150,11 @@ async def verify_payment(request: Request) -> JSONResponse:
 
 
 @router.post("/settle")
-async def settle_payment(request: Request) -> JSONResponse:
+async def settle_payment(payment: PaymentRequest) -> ORJSONResponse:
     """Settle a payment transaction (submit to network).
 
-    Request body:
-        {
-            "x402Version": 1,
-            "paymentPayload": {
-                "transaction": "base64...",
-                "signature": "base64..."
-            },
-            "paymentRequirements": {
-                "payTo": "0x...",
-                "maxAmountRequired": "100000000",
-                "network": "movement",
-                "asset": "0x1::aptos_coin::AptosCoin"
-            }
-        }
+    Args:
+        payment: Payment payload and requirements (see PaymentRequest)
 
     Returns:
         {
@@ -103,28 +165,19 @@ async def settle_payment(request: Request) -> JSONResponse:
         }
     """
     try:
-        body = await request.json()
-
-        x402_version = body.get("x402Version", 1)
-        payment_payload = body.get("paymentPayload", {})
-        payment_requirements = body.get("paymentRequirements", {})
-
-        if not payment_payload:
-            raise HTTPException(status_code=400, detail="paymentPayload is required")
-        if not payment_requirements:
-            raise HTTPException(status_code=400, detail="paymentRequirements is required")
+        x402_version = payment.x402Version
+        payment_payload = payment.paymentPayload
+        payment_requirements = payment.paymentRequirements
 
         # Settle payment
-        result = facilitator_service.settle_payment(
+        result = await facilitator_service.settle_payment(
             x402_version, payment_payload, payment_requirements
         )
 
         status_code = 200 if result.get("success") else 400
-        return JSONResponse(content=result, status_code=status_code)
-    except HTTPException:
-        raise
+        return ORJSONResponse(content=result, status_code=status_code)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "success": False,
                 "error": f"Settlement error: {str(e)}",
@@ -134,7 +187,7 @@ async def settle_payment(request: Request) -> JSONResponse:
 
 
 @router.post("/supported")
-async def get_supported() -> JSONResponse:
+async def get_supported() -> ORJSONResponse:
     """Get supported networks and schemes.
 
     Returns:
@@ -145,9 +198,9 @@ async def get_supported() -> JSONResponse:
     """
     try:
         supported = facilitator_service.get_supported_networks()
-        return JSONResponse(content=supported)
+        return ORJSONResponse(content=supported)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "networks": ["movement"],
                 "schemes": ["exact"],
@@ -3,15 +3,31 @@ Facilitator Service for x402 Payment Protocol
 
 This service verifies and settles payment transactions on Movement Network.
 It implements the x402 facilitator protocol for Aptos-like/Movement payments.
+
+RPC simulation and remote settlement go through one pooled httpx.AsyncClient
+(keep-alive, HTTP/2 when the optional h2 package is installed), so a slow RPC
+no longer blocks the event loop. The client is created lazily on first use and
+closed from the application lifespan.
 """
 
-import base64
+import importlib.util
+import inspect
 import json
-import os
-from typing import Any, Dict, Optional
+import logging
+import struct
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, TypedDict
 
-import requests
-from dotenv import load_dotenv
+import httpx
+import orjson
+from app.env import get_settings, load_env
+
+# pybase64 decodes with SIMD kernels; the stdlib decoder has the same signature
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
 
 # Try to import Aptos SDK, fallback to basic implementation if not available
 try:
@@ -22,17 +38,252 @@ try:
         Ed25519Authenticator,
     )
     APTOS_SDK_AVAILABLE = True
+    # SDK versions name the expiration field differently; resolve it once
+    _RAW_TRANSACTION_FIELDS = inspect.signature(RawTransaction.__init__).parameters
+    EXPIRATION_ATTR = next(
+        (
+            name
+            for name in ("expiration_timestamps_secs", "expiration_timestamp_secs")
+            if name in _RAW_TRANSACTION_FIELDS
+        ),
+        None,
+    )
 except ImportError:
     APTOS_SDK_AVAILABLE = False
+    EXPIRATION_ATTR = None
 
-load_dotenv()
+load_env()
+
+logger = logging.getLogger(__name__)
 
 # Movement Network RPC URL
 # Movement Network Mainnet Configuration
-MOVEMENT_RPC = os.getenv("MOVEMENT_RPC_URL", "https://mainnet.movementnetwork.xyz/v1")
+MOVEMENT_RPC = get_settings().rpc_url
 MOVEMENT_CHAIN_ID = 126  # Movement mainnet chain ID
 
 
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP_MAX_CONNECTIONS = 100
+# Idle connections kept open between payments (httpx defaults: 20 for 5s)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+# Retries only cover failed connection attempts, so a settlement is never sent twice
+HTTP_CONNECT_RETRIES = 2
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_facilitator_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled AsyncClient, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        _http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE, limits=limits, retries=HTTP_CONNECT_RETRIES
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+    return _http_client
+
+
+async def close_facilitator_http_client() -> None:
+    """Close the shared AsyncClient if it was created."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+# Consecutive facilitator failures (transport errors, 5xx) that pause
+# settlement, and for how long
+SETTLE_CIRCUIT_FAILURE_THRESHOLD = 5
+SETTLE_CIRCUIT_OPEN_SECONDS = 30
+
+# Decoded base64 payloads kept for repeat verifications of the same payment
+DECODE_CACHE_MAX_ENTRIES = 4096
+
+
+@lru_cache(maxsize=DECODE_CACHE_MAX_ENTRIES)
+def decode_base64(data: str) -> bytes:
+    """Decode a base64 payment header or BCS blob, memoized on the encoded string.
+
+    A payment is usually verified more than once (client check, paywall check,
+    retries), so the same header and transaction strings come back within
+    seconds. Invalid input raises and is not cached.
+    """
+    return b64decode(data, validate=True)
+
+
+# BCS TransactionPayload variant of an entry function call
+ENTRY_FUNCTION_PAYLOAD = 2
+# TypeTag variants: 6 is vector<T>, 7 is a struct; every other tag is a bare primitive
+TYPE_TAG_VECTOR = 6
+TYPE_TAG_STRUCT = 7
+_U64 = struct.Struct("<Q")
+# Framework entry functions whose first two arguments are (recipient, amount)
+TRANSFER_FUNCTIONS = frozenset(
+    {
+        "0x1::coin::transfer",
+        "0x1::aptos_account::transfer",
+        "0x1::aptos_account::transfer_coins",
+    }
+)
+# Distinct payment requirements (one per paywalled route) kept normalized
+REQUIREMENTS_CACHE_MAX_ENTRIES = 512
+
+
+def _read_uleb128(buf: memoryview, off: int) -> Tuple[int, int]:
+    """Read a ULEB128 length prefix, returning (value, new offset)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[off]
+        off += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, off
+        shift += 7
+
+
+def _skip_type_tag(buf: memoryview, off: int) -> int:
+    """Skip one BCS TypeTag, returning the offset just past it."""
+    tag, off = _read_uleb128(buf, off)
+    if tag == TYPE_TAG_VECTOR:
+        return _skip_type_tag(buf, off)
+    if tag == TYPE_TAG_STRUCT:
+        off += 32  # struct address
+        for _ in range(2):  # module and struct names
+            length, off = _read_uleb128(buf, off)
+            off += length
+        count, off = _read_uleb128(buf, off)
+        for _ in range(count):
+            off = _skip_type_tag(buf, off)
+    return off
+
+
+def format_address(raw: bytes) -> str:
+    """Format a 32-byte account address the way the Aptos SDK prints it.
+
+    Special addresses (0x0-0xf) use the short form, all others the full
+    64-character hex form.
+    """
+    if not any(raw[:31]) and raw[31] < 0x10:
+        return f"0x{raw[31]:x}"
+    return "0x" + raw.hex()
+
+
+@lru_cache(maxsize=REQUIREMENTS_CACHE_MAX_ENTRIES)
+def _normalize_requirements(
+    pay_to: str, max_amount_required: Any, max_timeout_seconds: Any
+) -> Tuple[bytes, int, int]:
+    """Normalize the payment requirement fields used by verification.
+
+    A route sends the same requirements with every payment, so the parsed
+    values are memoized on the raw field values.
+
+    Args:
+        pay_to: Recipient address as hex, with or without 0x or leading zeros
+        max_amount_required: Required amount in base units
+        max_timeout_seconds: Maximum transaction lifetime in seconds
+
+    Returns:
+        Tuple of (32-byte recipient address, required amount, timeout). The
+        address is empty when pay_to is not a valid address, so no recipient
+        matches it.
+    """
+    hex_address = pay_to[2:] if pay_to[:2].lower() == "0x" else pay_to
+    try:
+        pay_to_bytes = bytes.fromhex(hex_address.zfill(64))
+    except ValueError:
+        pay_to_bytes = b""
+    if len(pay_to_bytes) != 32:
+        pay_to_bytes = b""
+    return pay_to_bytes, int(max_amount_required), int(max_timeout_seconds)
+
+
+def _fast_extract_tx_fields(buf: memoryview) -> Dict[str, Any]:
+    """Read the fields verification needs straight from a BCS RawTransaction.
+
+    Walks the fixed layout (sender, sequence number, payload, gas, expiration)
+    without building SDK objects. Trailing bytes (e.g. a fee payer address)
+    are ignored.
+
+    Args:
+        buf: BCS-encoded RawTransaction bytes
+
+    Returns:
+        Dictionary with sender, sequence_number, function
+        ("address::module::name"), args (raw BCS bytes per argument) and
+        expiration_timestamp_secs and chain_id
+
+    Raises:
+        ValueError: If the bytes are truncated or the payload is not an
+            entry function call
+    """
+    try:
+        sender = format_address(bytes(buf[0:32]))
+        (sequence_number,) = _U64.unpack_from(buf, 32)
+        variant, off = _read_uleb128(buf, 40)
+        if variant != ENTRY_FUNCTION_PAYLOAD:
+            raise ValueError(f"Unsupported transaction payload variant {variant}")
+
+        module_address = format_address(bytes(buf[off : off + 32]))
+        off += 32
+        names = []
+        for _ in range(2):  # module name, then function name
+            length, off = _read_uleb128(buf, off)
+            names.append(bytes(buf[off : off + length]).decode())
+            off += length
+
+        count, off = _read_uleb128(buf, off)
+        for _ in range(count):
+            off = _skip_type_tag(buf, off)
+
+        args = []
+        count, off = _read_uleb128(buf, off)
+        for _ in range(count):
+            length, off = _read_uleb128(buf, off)
+            args.append(bytes(buf[off : off + length]))
+            off += length
+
+        # max_gas_amount and gas_unit_price precede the expiration
+        (expiration_timestamp_secs,) = _U64.unpack_from(buf, off + 16)
+        chain_id = buf[off + 24]
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed BCS transaction: {e}")
+
+    return {
+        "sender": sender,
+        "sequence_number": sequence_number,
+        "function": f"{module_address}::{names[0]}::{names[1]}",
+        "args": args,
+        "expiration_timestamp_secs": expiration_timestamp_secs,
+        "chain_id": chain_id,
+    }
+
+
+class VerifyResult(TypedDict, total=False):
+    """Result of verifying a payment."""
+
+    isValid: bool
+    invalidReason: str
+    payer: str
+
+
+class SettleResult(TypedDict, total=False):
+    """Result of settling a payment (remote facilitator fields are passed through)."""
+
+    success: bool
+    error: str
+    txHash: str
+    network: str
+
+
 class FacilitatorService:
     """Service for verifying and settling x402 payments on Movement Network."""
 
@@ -45,32 +296,21 @@ class FacilitatorService:
         """
         self.rpc_url = rpc_url or MOVEMENT_RPC
         # Use frontend facilitator API by default (handles Movement Network properly)
-        # Can be overridden with FACILITATOR_URL env var
-        # In Docker, use host.docker.internal to reach host machine
-        # Otherwise use localhost or FRONTEND_URL env var
-        if facilitator_url:
-            self.facilitator_url = facilitator_url
-        elif os.getenv("FACILITATOR_URL"):
-            self.facilitator_url = os.getenv("FACILITATOR_URL")
-        elif os.getenv("FRONTEND_URL"):
-            self.facilitator_url = f"{os.getenv('FRONTEND_URL')}/api/facilitator"
-        else:
-            # Try to detect if running in Docker
-            # In Docker, use host.docker.internal (works on Mac/Windows)
-            # On Linux Docker, might need to use host network or gateway IP
-            import platform
-            if os.path.exists("/.dockerenv"):
-                # Running in Docker - try host.docker.internal first
-                self.facilitator_url = "http://host.docker.internal:3000/api/facilitator"
-            else:
-                # Running locally
-                self.facilitator_url = "http://localhost:3000/api/facilitator"
+        # Can be overridden with FACILITATOR_URL or FRONTEND_URL env vars
+        self.facilitator_url = facilitator_url or get_settings().facilitator_url
+
+        # Endpoint URLs built once per service rather than per request
+        self.settle_url = f"{self.facilitator_url}/settle"
+
+        # Settlement circuit breaker state (see _record_settle_outcome)
+        self._settle_failures = 0
+        self._settle_circuit_open_until = 0.0
 
     def decode_payment_header(self, payment_header: str) -> Dict[str, Any]:
         """Decode base64-encoded payment header.
 
         Args:
-            payment_header: Base64-encoded JSON payment header
+            payment_header: Base64-encoded (or raw) JSON payment header
 
         Returns:
             Decoded payment header dictionary
@@ -79,13 +319,17 @@ class FacilitatorService:
             ValueError: If header cannot be decoded
         """
         try:
+            # "{" is not a base64 character, so a header starting with it is
+            # unwrapped JSON (as some dev clients send it)
+            if payment_header[:1] == "{":
+                return orjson.loads(payment_header)
             # Decode base64
-            decoded_bytes = base64.b64decode(payment_header)
-            decoded_str = decoded_bytes.decode("utf-8")
-            # Parse JSON
-            return json.loads(decoded_str)
-        except Exception as e:
-            raise ValueError(f"Failed to decode payment header: {str(e)}")
+            decoded_bytes = decode_base64(payment_header)
+            # Parse JSON (orjson reads the UTF-8 bytes directly)
+            return orjson.loads(decoded_bytes)
+        except (ValueError, TypeError) as e:
+            # binascii.Error and orjson.JSONDecodeError are ValueErrors
+            raise ValueError(f"Failed to decode payment header: {e}") from e
 
     def extract_transaction_info(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract transaction information from payment data.
@@ -94,7 +338,7 @@ class FacilitatorService:
             payment_data: Decoded payment header
 
         Returns:
-            Dictionary with transaction info (sender, recipient, amount, etc.)
+            Dictionary with the base64 transaction and signature BCS
         """
         payload = payment_data.get("payload", {})
         transaction_bcs = payload.get("transaction") or payload.get("transactionBcsBase64")
@@ -103,22 +347,20 @@ class FacilitatorService:
         if not transaction_bcs:
             raise ValueError("Transaction BCS not found in payment header")
 
-        # Decode transaction BCS (base64)
+        # Check the transaction BCS decodes (base64); the decoded bytes stay cached
+        # for verification, which deserializes them itself
         try:
-            transaction_bytes = base64.b64decode(transaction_bcs)
-            # For now, we'll use the RPC to deserialize and verify
-            # In production, you might want to use the Aptos Python SDK
-            return {
-                "transaction_bcs": transaction_bcs,
-                "signature_bcs": signature_bcs,
-                "transaction_bytes": transaction_bytes.hex(),
-            }
-        except Exception as e:
-            raise ValueError(f"Failed to decode transaction BCS: {str(e)}")
+            decode_base64(transaction_bcs)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Failed to decode transaction BCS: {e}") from e
+        return {
+            "transaction_bcs": transaction_bcs,
+            "signature_bcs": signature_bcs,
+        }
 
-    def verify_transaction_on_chain(
+    async def verify_transaction_on_chain(
         self, transaction_bcs: str, payment_requirements: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> VerifyResult:
         """Verify transaction on Movement Network.
 
         Args:
@@ -130,23 +372,103 @@ class FacilitatorService:
         """
         try:
             # Decode transaction
-            transaction_bytes = base64.b64decode(transaction_bcs)
+            transaction_bytes = decode_base64(transaction_bcs)
+
+            # Read the needed fields straight from the BCS bytes; the SDK and
+            # RPC paths only see transactions the fast parser rejects
+            try:
+                fields = _fast_extract_tx_fields(memoryview(transaction_bytes))
+            except ValueError:
+                fields = None
+            if fields is not None:
+                return self._verify_transaction_fields(fields, payment_requirements)
 
             # Use Aptos SDK if available for proper deserialization
             if APTOS_SDK_AVAILABLE:
                 return self._verify_with_aptos_sdk(transaction_bytes, payment_requirements)
             else:
                 # Fallback to RPC-based verification
-                return self._verify_with_rpc(transaction_bytes, payment_requirements)
+                return await self._verify_with_rpc(transaction_bytes, payment_requirements)
         except Exception as e:
             return {
                 "isValid": False,
                 "invalidReason": f"Verification error: {str(e)}",
             }
 
+    def _verify_transaction_fields(
+        self, fields: Dict[str, Any], payment_requirements: Dict[str, Any]
+    ) -> VerifyResult:
+        """Check parsed transaction fields against the payment requirements.
+
+        Args:
+            fields: Fields returned by _fast_extract_tx_fields
+            payment_requirements: Payment requirements from server
+
+        Returns:
+            Verification result
+        """
+        required_pay_to, required_amount, max_timeout_seconds = _normalize_requirements(
+            payment_requirements.get("payTo", ""),
+            payment_requirements.get("maxAmountRequired", "0"),
+            payment_requirements.get("maxTimeoutSeconds", 600),
+        )
+
+        # Check expiration (transaction must be valid and within the timeout window)
+        expiration_timestamp_secs = fields["expiration_timestamp_secs"]
+        current_time = int(time.time())
+        if expiration_timestamp_secs < current_time:
+            return {
+                "isValid": False,
+                "invalidReason": "Transaction has expired",
+            }
+        if expiration_timestamp_secs > current_time + max_timeout_seconds:
+            return {
+                "isValid": False,
+                "invalidReason": "Transaction expiration exceeds maximum timeout",
+            }
+
+        # Only coin transfers can pay; anything else could move funds elsewhere
+        if fields["function"] not in TRANSFER_FUNCTIONS:
+            return {
+                "isValid": False,
+                "invalidReason": f"Unsupported payment function: {fields['function']}",
+            }
+
+        # The first two arguments are the recipient address and the u64 amount
+        args = fields["args"]
+        if len(args) < 2 or len(args[0]) != 32 or len(args[1]) != 8:
+            return {
+                "isValid": False,
+                "invalidReason": "Malformed transfer arguments",
+            }
+        (amount,) = _U64.unpack(args[1])
+
+        # Verify recipient matches (raw address bytes, so no string formatting)
+        if args[0] != required_pay_to:
+            expected = payment_requirements.get("payTo", "")
+            return {
+                "isValid": False,
+                "invalidReason": (
+                    f"Recipient mismatch: expected {expected}, got {format_address(args[0])}"
+                ),
+            }
+
+        # Verify amount is sufficient
+        if amount < required_amount:
+            return {
+                "isValid": False,
+                "invalidReason": f"Amount insufficient: required {required_amount}, got {amount}",
+            }
+
+        # Transaction is valid
+        return {
+            "isValid": True,
+            "payer": fields["sender"],
+        }
+
     def _verify_with_aptos_sdk(
         self, transaction_bytes: bytes, payment_requirements: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> VerifyResult:
         """Verify transaction using Aptos SDK for proper deserialization.
 
         Args:
@@ -165,13 +487,10 @@ class FacilitatorService:
             sender = str(raw_transaction.sender)
             sequence_number = raw_transaction.sequence_number
             
-            # Access expiration timestamp - use getattr to safely access the attribute
-            # The RawTransaction object structure may vary between SDK versions
+            # Access expiration timestamp under the name probed at import
             # If expiration is not available, we'll skip expiration checks and rely on on-chain verification
-            expiration_timestamp_secs = getattr(
-                raw_transaction, 
-                "expiration_timestamp_secs", 
-                None
+            expiration_timestamp_secs = (
+                getattr(raw_transaction, EXPIRATION_ATTR) if EXPIRATION_ATTR else None
             )
 
             # Get payment requirements
@@ -181,7 +500,6 @@ class FacilitatorService:
 
             # Check expiration (transaction must be valid) - only if expiration is available
             if expiration_timestamp_secs is not None:
-                import time
                 current_time = int(time.time())
                 if expiration_timestamp_secs < current_time:
                     return {
@@ -238,9 +556,9 @@ class FacilitatorService:
                 "invalidReason": f"SDK verification error: {str(e)}",
             }
 
-    def _verify_with_rpc(
+    async def _verify_with_rpc(
         self, transaction_bytes: bytes, payment_requirements: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> VerifyResult:
         """Verify transaction using RPC simulation (fallback when SDK not available).
 
         Args:
@@ -250,7 +568,7 @@ class FacilitatorService:
         Returns:
             Verification result
         """
-        simulate_response = self._simulate_transaction(transaction_bytes)
+        simulate_response = await self._simulate_transaction(transaction_bytes)
 
         if not simulate_response.get("success"):
             return {
@@ -273,7 +591,7 @@ class FacilitatorService:
             "payer": sender,
         }
 
-    def _simulate_transaction(self, transaction_bytes: bytes) -> Dict[str, Any]:
+    async def _simulate_transaction(self, transaction_bytes: bytes) -> Dict[str, Any]:
         """Simulate transaction on Movement Network.
 
         Args:
@@ -289,20 +607,21 @@ class FacilitatorService:
             # Use Movement Network RPC simulate_transaction endpoint
             # Note: This is a simplified approach
             # In production, you should use the Aptos Python SDK
-            response = requests.post(
+            response = await get_facilitator_http_client().post(
                 f"{self.rpc_url}",
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "transaction.simulate",
-                    "params": [tx_hex],
-                },
-                headers={"Content-Type": "application/json"},
+                content=orjson.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "transaction.simulate",
+                        "params": [tx_hex],
+                    }
+                ),
                 timeout=10,
             )
 
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 if "result" in result:
                     return {"success": True, "result": result["result"]}
                 return {"success": False, "error": result.get("error", "Unknown error")}
@@ -310,9 +629,9 @@ class FacilitatorService:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def verify_payment(
+    async def verify_payment(
         self, x402_version: int, payment_payload: Dict[str, Any], payment_requirements: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> VerifyResult:
         """Verify a payment according to x402 protocol.
 
         Args:
@@ -339,16 +658,16 @@ class FacilitatorService:
                 }
 
             # Verify transaction on-chain
-            return self.verify_transaction_on_chain(transaction_bcs, payment_requirements)
+            return await self.verify_transaction_on_chain(transaction_bcs, payment_requirements)
         except Exception as e:
             return {
                 "isValid": False,
                 "invalidReason": f"Verification failed: {str(e)}",
             }
 
-    def settle_payment(
+    async def settle_payment(
         self, x402_version: int, payment_payload: Dict[str, Any], payment_requirements: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> SettleResult:
         """Settle a payment (submit transaction to network).
 
         Args:
@@ -359,11 +678,18 @@ class FacilitatorService:
         Returns:
             Settlement response with success, txHash, etc.
         """
+        # Fail fast while the facilitator is considered down
+        if time.monotonic() < self._settle_circuit_open_until:
+            return {
+                "success": False,
+                "error": "Facilitator unavailable, please retry shortly",
+            }
+
         try:
             # Use remote facilitator service for settlement
             # This avoids RPC method issues and uses a dedicated facilitator
-            settle_url = f"{self.facilitator_url}/settle"
-            
+            settle_url = self.settle_url
+
             # Prepare request body for facilitator
             # The remote facilitator expects the same format as our local endpoint
             request_body = {
@@ -372,67 +698,63 @@ class FacilitatorService:
                 "paymentRequirements": payment_requirements,
             }
             
-            # Print settlement details to terminal
-            print("\n" + "="*80)
-            print("[FACILITATOR] SETTLEMENT REQUEST")
-            print("="*80)
-            print(f"[FACILITATOR] Settle URL: {settle_url}")
-            print(f"[FACILITATOR] Facilitator URL base: {self.facilitator_url}")
-            print(f"[FACILITATOR] x402Version: {x402_version}")
-            print(f"[FACILITATOR] Request body keys: {list(request_body.keys())}")
-            print(f"[FACILITATOR] paymentPayload keys: {list(payment_payload.keys())}")
-            print(f"[FACILITATOR] paymentRequirements keys: {list(payment_requirements.keys())}")
-            print("\n[FACILITATOR] paymentRequirements:")
-            print(json.dumps(payment_requirements, indent=2))
-            
-            # Print full request body (truncate large base64 fields for readability)
-            request_body_log = {}
-            for key, value in request_body.items():
-                if key == "paymentPayload" and isinstance(value, dict):
-                    # Log payment payload structure but truncate base64 fields
-                    payload_log = {}
-                    for pk, pv in value.items():
-                        if isinstance(pv, str) and len(pv) > 100:
-                            payload_log[pk] = f"{pv[:50]}... (truncated, length: {len(pv)})"
-                        else:
-                            payload_log[pk] = pv
-                    request_body_log[key] = payload_log
-                elif isinstance(value, str) and len(value) > 200:
-                    request_body_log[key] = f"{value[:100]}... (truncated, length: {len(value)})"
-                else:
-                    request_body_log[key] = value
-            
-            print("\n[FACILITATOR] Full request body (truncated for readability):")
-            print(json.dumps(request_body_log, indent=2))
-            print("="*80 + "\n")
-            
+            # Log settlement details; the dumps below only run at DEBUG level
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[FACILITATOR] Settlement request to %s (x402Version %s)\n"
+                    "paymentPayload keys: %s\npaymentRequirements:\n%s",
+                    settle_url,
+                    x402_version,
+                    list(payment_payload.keys()),
+                    json.dumps(payment_requirements, indent=2),
+                )
+
+                # Truncate large base64 payload fields for readability
+                payload_log = {
+                    key: (
+                        f"{value[:50]}... (truncated, length: {len(value)})"
+                        if isinstance(value, str) and len(value) > 100
+                        else value
+                    )
+                    for key, value in payment_payload.items()
+                }
+                logger.debug(
+                    "[FACILITATOR] paymentPayload (truncated for readability):\n%s",
+                    json.dumps(payload_log, indent=2),
+                )
+
             # Call remote facilitator service
-            response = requests.post(
+            response = await get_facilitator_http_client().post(
                 settle_url,
-                json=request_body,
-                headers={"Content-Type": "application/json"},
+                content=orjson.dumps(request_body),
                 timeout=30,
             )
-            
- 
-            
+            self._record_settle_outcome(facilitator_ok=response.status_code < 500)
+
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result
             
             # Handle non-200 responses
             try:
-                error_body = response.json()
+                error_body = orjson.loads(response.content)
                 error_msg = error_body.get("error", error_body.get("message", "Unknown error"))
-            except:
-                error_body = response.text[:500]  # Limit error body length
+            except Exception:
+                # Limit error body length before decoding
+                error_body = response.content[:500].decode("utf-8", errors="replace")
                 error_msg = f"HTTP {response.status_code}: {error_body}"
-            
+            logger.debug(
+                "[FACILITATOR] Settlement failed: status=%s body=%r",
+                response.status_code,
+                response.content[:500],
+            )
+
             return {
                 "success": False,
                 "error": error_msg,
             }
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            self._record_settle_outcome(facilitator_ok=False)
             return {
                 "success": False,
                 "error": f"Facilitator request failed: {str(e)}",
@@ -443,6 +765,25 @@ class FacilitatorService:
                 "error": f"Settlement failed: {str(e)}",
             }
 
+    def _record_settle_outcome(self, facilitator_ok: bool) -> None:
+        """Track consecutive facilitator failures and open the circuit when needed.
+
+        Only transport errors and 5xx responses count; a rejected payment is a
+        healthy facilitator answering.
+        """
+        if facilitator_ok:
+            self._settle_failures = 0
+            return
+        self._settle_failures += 1
+        if self._settle_failures >= SETTLE_CIRCUIT_FAILURE_THRESHOLD:
+            self._settle_circuit_open_until = time.monotonic() + SETTLE_CIRCUIT_OPEN_SECONDS
+            self._settle_failures = 0
+            logger.warning(
+                "[FACILITATOR] %d consecutive settlement failures, pausing settlement for %ss",
+                SETTLE_CIRCUIT_FAILURE_THRESHOLD,
+                SETTLE_CIRCUIT_OPEN_SECONDS,
+            )
+
     def get_supported_networks(self) -> Dict[str, Any]:
         """Get supported networks and schemes.
 
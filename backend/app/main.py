@@ -5,17 +5,20 @@ This module creates and configures the main FastAPI application, registers
 agent applications, and sets up middleware and health check endpoints.
 """
 
+import asyncio
 import os
 import logging
 from contextlib import asynccontextmanager
+from typing import Callable, Optional
 
-from dotenv import load_dotenv
+from app.env import DEFAULT_AGENTS_PORT, get_settings, load_env
 from fastapi import FastAPI
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.agents.balance.agent import create_balance_agent_app
 from app.agents.bridge.agent import create_bridge_agent_app
@@ -23,111 +26,132 @@ from app.agents.lending_comparison.agent import (
     create_lending_agent_app,
     create_lending_comparison_agent_app,  # Backward compatibility alias
 )
-from app.agents.orchestrator.agent import create_orchestrator_agent_app
+from app.agents.orchestrator.agent import close_orchestrator_storage, create_orchestrator_agent_app
+from app.agents.orchestrator.http_client import close_shared_http_client
 from app.agents.premium_lending.agent import create_lending_agent_app as create_premium_lending_agent_app
 from app.agents.sentiment.agent import create_sentiment_agent_app
 from app.agents.swap.agent import create_swap_agent_app
 from app.agents.transfer.agent import create_transfer_agent_app
 from app.facilitator.routes import router as facilitator_router
+from app.facilitator.service import close_facilitator_http_client
 
 # Configuration constants
-DEFAULT_AGENTS_PORT = 8000
 API_VERSION = "0.1.0"
 SERVICE_NAME = "backend-api"
 
 # Environment variable keys
 ENV_AGENTS_PORT = "AGENTS_PORT"
-ENV_RENDER_EXTERNAL_URL = "RENDER_EXTERNAL_URL"
+ENV_SSL_CERTFILE = "SSL_CERTFILE"
+ENV_SSL_KEYFILE = "SSL_KEYFILE"
 
+# Production server tuning (see run())
+SERVER_HOST = "0.0.0.0"
+SERVER_KEEP_ALIVE_TIMEOUT_SECONDS = 75
+SERVER_H2_MAX_CONCURRENT_STREAMS = 256
 
-def get_base_url() -> str:
-    """Get the base URL for agent card endpoints.
 
-    Checks for Railway deployment first (RAILWAY_PUBLIC_DOMAIN), then Render (RENDER_EXTERNAL_URL),
-    then falls back to localhost for local development.
+class LazyMount:
+    """ASGI app that builds the wrapped agent app on its first request.
 
-    Returns:
-        Base URL from environment or constructed from port
+    Agents an instance never serves are never constructed, which shortens
+    cold starts. A lock makes sure concurrent first requests build it once.
+
+    Args:
+        factory: Zero-argument callable returning the ASGI app to serve
     """
-    logger = logging.getLogger(__name__)
-    
-    # Railway deployment - check for RAILWAY_PUBLIC_DOMAIN first
-    railway_url = os.getenv("RAILWAY_PUBLIC_DOMAIN")
-    if railway_url:
-        # Railway URLs are typically just the domain, add https:// if not present
-        base_url = f"https://{railway_url}" if not railway_url.startswith("http") else railway_url
-        logger.info(f"[get_base_url] Using Railway URL: {base_url}")
-        return base_url
-    
-    # Render deployment - check for RENDER_EXTERNAL_URL
-    render_url = os.getenv(ENV_RENDER_EXTERNAL_URL)
-    if render_url:
-        logger.info(f"[get_base_url] Using Render URL: {render_url}")
-        return render_url
-    
-    # Local development - default to localhost
-    port = int(os.getenv(ENV_AGENTS_PORT, str(DEFAULT_AGENTS_PORT)))
-    base_url = f"http://localhost:{port}"
-    logger.info(f"[get_base_url] Using localhost URL: {base_url}")
-    return base_url
+
+    def __init__(self, factory: Callable[[], ASGIApp]) -> None:
+        self.factory = factory
+        self.app: Optional[ASGIApp] = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.app is None:
+            async with self._lock:
+                if self.app is None:
+                    self.app = self.factory()
+        await self.app(scope, receive, send)
 
 
 def register_agents(app: FastAPI) -> None:
     """Register all agent applications with the main FastAPI app.
 
+    A2A agents are mounted through LazyMount and built on first use.
+
     Args:
         app: The FastAPI application instance to mount agents on
     """
-    base_url = get_base_url()
+    base_url = get_settings().base_url
 
     # Balance Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    balance_agent_app = create_balance_agent_app(card_url=f"{base_url}/balance/")
-    app.mount("/balance", balance_agent_app.build())
+    app.mount(
+        "/balance",
+        LazyMount(lambda: create_balance_agent_app(card_url=f"{base_url}/balance/").build()),
+    )
 
     # Bridge Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    bridge_agent_app = create_bridge_agent_app(card_url=f"{base_url}/bridge/")
-    app.mount("/bridge", bridge_agent_app.build())
+    app.mount(
+        "/bridge",
+        LazyMount(lambda: create_bridge_agent_app(card_url=f"{base_url}/bridge/").build()),
+    )
 
     # Unified Lending Agent (A2A Protocol) - Combines comparison and operations
     # Both endpoints point to the same unified agent for backward compatibility
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    lending_agent_app = create_lending_agent_app(card_url=f"{base_url}/lending/")
-    app.mount("/lending", lending_agent_app.build())
+    app.mount(
+        "/lending",
+        LazyMount(lambda: create_lending_agent_app(card_url=f"{base_url}/lending/").build()),
+    )
 
     # Lending Comparison endpoint (same unified agent, different route for backward compatibility)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    lending_comparison_agent_app = create_lending_comparison_agent_app(
-        card_url=f"{base_url}/lending_comparison/"
+    app.mount(
+        "/lending_comparison",
+        LazyMount(
+            lambda: create_lending_comparison_agent_app(
+                card_url=f"{base_url}/lending_comparison/"
+            ).build()
+        ),
     )
-    app.mount("/lending_comparison", lending_comparison_agent_app.build())
 
     # Swap Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    swap_agent_app = create_swap_agent_app(card_url=f"{base_url}/swap/")
-    app.mount("/swap", swap_agent_app.build())
+    app.mount(
+        "/swap",
+        LazyMount(lambda: create_swap_agent_app(card_url=f"{base_url}/swap/").build()),
+    )
 
     # Transfer Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    transfer_agent_app = create_transfer_agent_app(card_url=f"{base_url}/transfer/")
-    app.mount("/transfer", transfer_agent_app.build())
+    app.mount(
+        "/transfer",
+        LazyMount(lambda: create_transfer_agent_app(card_url=f"{base_url}/transfer/").build()),
+    )
 
-    # Orchestrator Agent (AG-UI ADK Protocol)
+    # Orchestrator Agent (AG-UI ADK Protocol) - built eagerly, it serves every chat
     orchestrator_agent_app = create_orchestrator_agent_app()
     app.mount("/orchestrator", orchestrator_agent_app)
+    app.state.orchestrator_app = orchestrator_agent_app
 
     # Premium Lending Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    premium_lending_agent_app = create_premium_lending_agent_app(
-        card_url=f"{base_url}/premium_lending_agent/"
+    app.mount(
+        "/premium_lending_agent",
+        LazyMount(
+            lambda: create_premium_lending_agent_app(
+                card_url=f"{base_url}/premium_lending_agent/"
+            ).build()
+        ),
     )
-    app.mount("/premium_lending_agent", premium_lending_agent_app.build())
 
     # Sentiment Agent (A2A Protocol)
     # CRITICAL: Add trailing slash to card_url to avoid 307 redirect (POST -> GET conversion)
-    sentiment_agent_app = create_sentiment_agent_app(card_url=f"{base_url}/sentiment/")
-    app.mount("/sentiment", sentiment_agent_app.build())
+    app.mount(
+        "/sentiment",
+        LazyMount(lambda: create_sentiment_agent_app(card_url=f"{base_url}/sentiment/").build()),
+    )
 
 
 @asynccontextmanager
@@ -145,6 +169,12 @@ async def lifespan(app: FastAPI):
     # Shutdown - cleanup HTTP connections
     logger.info("Shutting down FastAPI application, cleaning up connections...")
     try:
+        # Mounted sub-app lifespans do not run, so close the shared HTTP and
+        # Redis pools here
+        await close_shared_http_client()
+        await close_facilitator_http_client()
+        await close_orchestrator_storage(app.state.orchestrator_app)
+
         # Force cleanup of any lingering HTTP connections
         import gc
         gc.collect()
@@ -198,3 +228,60 @@ def create_app() -> FastAPI:
 
 # Create the application instance
 app = create_app()
+
+
+def run() -> None:
+    """Serve the application with Hypercorn over HTTP/2 on uvloop.
+
+    The frontend keeps many short AG-UI streams open against /orchestrator;
+    HTTP/2 multiplexes them over one connection with compressed headers, and
+    a 75s keep-alive outlives typical proxy idle timeouts so connections are
+    reused between chat turns. Without TLS Hypercorn speaks HTTP/1.1 and h2c;
+    set SSL_CERTFILE/SSL_KEYFILE to negotiate h2 via ALPN directly, or
+    terminate TLS at a reverse proxy configured to speak HTTP/2 upstream.
+
+    Falls back to uvicorn (HTTP/1.1, same keep-alive) when Hypercorn is not
+    installed.
+    """
+    port = int(os.getenv(ENV_AGENTS_PORT, str(DEFAULT_AGENTS_PORT)))
+    certfile = os.getenv(ENV_SSL_CERTFILE)
+    keyfile = os.getenv(ENV_SSL_KEYFILE)
+
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    try:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+    except ImportError:
+        import uvicorn
+
+        uvicorn.run(
+            app,
+            host=SERVER_HOST,
+            port=port,
+            loop="uvloop" if uvloop else "asyncio",
+            timeout_keep_alive=SERVER_KEEP_ALIVE_TIMEOUT_SECONDS,
+            ssl_certfile=certfile,
+            ssl_keyfile=keyfile,
+        )
+        return
+
+    config = Config()
+    config.bind = [f"{SERVER_HOST}:{port}"]
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.keep_alive_timeout = SERVER_KEEP_ALIVE_TIMEOUT_SECONDS
+    config.h2_max_concurrent_streams = SERVER_H2_MAX_CONCURRENT_STREAMS
+    if certfile and keyfile:
+        config.certfile = certfile
+        config.keyfile = keyfile
+    if uvloop:
+        uvloop.run(serve(app, config))
+    else:
+        asyncio.run(serve(app, config))
+
+
+if __name__ == "__main__":
+    run()
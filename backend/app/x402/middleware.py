@@ -5,56 +5,121 @@ This middleware implements the x402 payment protocol for protecting API routes
 with blockchain-based micropayments on Movement Network.
 """
 
+import asyncio
 import base64
-import json
+import hashlib
+import logging
 import os
-from typing import Any, Dict, Optional, Callable
+import random
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
-from dotenv import load_dotenv
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+import orjson
+from app.env import get_settings, load_env
+from starlette.types import Message, Receive, Scope, Send
 
 from app.facilitator.service import FacilitatorService
 from app.x402.types import RouteConfig, RoutesMap, PaymentRequirements
 
-load_dotenv()
+load_env()
+
+# Per-request details are logged at DEBUG; set X402_LOG_LEVEL=DEBUG to see them
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("X402_LOG_LEVEL", "INFO").upper())
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setLevel(logging.DEBUG)
+    _handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    logger.addHandler(_handler)
 
 # Default facilitator URL (can be overridden)
 # Use frontend facilitator API by default (handles Movement Network properly)
-# Frontend runs on port 3000, backend on 8000
-# In Docker, use host.docker.internal to reach host machine
 def get_default_facilitator_url() -> str:
     """Get default facilitator URL, handling Docker environments."""
-    if os.getenv("FACILITATOR_URL"):
-        return os.getenv("FACILITATOR_URL")
-    if os.getenv("FRONTEND_URL"):
-        return f"{os.getenv('FRONTEND_URL')}/api/facilitator"
-    
-    # Try to detect if running in Docker
-    if os.path.exists("/.dockerenv"):
-        # Running in Docker - use host.docker.internal (works on Mac/Windows)
-        return "http://host.docker.internal:3000/api/facilitator"
-    else:
-        # Running locally
-        return "http://localhost:3000/api/facilitator"
+    return get_settings().facilitator_url
 
 DEFAULT_FACILITATOR_URL = get_default_facilitator_url()
 
+# Distinct (route, resource URL) 402 bodies kept serialized
+PAYMENT_REQUIRED_BODY_CACHE_SIZE = 256
+
+# Settlement attempts per paid request; retry n waits about BASE * 2**(n-1)
+SETTLE_MAX_ATTEMPTS = 2
+SETTLE_RETRY_BASE_DELAY_SECONDS = 0.2
+
+# Payment headers being settled or already settled, so a replayed header is
+# turned away before another verify/settle round-trip. Transactions expire
+# within the route's max timeout (600s by default), after which a replay is
+# rejected on-chain anyway
+CLAIMED_PAYMENT_TTL_SECONDS = 600
+CLAIMED_PAYMENTS_MAX_ENTRIES = 4096
+_CLAIMED_PAYMENTS: "OrderedDict[bytes, float]" = OrderedDict()
+
+
+def _claim_payment(payment_header: str) -> Optional[bytes]:
+    """Claim a payment header for this request.
+
+    Args:
+        payment_header: Raw X-PAYMENT header value
+
+    Returns:
+        The claim key, or None if the header is already claimed or settled
+    """
+    key = hashlib.blake2b(payment_header.encode(), digest_size=16).digest()
+    now = time.monotonic()
+    expires_at = _CLAIMED_PAYMENTS.get(key)
+    if expires_at is not None and expires_at > now:
+        return None
+    _CLAIMED_PAYMENTS[key] = now + CLAIMED_PAYMENT_TTL_SECONDS
+    _CLAIMED_PAYMENTS.move_to_end(key)
+    while len(_CLAIMED_PAYMENTS) > CLAIMED_PAYMENTS_MAX_ENTRIES:
+        _CLAIMED_PAYMENTS.popitem(last=False)
+    return key
+
+
+def _release_payment(key: bytes) -> None:
+    """Drop a claim whose payment was not settled, so the client can retry."""
+    _CLAIMED_PAYMENTS.pop(key, None)
+
+
+# Request headers the middleware reads (ASGI header names are lowercase)
+_PAYMENT_HEADERS = frozenset({"x-payment", "x-402", "host", "x-forwarded-proto"})
+
+
+def read_payment_headers(scope: Scope) -> Dict[str, str]:
+    """Collect the headers the paywall needs in one pass over the ASGI scope.
 
-def absolute_resource_url(request: Request) -> str:
+    Args:
+        scope: ASGI HTTP connection scope
+
+    Returns:
+        Dictionary of the first value of each wanted header, keyed by name
+    """
+    headers: Dict[str, str] = {}
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1")
+        if name in _PAYMENT_HEADERS and name not in headers:
+            headers[name] = raw_value.decode("latin-1")
+    return headers
+
+
+def absolute_resource_url(headers: Dict[str, str], path: str) -> str:
     """Get absolute URL for the resource being accessed.
 
     Args:
-        request: FastAPI/Starlette request object
+        headers: Request headers from read_payment_headers
+        path: Request path
 
     Returns:
         Absolute URL string
     """
-    scheme = request.headers.get("x-forwarded-proto", "http")
-    host = request.headers.get("host", "localhost")
-    path = str(request.url.path).split("?")[0]
+    scheme = headers.get("x-forwarded-proto", "http")
+    host = headers.get("host", "localhost")
     return f"{scheme}://{host}{path}"
 
 
@@ -86,11 +151,14 @@ def to_payment_requirements(
     )
 
 
-class X402PaywallMiddleware(BaseHTTPMiddleware):
+class X402PaywallMiddleware:
     """Middleware for x402 payment protocol protection.
 
     This middleware protects routes by requiring payment before allowing access.
     It integrates with the facilitator service to verify and settle payments.
+
+    It is a plain ASGI middleware: unprotected requests are passed straight
+    to the app without building Request/Response objects or a task group.
     """
 
     def __init__(
@@ -112,7 +180,7 @@ class X402PaywallMiddleware(BaseHTTPMiddleware):
             facilitator_url: Optional facilitator URL (if not using service instance)
             skip_paths: List of paths to skip payment check (e.g., ["/.well-known/agent.json"])
         """
-        super().__init__(app)
+        self.app = app
         self.pay_to = pay_to
         self.routes = routes
         # Initialize facilitator service with remote URL by default
@@ -125,6 +193,27 @@ class X402PaywallMiddleware(BaseHTTPMiddleware):
             "/.well-known/agent.json",
             "/.well-known/agent-card.json",
         ]
+        # (METHOD, path without trailing slash) -> RouteConfig. A key written
+        # without the trailing slash wins over one written with it
+        self._route_index: Dict[Tuple[str, str], RouteConfig] = {}
+        for route_key, route_config in sorted(
+            routes.items(), key=lambda item: not item[0].endswith("/")
+        ):
+            route_method, _, route_path = route_key.partition(" ")
+            self._route_index[(route_method.upper(), route_path.rstrip("/") or "/")] = route_config
+        self._post_catchall = self._route_index.get(("POST", "/"))
+        # Payment requirements per route config with the resource left blank;
+        # each request only fills in its resource URL
+        self._requirements_templates: Dict[RouteConfig, Dict[str, Any]] = {
+            route_config: to_payment_requirements("", pay_to, route_config).to_dict()
+            for route_config in routes.values()
+        }
+        # Serialized 402 body without an error, per (route config, resource URL)
+        self._unpaid_body = lru_cache(maxsize=PAYMENT_REQUIRED_BODY_CACHE_SIZE)(
+            self._build_unpaid_body
+        )
+        # All skip paths in one alternation, so a path is scanned once
+        self._skip_pattern = re.compile("|".join(map(re.escape, self.skip_paths)))
 
     def _should_skip_payment(self, path: str) -> bool:
         """Check if path should skip payment verification.
@@ -135,10 +224,7 @@ class X402PaywallMiddleware(BaseHTTPMiddleware):
         Returns:
             True if payment check should be skipped
         """
-        for skip_path in self.skip_paths:
-            if path.endswith(skip_path) or skip_path in path:
-                return True
-        return False
+        return self._skip_pattern.search(path) is not None
 
     def _get_route_config(self, method: str, path: str) -> Optional[RouteConfig]:
         """Get route configuration for the given method and path.
@@ -150,26 +236,11 @@ class X402PaywallMiddleware(BaseHTTPMiddleware):
         Returns:
             RouteConfig if route is protected, None otherwise
         """
-        # Normalize path (remove trailing slash, ensure leading slash)
-        normalized_path = path.rstrip("/") or "/"
-        if not normalized_path.startswith("/"):
-            normalized_path = "/" + normalized_path
-        
-        # Try exact match first
-        route_key = f"{method.upper()} {normalized_path}"
-        if route_key in self.routes:
-            return self.routes[route_key]
-        
-        # Try with trailing slash
-        route_key_slash = f"{method.upper()} {normalized_path}/"
-        if route_key_slash in self.routes:
-            return self.routes[route_key_slash]
-        
-        # Try root path for any POST request (catch-all for mounted apps)
-        if method.upper() == "POST" and "POST /" in self.routes:
-            return self.routes["POST /"]
-        
-        return None
+        route_config = self._route_index.get((method, path.rstrip("/") or "/"))
+        if route_config is None and method == "POST":
+            # Root POST route is a catch-all for mounted apps
+            return self._post_catchall
+        return route_config
 
     def _decode_payment_header(self, payment_header: str) -> Dict[str, Any]:
         """Decode base64-encoded payment header.
@@ -183,203 +254,255 @@ class X402PaywallMiddleware(BaseHTTPMiddleware):
         Raises:
             ValueError: If header cannot be decoded
         """
-        try:
-            decoded_bytes = base64.b64decode(payment_header)
-            decoded_str = decoded_bytes.decode("utf-8")
-            return json.loads(decoded_str)
-        except Exception as e:
-            raise ValueError(f"Failed to decode payment header: {str(e)}")
+        return self.facilitator_service.decode_payment_header(payment_header)
+
+    def _payment_requirements(
+        self, route_config: RouteConfig, resource_url: str
+    ) -> Dict[str, Any]:
+        """Get the payment requirements dict for a route and resource URL."""
+        return {**self._requirements_templates[route_config], "resource": resource_url}
 
-    def _create_payment_required_response(
-        self, requirements: PaymentRequirements, error: Optional[str] = None
-    ) -> JSONResponse:
-        """Create 402 Payment Required response.
+    def _build_payment_required_body(
+        self, requirements: Dict[str, Any], error: Optional[str] = None
+    ) -> bytes:
+        """Serialize a 402 Payment Required body.
 
         Args:
-            requirements: Payment requirements
+            requirements: Payment requirements dict for the request
             error: Optional error message
 
         Returns:
-            JSONResponse with 402 status
+            JSON body bytes
         """
         body = {
             "x402Version": 1,
-            "accepts": [requirements.to_dict()],
+            "accepts": [requirements],
         }
         if error:
             body["error"] = error
-        return JSONResponse(status_code=402, content=body)
+        return orjson.dumps(body)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request through x402 payment middleware.
+    def _build_unpaid_body(self, route_config: RouteConfig, resource_url: str) -> bytes:
+        """Serialize the 402 body sent when no payment header is present."""
+        return self._build_payment_required_body(
+            self._payment_requirements(route_config, resource_url)
+        )
+
+    async def _send_payment_required(self, send: Send, content: bytes) -> None:
+        """Send a 402 Payment Required response.
 
         Args:
-            request: FastAPI/Starlette request
-            call_next: Next middleware/handler in chain
+            send: ASGI send callable
+            content: Serialized 402 body
+        """
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 402,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
 
-        Returns:
-            Response (either 402 or proceeds to handler)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request through x402 payment middleware.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive callable
+            send: ASGI send callable
         """
-        path = request.url.path
-        method = request.method
-
-        # Debug logging - always enabled for now
-        debug_mode = True   
-        import logging
-        logger = logging.getLogger(__name__)
-        # Set logging level to DEBUG to show all logs
-        logger.setLevel(logging.DEBUG)
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setLevel(logging.DEBUG)
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-            logger.debug(f"[x402] Request: {method} {path}, Routes: {list(self.routes.keys())}")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
+
+        logger.debug("[x402] Request: %s %s", method, path)
 
         # Skip payment check for excluded paths
         if self._should_skip_payment(path):
-            logger.info(f"[x402] Skipping payment check for path: {path}")
-            return await call_next(request)
+            logger.debug("[x402] Skipping payment check for path: %s", path)
+            await self.app(scope, receive, send)
+            return
 
         # Check if route is protected
         route_config = self._get_route_config(method, path)
         if not route_config:
             # Route not protected, proceed without payment check
-            logger.info(f"[x402] Route not protected: {method} {path}")
-            return await call_next(request)
+            logger.debug("[x402] Route not protected: %s %s", method, path)
+            await self.app(scope, receive, send)
+            return
 
-        logger.info(f"[x402] Route protected: {method} {path}, Config: {route_config.description}")
+        logger.info(
+            "[x402] Route protected: %s %s, Config: %s", method, path, route_config.description
+        )
 
         # Get payment requirements
-        resource_url = absolute_resource_url(request)
-        requirements = to_payment_requirements(resource_url, self.pay_to, route_config)
+        headers = read_payment_headers(scope)
+        resource_url = absolute_resource_url(headers, path)
 
         # Check for payment header
-        # Starlette/FastAPI headers are case-insensitive, use .get() method
-        x_payment_header = request.headers.get("x-payment") or request.headers.get("x-402")
-        
+        x_payment_header = headers.get("x-payment") or headers.get("x-402")
+
         if not x_payment_header:
             # No payment header, return 402
-            logger.warning(f"[x402] No payment header found, returning 402 for {method} {path}")
-            logger.info(f"[x402] Available headers: {list(request.headers.keys())}")
-            # Log all headers for debugging
-            all_headers = {}
-            for key, value in request.headers.items():
-                all_headers[key] = value
-            logger.info(f"[x402] All header values: {all_headers}")
-            return self._create_payment_required_response(requirements)
-        
-        logger.info(f"[x402] ✓ Payment header found, verifying payment for {method} {path}")
-        logger.info(f"[x402] Payment header length: {len(x_payment_header)}")
-        logger.info(f"[x402] Payment header preview (first 100 chars): {x_payment_header[:100]}...")
+            logger.warning("[x402] No payment header found, returning 402 for %s %s", method, path)
+            if logger.isEnabledFor(logging.DEBUG):
+                header_names = [name.decode("latin-1") for name, _ in scope["headers"]]
+                logger.debug("[x402] Available headers: %s", header_names)
+            await self._send_payment_required(
+                send, self._unpaid_body(route_config, resource_url)
+            )
+            return
+
+        logger.info("[x402] ✓ Payment header found, verifying payment for %s %s", method, path)
+        logger.debug(
+            "[x402] Payment header length: %d, preview: %.100s...",
+            len(x_payment_header),
+            x_payment_header,
+        )
+
+        # Built once; sent to the facilitator and echoed in any 402 below
+        payment_reqs_dict = self._payment_requirements(route_config, resource_url)
+
+        # Turn away a header that another request is settling or has settled
+        payment_key = _claim_payment(x_payment_header)
+        if payment_key is None:
+            logger.warning("[x402] ✗ Payment header already used for %s %s", method, path)
+            await self._send_payment_required(
+                send,
+                self._build_payment_required_body(payment_reqs_dict, error="Payment already used"),
+            )
+            return
 
         # Decode and verify payment
+        settled = False
         try:
             payment_payload = self._decode_payment_header(x_payment_header)
-            logger.info(f"[x402] ✓ Payment payload decoded successfully")
-            logger.info(f"[x402] Payment payload - scheme: {payment_payload.get('scheme')}, version: {payment_payload.get('x402Version')}, network: {payment_payload.get('network')}")
-            logger.info(f"[x402] Payment payload keys: {list(payment_payload.keys())}")
-            scheme = payment_payload.get("scheme", "exact").lower()
-
-            # Verify payment with facilitator
-            # Convert PaymentRequirements to dict format expected by facilitator
-            payment_reqs_dict = requirements.to_dict()
-            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[x402] ✓ Payment payload decoded - scheme: %s, version: %s, network: %s, "
+                    "keys: %s",
+                    payment_payload.get("scheme"),
+                    payment_payload.get("x402Version"),
+                    payment_payload.get("network"),
+                    list(payment_payload.keys()),
+                )
+            x402_version = payment_payload.get("x402Version", 1)
+
             # Extract payload - it might be nested or at root level
             payment_data = payment_payload.get("payload", payment_payload)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[x402] Payment data keys: %s, transaction BCS length: %d, "
+                    "signature BCS length: %d",
+                    list(payment_data.keys()),
+                    len(payment_data.get("transaction") or ""),
+                    len(payment_data.get("signature") or ""),
+                )
             
-            logger.info(f"[x402] Payment data keys: {list(payment_data.keys())}")
-            logger.info(f"[x402] Payment data has transaction: {'transaction' in payment_data or 'transactionBcsBase64' in payment_data}")
-            logger.info(f"[x402] Payment data has signature: {'signature' in payment_data or 'signatureBcsBase64' in payment_data}")
-            if 'transaction' in payment_data:
-                logger.info(f"[x402] Transaction BCS length: {len(payment_data.get('transaction', ''))}")
-            if 'signature' in payment_data:
-                logger.info(f"[x402] Signature BCS length: {len(payment_data.get('signature', ''))}")
-            
-            verify_result = self.facilitator_service.verify_payment(
-                x402_version=payment_payload.get("x402Version", 1),
+            verify_result = await self.facilitator_service.verify_payment(
+                x402_version=x402_version,
                 payment_payload=payment_data,
                 payment_requirements=payment_reqs_dict,
             )
             
-            logger.info(f"[x402] ===== Verification result =====")
-            logger.info(f"[x402] isValid: {verify_result.get('isValid')}")
-            logger.info(f"[x402] invalidReason: {verify_result.get('invalidReason', 'N/A')}")
-            logger.info(f"[x402] payer: {verify_result.get('payer', 'N/A')}")
-            logger.info(f"[x402] Full verification result: {verify_result}")
+            logger.debug("[x402] Verification result: %s", verify_result)
 
             if not verify_result.get("isValid"):
                 invalid_reason = verify_result.get("invalidReason", "Invalid payment")
-                logger.error(f"[x402] ✗ Payment verification FAILED: {invalid_reason}")
-                return self._create_payment_required_response(
-                    requirements,
-                    error=invalid_reason,
+                logger.error("[x402] ✗ Payment verification FAILED: %s", invalid_reason)
+                await self._send_payment_required(
+                    send, self._build_payment_required_body(payment_reqs_dict, invalid_reason)
                 )
+                return
             
-            logger.info(f"[x402] ✓ Payment verified successfully, payer: {verify_result.get('payer')}")
-
-            # Settle payment
-            settle_result = self.facilitator_service.settle_payment(
-                x402_version=payment_payload.get("x402Version", 1),
-                payment_payload=payment_data,
-                payment_requirements=payment_reqs_dict,
+            logger.info(
+                "[x402] ✓ Payment verified successfully, payer: %s", verify_result.get("payer")
             )
 
-            if not settle_result.get("success"):
-                # Retry settlement once
-                import asyncio
-                await asyncio.sleep(1)
-                settle_result = self.facilitator_service.settle_payment(
-                    x402_version=payment_payload.get("x402Version", 1),
+            # Settle payment, retrying after a short jittered backoff so
+            # callers failing together do not retry in lockstep
+            for attempt in range(SETTLE_MAX_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(
+                        SETTLE_RETRY_BASE_DELAY_SECONDS
+                        * 2 ** (attempt - 1)
+                        * random.uniform(0.5, 1.5)
+                    )
+                settle_result = await self.facilitator_service.settle_payment(
+                    x402_version=x402_version,
                     payment_payload=payment_data,
                     payment_requirements=payment_reqs_dict,
                 )
+                if settle_result.get("success"):
+                    break
 
             if not settle_result.get("success"):
                 settle_error = settle_result.get("error", "Settlement failed")
-                logger.error(f"[x402] ✗ Payment settlement FAILED: {settle_error}")
-                logger.info(f"[x402] Full settlement result: {settle_result}")
-                return self._create_payment_required_response(
-                    requirements,
-                    error=settle_error,
+                logger.error("[x402] ✗ Payment settlement FAILED: %s", settle_error)
+                logger.debug("[x402] Full settlement result: %s", settle_result)
+                await self._send_payment_required(
+                    send, self._build_payment_required_body(payment_reqs_dict, settle_error)
                 )
+                return
 
-            logger.info(f"[x402] ✓ Payment settled successfully")
-            logger.info(f"[x402] Settlement result: {settle_result}")
-            
-            # Payment verified and settled, proceed to handler
-            logger.info(f"[x402] Proceeding to handler for {method} {path}")
-            response = await call_next(request)
-            logger.info(f"[x402] Handler response status: {response.status_code if hasattr(response, 'status_code') else 'N/A'}")
-
-            # Add X-PAYMENT-RESPONSE header with settlement result
-            if hasattr(response, "headers"):
-                import base64 as b64
-                response.headers["X-PAYMENT-RESPONSE"] = b64.b64encode(
-                    json.dumps(settle_result).encode("utf-8")
-                ).decode("utf-8")
-
-            return response
+            settled = True
+            logger.info("[x402] ✓ Payment settled successfully")
+            logger.debug("[x402] Settlement result: %s", settle_result)
 
         except ValueError as e:
             # Invalid payment header format
-            logger.error(f"[x402] ✗ Payment header decode error: {str(e)}", exc_info=True)
-            return self._create_payment_required_response(
-                requirements, error=f"Invalid payment header: {str(e)}"
+            # A malformed header is a client error; the traceback only helps when debugging
+            logger.error(
+                "[x402] ✗ Payment header decode error: %s",
+                e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            await self._send_payment_required(
+                send,
+                self._build_payment_required_body(
+                    payment_reqs_dict, f"Invalid payment header: {str(e)}"
+                ),
             )
+            return
         except Exception as e:
             # Payment verification error
-            logger.error(f"[x402] ✗ Payment verification error: {str(e)}", exc_info=True)
-            import traceback
-            logger.error(f"[x402] Full traceback: {traceback.format_exc()}")
+            logger.exception("[x402] ✗ Payment verification error: %s", e)
             # Return 402 with error details instead of 500
-            return self._create_payment_required_response(
-                requirements,
-                error=f"Payment verification error: {str(e)}",
+            await self._send_payment_required(
+                send,
+                self._build_payment_required_body(
+                    payment_reqs_dict, f"Payment verification error: {str(e)}"
+                ),
             )
+            return
+        finally:
+            if not settled:
+                _release_payment(payment_key)
+
+        # Payment verified and settled, proceed to handler
+        logger.debug("[x402] Proceeding to handler for %s %s", method, path)
+
+        # Add X-PAYMENT-RESPONSE header with settlement result
+        payment_response = base64.b64encode(orjson.dumps(settle_result))
+
+        async def send_with_payment_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-payment-response", payment_response),
+                ]
+                logger.debug("[x402] Handler response status: %s", message["status"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_payment_response)
 
 
 def x402Paywall(
@@ -388,7 +511,7 @@ def x402Paywall(
     facilitator_service: Optional[FacilitatorService] = None,
     facilitator_url: Optional[str] = None,
     skip_paths: Optional[list[str]] = None,
-) -> type[BaseHTTPMiddleware]:
+) -> type[X402PaywallMiddleware]:
     """Create x402Paywall middleware factory.
 
     This is a convenience function that returns a middleware class that can be
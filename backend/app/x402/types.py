@@ -8,6 +8,20 @@ from typing import Dict, Optional, Any
 class PaymentRequirements:
     """Payment requirements for a protected route."""
 
+    __slots__ = (
+        "scheme",
+        "network",
+        "max_amount_required",
+        "resource",
+        "description",
+        "mime_type",
+        "pay_to",
+        "max_timeout_seconds",
+        "asset",
+        "output_schema",
+        "extra",
+    )
+
     def __init__(
         self,
         scheme: str,
@@ -57,6 +71,17 @@ class PaymentRequirements:
 class RouteConfig:
     """Configuration for a protected route."""
 
+    __slots__ = (
+        "network",
+        "asset",
+        "max_amount_required",
+        "description",
+        "mime_type",
+        "max_timeout_seconds",
+        "output_schema",
+        "extra",
+    )
+
     def __init__(
         self,
         network: str,
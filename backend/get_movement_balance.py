@@ -25,11 +25,13 @@ Examples:
 import argparse
 import json
 import os
+import re
 import sys
 from typing import Dict, List, Optional
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print(
         "Error: 'requests' module not found. Please install dependencies:\n"
@@ -60,6 +62,13 @@ INDEXER_PROVIDERS = {
 # Default indexer provider
 DEFAULT_INDEXER_PROVIDER = "sentio"  # Change this to switch default provider
 
+# Keep-alive pool for indexer requests; sized for a full batch of concurrent
+# balance queries from the Balance Agent
+INDEXER_POOL_MAXSIZE = 16
+
+# 0x followed by at least one hex digit (short forms such as 0x1 are valid)
+HEX_ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]+")
+
 # Native token asset type (MOVE coin)
 NATIVE_TOKEN_ASSET_TYPE = "0x000000000000000000000000000000000000000000000000000000000000000a"
 
@@ -89,6 +98,17 @@ query GetUserTokenBalances($ownerAddress: String!, $limit: Int, $offset: Int) {
 """
 
 
+def _create_http_session() -> requests.Session:
+    """Create a pooled session so repeated indexer queries reuse TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=len(INDEXER_PROVIDERS), pool_maxsize=INDEXER_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _create_http_session()
+
+
 def get_indexer_url_by_provider(provider: str = "sentio") -> str:
     """Get Movement Indexer URL by provider name (mainnet only).
     
@@ -149,14 +169,7 @@ def validate_address(address: str) -> bool:
     Returns:
         True if address is valid, False otherwise
     """
-    if not address.startswith("0x"):
-        return False
-    if len(address) < 3:
-        return False
-    hex_part = address[2:]
-    if not all(c in "0123456789abcdefABCDEF" for c in hex_part):
-        return False
-    return True
+    return HEX_ADDRESS_PATTERN.fullmatch(address) is not None
 
 
 def format_balance(amount: str, decimals: int = 18) -> str:
@@ -231,7 +244,7 @@ def get_balances(indexer_url: str, address: str) -> Dict:
                 "Origin": "https://movementnetwork.xyz",
                 "Referer": "https://movementnetwork.xyz/",
             }
-            response = requests.post(
+            response = _SESSION.post(
                 indexer_url,
                 json=payload,
                 headers=headers,
@@ -0,0 +1,109 @@
+"""Unit tests for the facilitator's BCS transaction parsing (facilitator/service.py)
+
+Transactions are built byte by byte, so neither the Aptos SDK nor network
+access is needed.
+"""
+
+import asyncio
+import base64
+import os
+import struct
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path to import the facilitator service
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.facilitator import service
+
+SENDER = bytes(range(32))
+PAY_TO = bytes([0xAB]) * 32
+
+
+def uleb128(value):
+    out = b""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if not value:
+            return out + bytes([byte])
+        out += bytes([byte | 0x80])
+
+
+def ident(name):
+    return uleb128(len(name)) + name.encode()
+
+
+def make_transfer(
+    amount=1000, recipient=PAY_TO, expires_in=300, module="aptos_account", function="transfer_coins"
+):
+    # 0x1::<module>::<function><0x1::aptos_coin::AptosCoin>(recipient, amount)
+    coin_type = uleb128(7) + bytes(31) + b"\x01" + ident("aptos_coin") + ident("AptosCoin")
+    return (
+        SENDER
+        + struct.pack("<Q", 5)
+        + uleb128(2)
+        + bytes(31)
+        + b"\x01"
+        + ident(module)
+        + ident(function)
+        + uleb128(1)
+        + coin_type
+        + uleb128(0)
+        + uleb128(2)
+        + uleb128(32)
+        + recipient
+        + uleb128(8)
+        + struct.pack("<Q", amount)
+        + struct.pack("<QQQ", 2000, 100, int(time.time()) + expires_in)
+        + bytes([service.MOVEMENT_CHAIN_ID])
+    )
+
+
+def verify(transaction, pay_to="0x" + PAY_TO.hex()):
+    requirements = {"payTo": pay_to, "maxAmountRequired": "500"}
+    return asyncio.run(
+        service.FacilitatorService().verify_transaction_on_chain(
+            base64.b64encode(transaction).decode(), requirements
+        )
+    )
+
+
+class TestFastExtractTxFields:
+    def test_reads_entry_function_fields(self):
+        fields = service._fast_extract_tx_fields(memoryview(make_transfer()))
+
+        assert fields["sender"] == "0x" + SENDER.hex()
+        assert fields["sequence_number"] == 5
+        assert fields["function"] == "0x1::aptos_account::transfer_coins"
+        assert fields["args"] == [PAY_TO, struct.pack("<Q", 1000)]
+        assert fields["chain_id"] == service.MOVEMENT_CHAIN_ID
+
+    def test_truncated_transaction_is_rejected(self):
+        with pytest.raises(ValueError):
+            service._fast_extract_tx_fields(memoryview(make_transfer()[:60]))
+
+
+class TestVerifyTransactionFields:
+    def test_valid_transfer(self):
+        assert verify(make_transfer()) == {"isValid": True, "payer": "0x" + SENDER.hex()}
+
+    def test_wrong_recipient_and_low_amount(self):
+        assert "Recipient mismatch" in verify(make_transfer(recipient=SENDER))["invalidReason"]
+        assert "Amount insufficient" in verify(make_transfer(amount=100))["invalidReason"]
+
+    def test_pay_to_case_and_prefix_are_normalized(self):
+        assert verify(make_transfer(), pay_to=PAY_TO.hex().upper())["isValid"] is True
+
+    def test_expired_transaction(self):
+        result = verify(make_transfer(expires_in=-10))
+        assert result["invalidReason"] == "Transaction has expired"
+
+    def test_unsupported_function(self):
+        result = verify(make_transfer(module="primary_fungible_store", function="transfer"))
+        assert result == {
+            "isValid": False,
+            "invalidReason": "Unsupported payment function: 0x1::primary_fungible_store::transfer",
+        }
@@ -0,0 +1,167 @@
+"""Unit tests for the market data helpers in lending_comparison/agent.py
+
+Tests asset/stat indexing, aggregate metrics and the protocol data cache
+with small Echelon and MovePosition payloads.
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path to import the lending agent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LENDING_AGENT_SKIP_VALIDATION", "1")
+
+from app.agents.lending_comparison import agent as lending_agent
+
+
+ECHELON_DATA = {
+    "data": {
+        "assets": [
+            {
+                "address": "0x1::aptos_coin::AptosCoin",
+                "faAddress": "0xa",
+                "symbol": "MOVE",
+                "price": 0.5,
+                "market": "0xmarket-move",
+                "supplyApr": 0.04,
+                "borrowApr": 0.08,
+            },
+            {
+                "address": "",
+                "faAddress": "0xusdc-fa",
+                "symbol": "USDC",
+                "price": 1.0,
+                "market": "0xmarket-usdc",
+                "supplyApr": 0.02,
+                "borrowApr": 0.06,
+            },
+            {
+                "address": "0xunlisted",
+                "symbol": "WBTC",
+                "price": 60000.0,
+                "market": "0xmarket-wbtc",
+                "supplyApr": 0.01,
+                "borrowApr": 0.03,
+            },
+        ],
+        "marketStats": [
+            ["0xmarket-move", {"totalShares": 1000, "totalLiability": 400, "totalCash": 600}],
+            ["0xusdc-fa", {"totalShares": 500, "totalLiability": 100, "totalCash": 400}],
+            ["malformed"],
+        ],
+    }
+}
+
+MOVEPOSITION_DATA = [
+    {
+        "underlyingAsset": {"name": "movement-move", "price": 0.5},
+        "scaledAvailableLiquidityUnderlying": "100",
+        "scaledTotalBorrowedUnderlying": "50",
+        "interestRate": 0.1,
+    },
+    {
+        "underlyingAsset": {"name": "movement-move-fa", "price": 0.5},
+        "scaledAvailableLiquidityUnderlying": "200",
+        "scaledTotalBorrowedUnderlying": "100",
+        "interestRate": 0.2,
+    },
+    {
+        "underlyingAsset": {"name": "movement-stbtc", "price": 60000.0},
+        "scaledAvailableLiquidityUnderlying": "1",
+        "scaledTotalBorrowedUnderlying": "0",
+        "interestRate": 0.0,
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_protocol_cache():
+    """Start every test with an empty protocol data cache."""
+    lending_agent._protocol_cache.clear()
+    lending_agent._derived_cache.clear()
+    yield
+    lending_agent._protocol_cache.clear()
+    lending_agent._derived_cache.clear()
+
+
+class TestEchelonLookups:
+    """Tests for Echelon asset and marketStats lookups."""
+
+    def test_find_asset_is_case_insensitive(self) -> None:
+        """Test asset lookup by symbol ignores case."""
+        asset = lending_agent.find_asset_in_echelon(ECHELON_DATA, "usdc")
+        assert asset is not None
+        assert asset["symbol"] == "USDC"
+        assert lending_agent.find_asset_in_echelon(ECHELON_DATA, "DOGE") is None
+
+    def test_market_stats_probe_order(self) -> None:
+        """Test stats are found by market address or FA address, skipping empty ones."""
+        stats = lending_agent.build_echelon_stats_index(ECHELON_DATA)
+        assert "malformed" not in stats
+        move, usdc, wbtc = ECHELON_DATA["data"]["assets"]
+        assert lending_agent.find_echelon_market_stats(stats, move)["totalShares"] == 1000
+        assert lending_agent.find_echelon_market_stats(stats, usdc)["totalShares"] == 500
+        assert lending_agent.find_echelon_market_stats(stats, wbtc) is None
+
+    def test_echelon_metrics(self) -> None:
+        """Test aggregate metrics only include assets with market stats."""
+        metrics = lending_agent.get_echelon_metrics(ECHELON_DATA)
+        assert metrics["total_supplied"] == pytest.approx(1000 * 0.5 + 500 * 1.0)
+        assert metrics["total_borrowed"] == pytest.approx(400 * 0.5 + 100 * 1.0)
+        assert metrics["tvl"] == metrics["total_supplied"]
+        assert metrics["avg_supply_apy"] == pytest.approx((0.04 + 0.02) / 2 * 100)
+        assert metrics["avg_borrow_apy"] == pytest.approx((0.08 + 0.06) / 2 * 100)
+        assert metrics["utilization_rate"] == pytest.approx(300 / 1000 * 100)
+
+
+class TestMovePositionLookups:
+    """Tests for MovePosition broker lookups and metrics."""
+
+    def test_move_prefers_move_fa(self) -> None:
+        """Test MOVE resolves to the MOVE-FA broker when both exist."""
+        broker = lending_agent.find_asset_in_moveposition(MOVEPOSITION_DATA, "move")
+        assert broker["underlyingAsset"]["name"] == "movement-move-fa"
+
+    def test_unmapped_symbol_uses_substring_match(self) -> None:
+        """Test symbols outside the mapping fall back to a name substring match."""
+        broker = lending_agent.find_asset_in_moveposition(MOVEPOSITION_DATA, "STBTC")
+        assert broker["underlyingAsset"]["name"] == "movement-stbtc"
+        assert lending_agent.find_asset_in_moveposition(MOVEPOSITION_DATA, "USDC") is None
+
+    def test_moveposition_metrics_totals(self) -> None:
+        """Test supplied and borrowed totals are valued at the underlying price."""
+        metrics = lending_agent.get_moveposition_metrics(MOVEPOSITION_DATA)
+        assert metrics["total_supplied"] == pytest.approx(150 * 0.5 + 300 * 0.5 + 60000.0)
+        assert metrics["total_borrowed"] == pytest.approx(50 * 0.5 + 100 * 0.5)
+
+
+class TestProtocolDataCache:
+    """Tests for the TTL cache around upstream fetches."""
+
+    def test_fresh_payload_is_served_from_cache(self) -> None:
+        """Test a fresh entry is returned without calling the fetcher again."""
+        calls = []
+
+        def fetcher():
+            calls.append(1)
+            return ECHELON_DATA
+
+        assert lending_agent._get_cached_payload("echelon", fetcher) is ECHELON_DATA
+        assert lending_agent._get_cached_payload("echelon", fetcher) is ECHELON_DATA
+        assert len(calls) == 1
+
+    def test_stale_payload_is_served_on_error(self) -> None:
+        """Test an expired entry is still returned when the refetch fails."""
+        lending_agent._get_cached_payload("echelon", lambda: ECHELON_DATA)
+        lending_agent._protocol_cache["echelon"]["expires_at"] = 0
+        assert lending_agent._get_cached_payload("echelon", lambda: None) is ECHELON_DATA
+
+    def test_replacing_payload_drops_derived_values(self) -> None:
+        """Test memoized metrics are invalidated when the payload is replaced."""
+        lending_agent._get_cached_payload("moveposition", lambda: MOVEPOSITION_DATA)
+        lending_agent.get_moveposition_metrics(MOVEPOSITION_DATA)
+        assert lending_agent._derived_cache
+        lending_agent._protocol_cache["moveposition"]["expires_at"] = 0
+        lending_agent._get_cached_payload("moveposition", lambda: list(MOVEPOSITION_DATA))
+        assert not any(key[1] == id(MOVEPOSITION_DATA) for key in lending_agent._derived_cache)
@@ -0,0 +1,171 @@
+"""Unit tests for the orchestrator A2A response cache (orchestrator/cache.py)
+
+Tests key canonicalization, per-agent TTLs, LRU eviction and the
+harvest/serve callbacks with lightweight stand-ins for ADK objects.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to import the orchestrator cache
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.orchestrator import cache as a2a_cache
+
+
+BALANCE_TASK = "get balance of 0xABC on movement"
+BALANCE_RESPONSE = {"success": True, "balances": [{"symbol": "MOVE", "balance": "1.5"}]}
+
+
+def make_function_call(call_id, name, args):
+    """Build a stand-in for google.genai.types.FunctionCall."""
+    return SimpleNamespace(id=call_id, name=name, args=args)
+
+
+def make_event(function_calls=(), function_responses=()):
+    """Build a stand-in for an ADK session Event."""
+    return SimpleNamespace(
+        get_function_calls=lambda: list(function_calls),
+        get_function_responses=lambda: list(function_responses),
+    )
+
+
+def make_llm_response(*function_calls):
+    """Build a stand-in for an LlmResponse carrying function call parts."""
+    parts = [SimpleNamespace(function_call=call) for call in function_calls]
+    return SimpleNamespace(content=SimpleNamespace(parts=parts))
+
+
+@pytest.fixture(autouse=True)
+def clear_a2a_cache():
+    """Start every test with an empty cache."""
+    a2a_cache.a2a_response_cache.clear()
+    a2a_cache._served_responses.clear()
+    a2a_cache._harvested_ids.clear()
+    a2a_cache.routing_decision_cache.clear()
+    yield
+    a2a_cache.a2a_response_cache.clear()
+    a2a_cache.routing_decision_cache.clear()
+
+
+class TestA2AResponseCache:
+    """Tests for keys, TTLs and eviction."""
+
+    def test_key_ignores_case_and_whitespace(self) -> None:
+        """Test equivalent tasks share one cache key."""
+        assert a2a_cache.canonical_a2a_key("Balance", "  get balance  of 0xABC ") == (
+            a2a_cache.canonical_a2a_key("balance", "get balance of 0xabc")
+        )
+
+    def test_only_read_only_agents_are_cached(self) -> None:
+        """Test TTLs are set for balance and lending rate queries only."""
+        assert a2a_cache.get_a2a_cache_ttl("balance", BALANCE_TASK) == (
+            a2a_cache.BALANCE_CACHE_TTL_MS / 1000
+        )
+        assert a2a_cache.get_a2a_cache_ttl("lending", "compare borrowing rates for MOVE") == (
+            a2a_cache.LIQUIDITY_CACHE_TTL_MS / 1000
+        )
+        assert a2a_cache.get_a2a_cache_ttl("lending", "Supply 1000 USDC as collateral") is None
+        assert a2a_cache.get_a2a_cache_ttl("bridge", "Bridge 1 ETH to Movement") is None
+
+    def test_expired_entry_is_a_miss(self) -> None:
+        """Test an entry past its TTL is dropped."""
+        response_cache = a2a_cache.A2AResponseCache()
+        response_cache.put("key", BALANCE_RESPONSE, ttl_seconds=-1)
+        assert response_cache.get("key") is None
+        assert response_cache.stats()["a2a_cache_evictions"] == 1
+
+    def test_lru_eviction_and_copies(self) -> None:
+        """Test the least recently used entry is evicted and values are copied."""
+        response_cache = a2a_cache.A2AResponseCache(max_entries=2)
+        response_cache.put("a", {"value": 1}, 60)
+        response_cache.put("b", {"value": 2}, 60)
+        response_cache.get("a")["value"] = 99
+        response_cache.put("c", {"value": 3}, 60)
+        assert response_cache.get("a") == {"value": 1}
+        assert response_cache.get("b") is None
+
+    def test_large_response_is_skipped(self) -> None:
+        """Test responses over the size limit are not cached."""
+        large = {"data": "x" * (a2a_cache.A2A_CACHE_MAX_RESPONSE_BYTES + 1)}
+        assert a2a_cache.a2a_response_cache.put("key", large, 60) is False
+
+
+class TestA2ACacheCallbacks:
+    """Tests for the before/after model callbacks and the cached response tool."""
+
+    def test_harvest_then_serve(self) -> None:
+        """Test a frontend reply is cached and a repeat call is served in-process."""
+        args = {"agentName": "balance", "task": BALANCE_TASK}
+        session = SimpleNamespace(
+            events=[
+                make_event(
+                    function_calls=[make_function_call("adk-1", a2a_cache.A2A_TOOL_NAME, args)]
+                ),
+                make_event(
+                    function_responses=[
+                        SimpleNamespace(
+                            id="adk-1", name=a2a_cache.A2A_TOOL_NAME, response=BALANCE_RESPONSE
+                        )
+                    ]
+                ),
+            ]
+        )
+        a2a_cache.harvest_a2a_responses(SimpleNamespace(session=session), None)
+
+        repeat_call = make_function_call(None, a2a_cache.A2A_TOOL_NAME, dict(args))
+        a2a_cache.serve_cached_a2a_calls(None, make_llm_response(repeat_call))
+        assert repeat_call.name == a2a_cache.CACHED_RESPONSE_TOOL_NAME
+        assert a2a_cache.get_cached_agent_response("balance", BALANCE_TASK) == BALANCE_RESPONSE
+
+    def test_mixed_response_is_left_alone(self) -> None:
+        """Test a response with an uncached call is not rewritten."""
+        key = a2a_cache.canonical_a2a_key("balance", BALANCE_TASK)
+        a2a_cache.a2a_response_cache.put(key, BALANCE_RESPONSE, 60)
+        cached_call = make_function_call(
+            None, a2a_cache.A2A_TOOL_NAME, {"agentName": "balance", "task": BALANCE_TASK}
+        )
+        other_call = make_function_call(
+            None, a2a_cache.A2A_TOOL_NAME, {"agentName": "bridge", "task": "bridge 1 ETH"}
+        )
+        a2a_cache.serve_cached_a2a_calls(None, make_llm_response(cached_call, other_call))
+        assert cached_call.name == a2a_cache.A2A_TOOL_NAME
+
+
+def make_a2a_call(agent_name, task):
+    """Build a routing decision entry for one A2A call."""
+    return {"name": a2a_cache.A2A_TOOL_NAME, "args": {"agentName": agent_name, "task": task}}
+
+
+class TestRoutingDecisionCache:
+    """Tests for routing decision keys and TTLs."""
+
+    def test_query_key_ignores_punctuation_and_filler(self) -> None:
+        """Test paraphrases differing only in politeness share one key."""
+        key = a2a_cache.routing_cache_key("get popular tokens", "0xabc")
+        polite = "Can you get me the popular tokens, please?"
+        assert a2a_cache.routing_cache_key(polite, "0xABC") == key
+        assert a2a_cache.routing_cache_key("get popular tokens", "0xdef") != key
+
+    def test_ttl_per_intent(self) -> None:
+        """Test the shortest intent TTL wins and actions are never cached."""
+        ttls = a2a_cache.ROUTING_CACHE_TTL_SECONDS
+        popular = make_a2a_call("balance", "get popular tokens")
+        balance = make_a2a_call("balance", BALANCE_TASK)
+        assert a2a_cache.get_routing_cache_ttl([popular]) == ttls["popular_tokens"]
+        assert a2a_cache.get_routing_cache_ttl([popular, balance]) == ttls["balance"]
+        assert a2a_cache.get_routing_cache_ttl([make_a2a_call("bridge", "bridge 1 ETH")]) is None
+        assert a2a_cache.get_routing_cache_ttl([{"name": "initiate_transfer", "args": {}}]) is None
+        assert a2a_cache.get_routing_cache_ttl([]) is None
+
+    def test_wallet_address_from_request(self) -> None:
+        """Test the connected wallet is read from the frontend's instruction text."""
+        part = SimpleNamespace(text="connected Movement Network wallet address: 0xAbC1")
+        request = SimpleNamespace(
+            contents=[SimpleNamespace(parts=[part])],
+            config=SimpleNamespace(system_instruction=None),
+        )
+        assert a2a_cache.find_wallet_address(request) == "0xAbC1"
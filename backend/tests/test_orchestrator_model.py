@@ -0,0 +1,83 @@
+"""Unit tests for the orchestrator's escalating model (orchestrator/model.py)
+
+Tests that a malformed tool call is retried on the fallback model, and that a
+streamed turn whose partial text already went out is not answered twice.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import the orchestrator model
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("google.adk")
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from app.agents.orchestrator.http_client import PooledGemini
+from app.agents.orchestrator.model import EscalatingGemini
+
+PRIMARY_MODEL = "gemini-2.5-flash"
+FALLBACK_MODEL = "gemini-2.5-pro"
+
+
+def _text_response(text: str, partial: bool = False) -> LlmResponse:
+    """Build a model response carrying text."""
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)]), partial=partial
+    )
+
+
+def _bad_call_response() -> LlmResponse:
+    """Build a model response calling a tool that is not declared."""
+    call = types.FunctionCall(name="no_such_tool", args={})
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+
+
+def _run(monkeypatch, primary_responses):
+    """Run EscalatingGemini over fake streams and return (text, models called)."""
+    calls = []
+
+    async def fake_generate(self, llm_request, stream=False):
+        calls.append(llm_request.model)
+        if llm_request.model == PRIMARY_MODEL:
+            for llm_response in primary_responses:
+                yield llm_response
+        else:
+            yield _text_response("fallback answer")
+
+    monkeypatch.setattr(PooledGemini, "generate_content_async", fake_generate)
+    model = EscalatingGemini(model=PRIMARY_MODEL, fallback_model=FALLBACK_MODEL)
+    llm_request = LlmRequest(
+        model=PRIMARY_MODEL,
+        contents=[types.Content(role="user", parts=[types.Part(text="hi")])],
+    )
+
+    async def collect():
+        return [r async for r in model.generate_content_async(llm_request, stream=True)]
+
+    responses = asyncio.run(collect())
+    texts = [part.text for r in responses for part in r.content.parts if part.text]
+    return texts, calls
+
+
+class TestEscalatingGemini:
+    """Tests for EscalatingGemini.generate_content_async."""
+
+    def test_bad_call_escalates(self, monkeypatch) -> None:
+        """Test a malformed tool call is replaced by the fallback model's answer."""
+        texts, calls = _run(monkeypatch, [_bad_call_response()])
+        assert calls == [PRIMARY_MODEL, FALLBACK_MODEL]
+        assert texts == ["fallback answer"]
+
+    def test_bad_call_after_streamed_text(self, monkeypatch) -> None:
+        """Test partial text followed by a malformed call is not answered again."""
+        texts, calls = _run(
+            monkeypatch, [_text_response("Checking ", partial=True), _bad_call_response()]
+        )
+        assert calls == [PRIMARY_MODEL]
+        assert texts == ["Checking "]
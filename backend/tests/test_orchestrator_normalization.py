@@ -0,0 +1,74 @@
+"""Unit tests for orchestrator tool argument normalization (orchestrator/normalization.py)
+
+Tests agent name, token symbol and network lookups and the after-model
+callback that applies them to function calls.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path to import the orchestrator normalization helpers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.orchestrator.normalization import (
+    A2A_TOOL_NAME,
+    normalize_agent_name,
+    normalize_network,
+    normalize_token_symbol,
+    normalize_tool_arguments,
+)
+
+
+def make_llm_response(name, args):
+    """Build a stand-in for an LlmResponse with one function call part."""
+    function_call = SimpleNamespace(name=name, args=args)
+    return SimpleNamespace(
+        content=SimpleNamespace(parts=[SimpleNamespace(function_call=function_call)])
+    )
+
+
+class TestLookups:
+    """Tests for the individual lookup helpers."""
+
+    def test_token_symbols(self) -> None:
+        """Test symbols are uppercased, keep the bridged suffix and resolve aliases."""
+        assert normalize_token_symbol("usdc") == "USDC"
+        assert normalize_token_symbol(" usdt.E ") == "USDT.e"
+        assert normalize_token_symbol("Tether") == "USDT"
+        assert normalize_token_symbol("movement") == "MOVE"
+
+    def test_agent_names(self) -> None:
+        """Test agent names resolve to A2A card names."""
+        assert normalize_agent_name("Balance Agent") == "balance"
+        assert normalize_agent_name("LENDING") == "lending"
+        assert normalize_agent_name("premium_lending_agent") == "premium_lending_agent"
+
+    def test_networks(self) -> None:
+        """Test network synonyms resolve to canonical names."""
+        assert normalize_network("BSC") == "bnb"
+        assert normalize_network("Movement Network") == "movement"
+        assert normalize_network("arbitrum") == "arbitrum"
+
+
+class TestNormalizeToolArguments:
+    """Tests for the after-model callback."""
+
+    def test_repairs_tool_name_and_agent(self) -> None:
+        """Test a misspelled A2A tool call is repaired in place."""
+        response = make_llm_response(
+            "send_message_to_a_a_agent", {"agentName": "Balance Agent", "task": "get balance"}
+        )
+        assert normalize_tool_arguments(None, response) is None
+        function_call = response.content.parts[0].function_call
+        assert function_call.name == A2A_TOOL_NAME
+        assert function_call.args == {"agentName": "balance", "task": "get balance"}
+
+    def test_normalizes_frontend_action_tokens(self) -> None:
+        """Test token arguments of frontend actions are normalized."""
+        response = make_llm_response("initiate_swap", {"fromToken": "move", "toToken": "usdc.e"})
+        normalize_tool_arguments(None, response)
+        assert response.content.parts[0].function_call.args == {
+            "fromToken": "MOVE",
+            "toToken": "USDC.e",
+        }
@@ -0,0 +1,143 @@
+"""Unit tests for the orchestrator's deterministic pre-router (orchestrator/router.py)
+
+Tests that unambiguous requests map to the expected tool call and that
+anything else is left to the model.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path to import the orchestrator router
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.orchestrator import router
+from app.agents.orchestrator.extractors import extract_swap, extract_transfer, validate_address
+from app.agents.orchestrator.routes import select_routes
+from app.agents.orchestrator.router import (
+    A2A_TOOL_NAME,
+    SWAP_ACTION_NAME,
+    TRANSFER_ACTION_NAME,
+    fast_route,
+)
+
+ADDRESS = "0x" + "ab12" * 16
+
+
+class TestFastRoute:
+    """Tests for fast_route."""
+
+    def test_popular_tokens(self) -> None:
+        """Test token discovery goes to the Balance Agent with the user's words."""
+        decision = fast_route("Show trending tokens ")
+        assert decision.tool_name == A2A_TOOL_NAME
+        assert decision.args == {"agentName": "balance", "task": "Show trending tokens"}
+
+    def test_address_balance(self) -> None:
+        """Test a balance request for an explicit address builds the task."""
+        decision = fast_route(f"check balance of {ADDRESS}")
+        assert decision.args["task"] == f"get balance of {ADDRESS} on movement"
+
+    def test_transfer(self) -> None:
+        """Test transfers become initiate_transfer with a normalized token."""
+        decision = fast_route(f"send 2.5 usdc.e to {ADDRESS}.")
+        assert decision.tool_name == TRANSFER_ACTION_NAME
+        assert decision.args == {"amount": "2.5", "token": "USDC.e", "toAddress": ADDRESS}
+
+    def test_swap(self) -> None:
+        """Test "swap X for Y" becomes initiate_swap."""
+        decision = fast_route("swap move for usdt.e")
+        assert decision.tool_name == SWAP_ACTION_NAME
+        assert decision.args == {"fromToken": "MOVE", "toToken": "USDT.e"}
+
+    def test_falls_through(self) -> None:
+        """Test ambiguous or compound requests are left to the model."""
+        assert fast_route("get my balance") is None
+        assert fast_route("swap MOVE for MOVE") is None
+        assert fast_route(f"transfer 1 MOVE to {ADDRESS} and then swap it") is None
+        assert fast_route("which platform has lower APR for borrowing MOVE") is None
+
+
+class TestSelectRoutes:
+    """Tests for single-pass intent keyword matching."""
+
+    def test_all_intents_in_route_order(self) -> None:
+        """Test every matched intent is reported once, in AGENT_ROUTES order."""
+        text = "Bridge ETH, then swap it and check my balance, then swap again"
+        assert select_routes(text) == ["balance", "swap", "bridge"]
+        assert select_routes("hello there") == []
+
+
+class TestExtractors:
+    """Tests for order-independent transfer and swap extraction."""
+
+    def test_transfer_fields_in_any_order(self) -> None:
+        """Test the recipient may come before the amount and the token defaults to MOVE."""
+        assert extract_transfer(f"send to {ADDRESS} 10 USDT") == {
+            "amount": "10",
+            "token": "USDT",
+            "toAddress": ADDRESS,
+        }
+        assert extract_transfer(f"transfer 3 to {ADDRESS}")["token"] == "MOVE"
+
+    def test_command_grammar(self) -> None:
+        """Test the plain command forms are parsed by the whole-message grammar."""
+        assert extract_transfer(f"Send 100 usdc.e to this address: {ADDRESS}.") == {
+            "amount": "100",
+            "token": "USDC.e",
+            "toAddress": ADDRESS,
+        }
+        assert extract_swap("swap usdt with move") == {"fromToken": "USDT", "toToken": "MOVE"}
+        assert extract_swap("swap MOVE for move") is None
+
+    def test_incomplete_or_uncertain_transfers(self) -> None:
+        """Test missing fields, questions and negations fall back to the model."""
+        assert extract_transfer("transfer 1 MOVE") is None
+        assert extract_transfer(f"how do I send 1 MOVE to {ADDRESS}?") is None
+        assert extract_transfer(f"send 1 MOVE and 2 USDC to {ADDRESS}") is None
+
+    def test_validate_address(self) -> None:
+        """Test only full 66-character hex addresses are accepted as recipients."""
+        assert validate_address(ADDRESS)
+        assert not validate_address(ADDRESS[:-1])
+        assert not validate_address(ADDRESS[:-1] + "g")
+        assert extract_transfer("send 1 MOVE to 0x" + "a" * 40) is None
+
+    def test_swap_source_after_from(self) -> None:
+        """Test "from X" marks the source token wherever it appears."""
+        expected = {"fromToken": "MOVE", "toToken": "USDC.e"}
+        assert extract_swap("swap to USDC.e from MOVE") == expected
+        assert extract_swap("swap USDC") is None
+
+
+class TestInflightDecisions:
+    """Tests for sharing one routing decision among identical concurrent queries."""
+
+    def test_followers_share_the_leaders_decision(self) -> None:
+        """Test the first query leads and later ones wait on its result."""
+        calls = [{"name": A2A_TOOL_NAME, "args": {"agentName": "balance", "task": "x"}}]
+
+        async def scenario():
+            assert router._claim_inflight_decision("key") is None
+            follower = router._claim_inflight_decision("key")
+            router._resolve_inflight_decision("key", calls)
+            return await follower
+
+        assert asyncio.run(scenario()) == calls
+        assert "key" not in router._inflight_decisions
+
+    def test_failed_model_call_releases_followers(self, monkeypatch) -> None:
+        """Test a leader whose model call fails releases waiting queries at once."""
+        monkeypatch.setattr(router, "routing_cache_key", lambda query, wallet: "key")
+        monkeypatch.setattr(router, "is_first_model_call", lambda context: True)
+        context = SimpleNamespace(state={router.WALLET_ADDRESS_STATE_KEY: ""}, user_content=None)
+
+        async def scenario():
+            assert router._claim_inflight_decision("key") is None
+            follower = router._claim_inflight_decision("key")
+            router.release_routing_decision(context, None, RuntimeError("quota"))
+            return await asyncio.wait_for(follower, 0.1)
+
+        assert asyncio.run(scenario()) is None
+        assert "key" not in router._inflight_decisions
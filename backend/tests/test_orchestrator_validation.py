@@ -0,0 +1,37 @@
+"""Unit tests for the orchestrator's address validation (orchestrator/validation.py)
+
+Tests that mistyped 0x addresses are caught while a bare "0x" and words
+such as tickers are left to the model.
+"""
+
+import os
+import sys
+
+# Add parent directory to path to import the orchestrator validation
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.orchestrator.validation import find_malformed_address
+
+ADDRESS = "0x" + "ab12" * 16
+
+
+class TestFindMalformedAddress:
+    """Tests for find_malformed_address."""
+
+    def test_valid_address(self) -> None:
+        """Test full and short hex addresses pass."""
+        assert find_malformed_address(f"check balance of {ADDRESS}") is None
+        assert find_malformed_address("send 1 MOVE to 0x1") is None
+
+    def test_bare_prefix(self) -> None:
+        """Test a bare 0x is not treated as an address."""
+        assert find_malformed_address("what is 0x") is None
+
+    def test_ticker(self) -> None:
+        """Test a word with non-hex letters after 0x is not treated as an address."""
+        assert find_malformed_address("0xBTC price") is None
+
+    def test_mistyped_address(self) -> None:
+        """Test an address with a non-hex character is returned."""
+        mistyped = ADDRESS[:-1] + "g"
+        assert find_malformed_address(f"check balance of {mistyped}") == mistyped
@@ -0,0 +1,111 @@
+"""Unit tests for the Sentiment Agent query dispatch (sentiment/agent.py)
+
+Tests intent selection and batched invocation with stand-in Santiment
+fetchers, so no network access is needed, and the bounded A2A task store.
+"""
+
+import asyncio
+import os
+import sys
+
+import orjson
+
+# Add parent directory to path to import the sentiment agent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from app.agents.sentiment import agent as sentiment_agent
+from app.agents.sentiment.core import task_store
+
+
+class TestSelectIntent:
+    def test_keyword_precedence(self):
+        assert sentiment_agent.select_intent("top 3 trending words") == "trending_words"
+        assert sentiment_agent.select_intent("bitcoin price in btc") == "price_btc"
+        assert sentiment_agent.select_intent("eth transaction volume") == "transaction_volume"
+        assert sentiment_agent.select_intent("how is bitcoin doing") == "sentiment_balance"
+
+
+class TestInvokeBatch:
+    def test_identical_fetches_are_shared(self, monkeypatch):
+        calls = []
+
+        def fake_sentiment_balance(asset, days):
+            calls.append((asset, days))
+            return {"success": True, "asset": asset, "days": days, "data": []}
+
+        parse, _, build = sentiment_agent._DISPATCH["sentiment_balance"]
+        monkeypatch.setitem(
+            sentiment_agent._DISPATCH,
+            "sentiment_balance",
+            (parse, fake_sentiment_balance, build),
+        )
+
+        queries = [
+            "sentiment for bitcoin over 7 days",
+            "bitcoin sentiment last 7 days",
+            "ethereum sentiment over 7 days",
+        ]
+        responses = asyncio.run(sentiment_agent.SentimentAgent().invoke_batch(queries, "s1"))
+
+        assert sorted(calls) == [("bitcoin", 7), ("ethereum", 7)]
+        assert len(responses) == 3
+        assert all(isinstance(orjson.loads(response), dict) for response in responses)
+
+    def test_failed_fetch_only_affects_its_queries(self, monkeypatch):
+        def fake_sentiment_balance(asset, days):
+            if asset == "ethereum":
+                raise RuntimeError("santiment unavailable")
+            return {"success": True, "asset": asset, "days": days, "data": []}
+
+        parse, _, build = sentiment_agent._DISPATCH["sentiment_balance"]
+        monkeypatch.setitem(
+            sentiment_agent._DISPATCH,
+            "sentiment_balance",
+            (parse, fake_sentiment_balance, build),
+        )
+
+        responses = asyncio.run(
+            sentiment_agent.SentimentAgent().invoke_batch(
+                ["bitcoin sentiment", "ethereum sentiment"], "s1"
+            )
+        )
+
+        assert orjson.loads(responses[0]).get("success") is not False
+        failed = orjson.loads(responses[1])
+        assert failed["success"] is False
+        assert "santiment unavailable" in failed["error"]
+
+
+def make_task(task_id):
+    return Task(id=task_id, context_id="c1", status=TaskStatus(state=TaskState.completed))
+
+
+class TestBoundedTaskStore:
+    def test_oldest_tasks_are_evicted_over_the_limit(self):
+        store = task_store.BoundedTaskStore(max_size=2)
+
+        async def scenario():
+            for task_id in ("t1", "t2", "t3"):
+                await store.save(make_task(task_id))
+            return [await store.get(task_id) for task_id in ("t1", "t2", "t3")]
+
+        first, second, third = asyncio.run(scenario())
+        assert first is None
+        assert second.id == "t2" and third.id == "t3"
+
+    def test_idle_tasks_expire(self, monkeypatch):
+        store = task_store.BoundedTaskStore(ttl=60)
+        now = [1000.0]
+        monkeypatch.setattr(task_store.time, "monotonic", lambda: now[0])
+
+        async def scenario():
+            await store.save(make_task("t1"))
+            now[0] += 61
+            await store.save(make_task("t2"))
+            return await store.get("t1"), await store.get("t2")
+
+        expired, fresh = asyncio.run(scenario())
+        assert expired is None
+        assert fresh.id == "t2"
@@ -0,0 +1,107 @@
+"""Unit tests for the x402 paywall middleware (x402/middleware.py)
+
+A stand-in facilitator service replaces verification and settlement, so no
+network access is needed.
+"""
+
+import base64
+import json
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+# Add parent directory to path to import the x402 package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.x402 import RouteConfig, X402PaywallMiddleware
+from app.x402 import middleware
+
+
+@pytest.fixture(autouse=True)
+def fresh_payment_claims(monkeypatch):
+    monkeypatch.setattr(middleware, "_CLAIMED_PAYMENTS", OrderedDict())
+
+
+class FakeFacilitatorService:
+    def decode_payment_header(self, payment_header):
+        if payment_header == "invalid":
+            raise ValueError("not base64")
+        return {"x402Version": 1, "payload": {"transaction": "dHg="}}
+
+    async def verify_payment(self, **kwargs):
+        return {"isValid": True, "payer": "0x1"}
+
+    async def settle_payment(self, **kwargs):
+        return {"success": True, "txHash": "0xabc"}
+
+
+def make_client(service):
+    async def handler(request):
+        return JSONResponse({"ok": True})
+
+    app = Starlette(
+        routes=[
+            Route("/", handler, methods=["GET", "POST"]),
+            Route("/.well-known/agent-card.json", handler),
+        ]
+    )
+    app.add_middleware(
+        X402PaywallMiddleware,
+        pay_to="0x1",
+        routes={
+            "POST /": RouteConfig(
+                network="movement",
+                asset="0x1::aptos_coin::AptosCoin",
+                max_amount_required="100",
+            )
+        },
+        facilitator_service=service,
+    )
+    return TestClient(app)
+
+
+class TestX402PaywallMiddleware:
+    def test_unprotected_and_skipped_paths_pass_through(self):
+        client = make_client(FakeFacilitatorService())
+        assert client.get("/").json() == {"ok": True}
+        assert client.get("/.well-known/agent-card.json").json() == {"ok": True}
+
+    def test_missing_or_invalid_header_returns_402(self):
+        client = make_client(FakeFacilitatorService())
+
+        response = client.post("/", headers={"x-forwarded-proto": "https"})
+        assert response.status_code == 402
+        assert response.json()["accepts"][0]["resource"] == "https://testserver/"
+
+        response = client.post("/", headers={"X-PAYMENT": "invalid"})
+        assert response.status_code == 402
+        assert response.json()["error"] == "Invalid payment header: not base64"
+
+    def test_settled_payment_reaches_handler_with_payment_response(self):
+        response = make_client(FakeFacilitatorService()).post("/", headers={"X-PAYMENT": "ok"})
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True}
+        settlement = json.loads(base64.b64decode(response.headers["x-payment-response"]))
+        assert settlement["txHash"] == "0xabc"
+
+    def test_replayed_payment_header_is_rejected(self):
+        client = make_client(FakeFacilitatorService())
+        assert client.post("/", headers={"X-PAYMENT": "ok"}).status_code == 200
+
+        response = client.post("/", headers={"X-PAYMENT": "ok"})
+        assert response.status_code == 402
+        assert response.json()["error"] == "Payment already used"
+
+    def test_failed_payment_can_be_retried(self):
+        client = make_client(FakeFacilitatorService())
+        for _ in range(2):
+            response = client.post("/", headers={"X-PAYMENT": "invalid"})
+            assert response.json()["error"].startswith("Invalid payment header")
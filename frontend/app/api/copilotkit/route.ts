@@ -48,9 +48,8 @@ export async function POST(request: NextRequest) {
   console.log("[copilotkit] Using backend URL:", baseUrl);
 
   // Agent URLs - all Movement Network agents
-  // CRITICAL: A2A middleware extracts agent names from URL paths:
-  // - http://localhost:8000/balance -> agentName: "balance"
-  // - http://localhost:8000/bridge -> agentName: "bridge"
+  // The A2A middleware offers each agent's card name ("balance", "bridge",
+  // "lending") as an agentName enum value of send_message_to_a2a_agent
   // Make sure backend is running and agents are accessible at these URLs
   // CRITICAL: All agent URLs need trailing slashes to avoid 307 redirect (POST -> GET conversion)
   // This works for both local (localhost:8000) and Railway (https://backend.railway.app)
@@ -76,17 +75,14 @@ export async function POST(request: NextRequest) {
 
   // A2A Middleware: Wraps orchestrator and injects send_message_to_a2a_agent tool
   // This allows orchestrator to communicate with all A2A agents transparently
-  // NOTE: Agent names are extracted from URL paths:
-  // - http://localhost:8000/balance -> agentName: "balance"
-  // - http://localhost:8000/bridge -> agentName: "bridge"
-  // - etc.
+  // NOTE: agentName is declared as an enum of the agent card names
   const a2aMiddlewareAgent = new A2AMiddlewareAgent({
     description:
       "Web3 and cryptocurrency orchestrator with specialized agents for Movement Network operations",
     agentUrls: [
-      balanceAgentUrl, // Maps to agentName: "balance"
-      bridgeAgentUrl, // Maps to agentName: "bridge"
-      lendingAgentUrl, // Maps to agentName: "lending"
+      balanceAgentUrl, // Agent card name: "balance"
+      bridgeAgentUrl, // Agent card name: "bridge"
+      lendingAgentUrl, // Agent card name: "lending"
     ],
     orchestrationAgent,
     instructions: `
@@ -137,32 +133,9 @@ export async function POST(request: NextRequest) {
       CRITICAL: This application works EXCLUSIVELY with Movement Network. All operations default to Movement Network.
 
 
-      AVAILABLE SPECIALIZED AGENTS:
-
-      1. **Balance Agent** (LangGraph) - Checks cryptocurrency balances on Movement Network
-         - Works EXCLUSIVELY with Movement Network
-         - Can check native token balances (MOVE)
-         - Can check token balances (USDC, USDT, DAI, etc.)
-         - Requires wallet address (0x format, 66 characters for Movement Network)
-         - Movement Network addresses are 66 characters (0x + 64 hex chars)
-         - Network is ALWAYS "movement" - do not use other networks
-
-      2. **Bridge Agent** (LangGraph) - Cross-chain asset bridging via Movement Bridge
-         - Bridges assets between Ethereum, BNB, Polygon and Movement Network
-         - Supports native tokens and ERC-20 tokens
-         - Can initiate bridge transactions, check status, and estimate fees
-         - Requires source chain, destination chain, asset, amount, and recipient address
-
-      3. **Lending Agent** (LangGraph) - MovePosition and Echelon lending protocols
-         - Supply collateral and borrow assets
-         - Repay loans
-         - Check health factors and liquidation risks
-         - Requires asset, amount, and protocol selection
-
       CRITICAL CONSTRAINTS:
-      - You MUST call agents ONE AT A TIME, never make multiple tool calls simultaneously
-      - After making a tool call, WAIT for the result before making another tool call
-      - Do NOT make parallel/concurrent tool calls - this is not supported
+      - Independent queries (different agents, addresses or tokens) can be sent as multiple tool calls in the same response - they run in parallel
+      - When one step needs the result of another (e.g. "check my balance, then supply"), make the first call and WAIT for its result before the next
       - Wallet addresses can be 42 characters (Ethereum/BNB/Polygon) OR 66 characters (Movement Network/Aptos) - BOTH are valid
 
       RECOMMENDED WORKFLOW FOR CRYPTO OPERATIONS:
@@ -299,13 +272,6 @@ export async function POST(request: NextRequest) {
       - Frontend will display SwapCard with pre-filled tokens and balances
       - User can enter amount and execute swap
 
-      ⚠️ CRITICAL TOOL NAME REMINDER:
-      - The tool name is: send_message_to_a2a_agent
-      - "a2a" means "a-2-a" (the letter a, the number 2, the letter a)
-      - DO NOT use: send_message_to_a_a_agent (wrong - has underscores)
-      - ALWAYS use: send_message_to_a2a_agent (correct - has number 2)
-      - When calling agents, use: send_message_to_a2a_agent(agentName="balance", task="...")
-
       ADDRESS VALIDATION:
       - Wallet addresses must start with "0x" and contain valid hexadecimal characters
       - Movement Network addresses are 66 characters (0x + 64 hex chars)
@@ -7,6 +7,8 @@ import {
   ToolCallResultEvent,
   Message,
   ToolCallStartEvent,
+  ToolCallArgsEvent,
+  ToolCallEndEvent,
   transformChunks,
   AgentSubscriber,
   RunFinishedEventSchema,
@@ -22,7 +24,7 @@ import {
   SendMessageSuccessResponse,
 } from "@a2a-js/sdk";
 import { Observable, Subscriber, tap } from "rxjs";
-import { createSystemPrompt, sendMessageToA2AAgentTool } from "./utils";
+import { createSendMessageToA2AAgentTool, createSystemPrompt } from "./utils";
 import { randomUUID } from "@ag-ui/client";
 
 export interface A2AAgentConfig extends AgentConfig {
@@ -130,6 +132,28 @@ export class A2AMiddlewareAgent extends AbstractAgent {
       }
     };
 
+    // A2A calls are dispatched as soon as their arguments are complete, so
+    // the agent round trip overlaps with the rest of the model's stream
+    const a2aCallArgs = new Map<string, string>();
+    const inflightA2ACalls = new Map<string, Promise<string>>();
+    const dispatchA2ACall = (toolCallId: string, toolArgs: string) => {
+      const parsed = JSON.parse(toolArgs);
+      const agentName = parsed.agentName;
+      const task = parsed.task;
+
+      if (this.debug) {
+        console.debug("sending message to a2a agent", {
+          agentName,
+          message: task,
+        });
+      }
+      const call = this.sendMessageToA2AAgent(agentName, task);
+      // Failures surface when the call is awaited on RUN_FINISHED
+      call.catch(() => undefined);
+      inflightA2ACalls.set(toolCallId, call);
+      return call;
+    };
+
     return stream
       .pipe(
         transformChunks(this.debug),
@@ -154,6 +178,41 @@ export class A2AMiddlewareAgent extends AbstractAgent {
             return;
           }
 
+          // Collect argument deltas for pending A2A calls
+          if (
+            event.type === EventType.TOOL_CALL_ARGS &&
+            pendingA2ACalls.has((event as ToolCallArgsEvent).toolCallId)
+          ) {
+            const argsEvent = event as ToolCallArgsEvent;
+            a2aCallArgs.set(
+              argsEvent.toolCallId,
+              (a2aCallArgs.get(argsEvent.toolCallId) || "") + argsEvent.delta
+            );
+            observer.next(event);
+            return;
+          }
+
+          // Dispatch an A2A call as soon as its arguments are complete
+          if (
+            event.type === EventType.TOOL_CALL_END &&
+            pendingA2ACalls.has((event as ToolCallEndEvent).toolCallId)
+          ) {
+            const toolCallId = (event as ToolCallEndEvent).toolCallId;
+            const toolArgs = a2aCallArgs.get(toolCallId);
+            if (toolArgs && !inflightA2ACalls.has(toolCallId)) {
+              try {
+                dispatchA2ACall(toolCallId, toolArgs);
+              } catch (error) {
+                // Incomplete JSON; the call is dispatched on RUN_FINISHED
+                if (this.debug) {
+                  console.debug("deferring a2a call", { toolCallId, error });
+                }
+              }
+            }
+            observer.next(event);
+            return;
+          }
+
           // Handle tool call result events for send_message_to_a2a_agent
           if (
             event.type === EventType.TOOL_CALL_RESULT &&
@@ -175,28 +234,22 @@ export class A2AMiddlewareAgent extends AbstractAgent {
               const newToolMessages: Message[] = [];
 
               const callProms = [...pendingA2ACalls].map((toolCallId) => {
-                const toolCallsFromMessages = this.messages
-                  .filter((message) => message.role === "assistant")
-                  .flatMap((message) => message.toolCalls || [])
-                  .filter((toolCall) => toolCall.id === toolCallId);
-
-                const toolArgs = toolCallsFromMessages[0]?.function.arguments;
-                if (!toolArgs) {
-                  throw new Error(
-                    `Tool arguments not found for tool call id ${toolCallId}`
-                  );
-                }
-                const parsed = JSON.parse(toolArgs);
-                const agentName = parsed.agentName;
-                const task = parsed.task;
-
-                if (this.debug) {
-                  console.debug("sending message to a2a agent", {
-                    agentName,
-                    message: task,
-                  });
+                let call = inflightA2ACalls.get(toolCallId);
+                if (!call) {
+                  const toolCallsFromMessages = this.messages
+                    .filter((message) => message.role === "assistant")
+                    .flatMap((message) => message.toolCalls || [])
+                    .filter((toolCall) => toolCall.id === toolCallId);
+
+                  const toolArgs = toolCallsFromMessages[0]?.function.arguments;
+                  if (!toolArgs) {
+                    throw new Error(
+                      `Tool arguments not found for tool call id ${toolCallId}`
+                    );
+                  }
+                  call = dispatchA2ACall(toolCallId, toolArgs);
                 }
-                return this.sendMessageToA2AAgent(agentName, task)
+                return call
                   .then((a2aResponse) => {
                     const newMessage: Message = {
                       id: randomUUID(),
@@ -226,6 +279,8 @@ export class A2AMiddlewareAgent extends AbstractAgent {
                   })
                   .finally(() => {
                     pendingA2ACalls.delete(toolCallId as string);
+                    inflightA2ACalls.delete(toolCallId);
+                    a2aCallArgs.delete(toolCallId);
                   });
               });
 
@@ -303,7 +358,10 @@ export class A2AMiddlewareAgent extends AbstractAgent {
           id: randomUUID(),
         });
 
-        input.tools = [...(input.tools || []), sendMessageToA2AAgentTool];
+        input.tools = [
+          ...(input.tools || []),
+          createSendMessageToA2AAgentTool(agentCards),
+        ];
 
         // Start the orchestration agent run
         this.triggerNewRun(
@@ -366,14 +424,17 @@ export class A2AMiddlewareAgent extends AbstractAgent {
       }
 
       const result = (sendResponse as SendMessageSuccessResponse).result;
+      // Agents either reply with a bare message or complete a task whose final
+      // status message carries the answer
+      const answer = result.kind === "task" ? result.status.message : result;
       let responseContent = "";
 
       if (
-        result.kind === "message" &&
-        result.parts.length > 0 &&
-        result.parts[0].kind === "text"
+        answer &&
+        answer.parts.length > 0 &&
+        answer.parts[0].kind === "text"
       ) {
-        responseContent = result.parts[0].text;
+        responseContent = answer.parts[0].text;
       } else {
         responseContent = JSON.stringify(result);
       }
@@ -59,15 +59,15 @@ THEN REACH OUT TO THE APPROPRIATE AGENTS TO COMPLETE THE TASK.
 * **Prioritize Recent Interaction:** Focus primarily on the most recent parts of the conversation when processing requests.
 * **Active Agent Prioritization:** If an active agent is already engaged, route subsequent related requests to that agent using the \`send_message_to_a2a_agent\` tool.
 
-**Agent Roster:**
-* Available Agents:
-${JSON.stringify(agentCards.map((agent) => ({ name: agent.name, description: agent.description, skills: agent.skills })))}
+**Agent Roster:** The available agents are the \`agentName\` values of \`send_message_to_a2a_agent\`; each value's description says what the agent does.
 **END General Instructions:**
 `.trim();
 
 // * **Transparent Communication:** Always present the complete and detailed response from the remote agent to the user.
 
-export const sendMessageToA2AAgentTool = {
+// agentName is an enum of the agent card names, so the model picks a known
+// agent from the schema instead of spelling one out from the prompt
+export const createSendMessageToA2AAgentTool = (agentCards: AgentCard[]) => ({
   name: `send_message_to_a2a_agent`,
   description:
     "Sends a task to the agent named `agentName`, including the full conversation context and goal",
@@ -76,7 +76,10 @@ export const sendMessageToA2AAgentTool = {
     properties: {
       agentName: {
         type: "string",
-        description: "The name of the A2A agent to send the message to.",
+        enum: agentCards.map((agent) => agent.name),
+        description: `The A2A agent to send the message to. ${agentCards
+          .map((agent) => `"${agent.name}": ${agent.description}`)
+          .join(" ")}`,
       },
       task: {
         type: "string",
@@ -84,6 +87,6 @@ export const sendMessageToA2AAgentTool = {
           "The comprehensive conversation-context summary and goal to be achieved regarding the user inquiry.",
       },
     },
-    required: ["task"],
+    required: ["agentName", "task"],
   },
-};
+});
@@ -158,14 +158,17 @@ export default function PremiumChat({
 
       // Extract response content
       const result = response.result;
+      // Agents either reply with a bare message or finish a task whose final
+      // status message carries the answer
+      const answer = result.kind === "task" ? result.status.message : result;
       let responseContent = "";
 
       if (
-        result.kind === "message" &&
-        result.parts.length > 0 &&
-        result.parts[0].kind === "text"
+        answer &&
+        answer.parts.length > 0 &&
+        answer.parts[0].kind === "text"
       ) {
-        responseContent = result.parts[0].text;
+        responseContent = answer.parts[0].text;
       } else {
         responseContent = JSON.stringify(result, null, 2);
       }
@@ -254,14 +257,17 @@ export default function PremiumChat({
 
       // Extract response content
       const result = response.result;
+      // Agents either reply with a bare message or finish a task whose final
+      // status message carries the answer
+      const answer = result.kind === "task" ? result.status.message : result;
       let responseContent = "";
 
       if (
-        result.kind === "message" &&
-        result.parts.length > 0 &&
-        result.parts[0].kind === "text"
+        answer &&
+        answer.parts.length > 0 &&
+        answer.parts[0].kind === "text"
       ) {
-        responseContent = result.parts[0].text;
+        responseContent = answer.parts[0].text;
       } else {
         responseContent = JSON.stringify(result, null, 2);
       }